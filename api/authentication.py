@@ -0,0 +1,72 @@
+"""
+JWT authentication without a User query on every request.
+
+simplejwt's JWTAuthentication loads the User row for each request. Here the
+user resolved from the token's user id claim is kept in a small in-process
+LRU with a TTL (AUTH_USER_CACHE_TTL seconds).
+
+Saving or deleting a User (deactivation, password or staff changes) drops it
+from this process's LRU and, once committed, writes a new stamp for that user
+to the "auth" cache. Every LRU hit compares the stamp it was loaded with to
+the current one and reloads the user on a mismatch, so other processes pick
+up the change on their next request as long as they share that cache (see
+AUTH_CACHE_DIR). Otherwise the TTL bounds how long they keep the old user.
+"""
+import copy
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.cache import LRUCache
+
+STAMP_CACHE = "auth"
+
+user_cache = LRUCache(getattr(settings, "AUTH_USER_CACHE_SIZE", 1024),
+                      ttl=getattr(settings, "AUTH_USER_CACHE_TTL", 60))
+
+
+def stamp_key(user_id):
+    return f"auth-user:{user_id}"
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        key = str(validated_token.get(api_settings.USER_ID_CLAIM))
+        # Read before the User row, so a change committed in between shows up
+        # as a stamp mismatch on the next request.
+        stamp = caches[STAMP_CACHE].get(stamp_key(key))
+        entry = user_cache.get(key)
+        user = entry[0] if entry is not None and entry[1] == stamp else None
+        if user is None:
+            # Raises for unknown or inactive users, so those are never cached.
+            user = super().get_user(validated_token)
+            user_cache.put(key, (user, stamp))
+        elif api_settings.CHECK_REVOKE_TOKEN and (
+                validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        # Callers may mutate request.user; never hand out the cached instance.
+        return copy.copy(user)
+
+
+def invalidate_user(sender, instance, **kwargs):
+    key = str(getattr(instance, api_settings.USER_ID_FIELD))
+    user_cache.discard(key)
+    # An entry loaded before the change expires within the TTL, so the stamp
+    # only has to outlive that (doubled for clock differences between hosts).
+    timeout = user_cache.ttl * 2 if user_cache.ttl else None
+    transaction.on_commit(lambda: caches[STAMP_CACHE].set(stamp_key(key), uuid.uuid4().hex, timeout=timeout))
+
+
+def connect():
+    user_model = get_user_model()
+    post_save.connect(invalidate_user, sender=user_model, dispatch_uid="auth-user-cache-save")
+    post_delete.connect(invalidate_user, sender=user_model, dispatch_uid="auth-user-cache-delete")
@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import ProtectedError
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from core import versioning
+
+
+def _is_id(value):
+    # bool is an int subclass; true/false are not ids.
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class BatchMixin:
+    """
+    Adds POST <list-url>/batch/ to a ModelViewSet:
+
+        {"create": [{...}], "update": [{"id": 1, ...}], "delete": [3, 4]}
+
+    Every item is validated first; if all are valid they are applied in one
+    transaction with bulk_create / bulk_update / a single DELETE. Otherwise
+    nothing is written and the per-item errors are returned with a 400.
+    """
+
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        if not isinstance(request.data, dict):
+            return Response({"error": "Expected an object with create, update and delete lists."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        creates = request.data.get("create") or []
+        updates = request.data.get("update") or []
+        deletes = request.data.get("delete") or []
+        if not all(isinstance(x, list) for x in (creates, updates, deletes)):
+            return Response({"error": "create, update and delete must be lists."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not all(_is_id(pk) for pk in deletes):
+            return Response({"error": "delete must be a list of ids."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        limit = getattr(settings, "BATCH_MAX_ITEMS", 1000)
+        if len(creates) + len(updates) + len(deletes) > limit:
+            return Response({"error": f"A batch may contain at most {limit} items."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        # Models with denormalized columns recompute them in save(), which
+        # bulk operations skip.
+        derived = getattr(model, "DERIVED_FIELDS", [])
+        results = {"created": [], "updated": [], "deleted": []}
+        failed = False
+
+        create_serializer = self.get_serializer(data=creates, many=True)
+        if create_serializer.is_valid():
+            new_objs = [model(**data) for data in create_serializer.validated_data]
+            if derived:
+                for obj in new_objs:
+                    obj.sync_derived()
+        else:
+            failed = True
+            new_objs = []
+            results["created"] = [
+                {"index": i, "errors": errors} for i, errors in enumerate(create_serializer.errors) if errors
+            ]
+
+        ids = [item.get("id") if isinstance(item, dict) and _is_id(item.get("id")) else None
+               for item in updates]
+        instances = model.objects.in_bulk([pk for pk in ids if pk is not None])
+        changed, update_fields = [], set()
+        for i, (pk, item) in enumerate(zip(ids, updates)):
+            instance = instances.get(pk)
+            if instance is None:
+                failed = True
+                results["updated"].append({"index": i, "id": pk, "errors": {"id": ["Not found."]}})
+                continue
+            serializer = self.get_serializer(instance, data=item, partial=True)
+            if not serializer.is_valid():
+                failed = True
+                results["updated"].append({"index": i, "id": pk, "errors": serializer.errors})
+                continue
+            for field, value in serializer.validated_data.items():
+                setattr(instance, field, value)
+            update_fields.update(serializer.validated_data)
+            if derived:
+                instance.sync_derived()
+                update_fields.update(derived)
+            changed.append((i, instance))
+
+        if failed:
+            return Response(results, status=status.HTTP_400_BAD_REQUEST)
+
+        if changed and hasattr(model, "updated_at"):
+            # bulk_update doesn't apply auto_now.
+            now = timezone.now()
+            for _, obj in changed:
+                obj.updated_at = now
+            update_fields.add("updated_at")
+
+        try:
+            # deferred(): the DELETE sends post_delete per row; together with
+            # the bump for bulk_create/bulk_update (which skip post_save) that
+            # is one DataVersion UPDATE for the whole batch.
+            with transaction.atomic(), versioning.deferred():
+                created = model.objects.bulk_create(new_objs)
+                if changed and update_fields:
+                    model.objects.bulk_update([obj for _, obj in changed], sorted(update_fields))
+                deleted = set(model.objects.filter(pk__in=deletes).values_list("pk", flat=True))
+                if deleted:
+                    model.objects.filter(pk__in=deleted).delete()
+                if created or changed or deleted:
+                    versioning.bump(model._meta.model_name)
+        except ProtectedError:
+            return Response({"error": "Some objects to delete are still referenced."},
+                            status=status.HTTP_409_CONFLICT)
+        except IntegrityError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_409_CONFLICT)
+
+        results["created"] = [{"index": i, "id": obj.pk} for i, obj in enumerate(created)]
+        results["updated"] = [{"index": i, "id": obj.pk} for i, obj in changed]
+        results["deleted"] = [
+            {"index": i, "id": pk, "status": "deleted" if pk in deleted else "not_found"}
+            for i, pk in enumerate(deletes)
+        ]
+        return Response(results, status=status.HTTP_200_OK)
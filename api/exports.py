@@ -0,0 +1,109 @@
+"""
+Streaming and columnar exports of DeliveryAssignment rows.
+
+Rows are read as values_list tuples through a chunked iterator (a server-side
+cursor on Postgres) and encoded incrementally, so memory use does not depend
+on the size of the simulation. The columnar form (?format=columnar on the
+API) transposes the same tuples into one array per field. Compacted runs
+are decoded in memory (core.compaction.read) and go through the same
+encoders via instance_values().
+"""
+import csv
+import io
+import json
+import zlib
+from collections import namedtuple
+from operator import attrgetter
+
+from core.models import DeliveryAssignment
+
+EXPORT_FIELDS = [
+    ("id", "id"),
+    ("order_id", "order__order_id"),
+    ("driver_name", "driver__name"),
+    ("planned_start", "planned_start"),
+    ("planned_duration_min", "planned_duration_min"),
+    ("on_time", "on_time"),
+    ("penalty_rs", "penalty_rs"),
+    ("bonus_rs", "bonus_rs"),
+    ("fuel_cost_rs", "fuel_cost_rs"),
+    ("profit_rs", "profit_rs"),
+]
+EXPORT_COLUMNS = [name for name, _ in EXPORT_FIELDS]
+ExportRow = namedtuple("ExportRow", EXPORT_COLUMNS)
+_getters = [attrgetter(lookup.replace("__", ".")) for _, lookup in EXPORT_FIELDS]
+CONTENT_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+CHUNK_ROWS = 2000
+FLUSH_BYTES = 64 * 1024
+
+
+def export_rows(simulation_id):
+    return (DeliveryAssignment.objects.filter(simulation_id=simulation_id).order_by("id")
+            .values_list(*[lookup for _, lookup in EXPORT_FIELDS])
+            .iterator(chunk_size=CHUNK_ROWS))
+
+
+def assignment_values(simulation_id):
+    # Named rows so CursorPagination can read the id off each one.
+    return (DeliveryAssignment.objects.filter(simulation_id=simulation_id).order_by("id")
+            .values_list(*[lookup for _, lookup in EXPORT_FIELDS], named=True))
+
+
+def instance_values(assignments):
+    """assignment_values() rows for DeliveryAssignment objects already in memory."""
+    return [ExportRow(*(get(obj) for get in _getters)) for obj in assignments]
+
+
+def to_columns(rows):
+    """[(id, order_id, ...), ...] -> {"id": [...], "order_id": [...], ...}"""
+    columns = list(zip(*rows)) or [()] * len(EXPORT_COLUMNS)
+    return dict(zip(EXPORT_COLUMNS, map(list, columns)))
+
+
+def _buffered(pieces):
+    buf, size = [], 0
+    for piece in pieces:
+        buf.append(piece)
+        size += len(piece)
+        if size >= FLUSH_BYTES:
+            yield "".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield "".join(buf)
+
+
+def csv_lines(rows):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_COLUMNS)
+    yield out.getvalue()
+    for row in rows:
+        out.seek(0)
+        out.truncate()
+        writer.writerow([v.isoformat() if i == 3 else v for i, v in enumerate(row)])
+        yield out.getvalue()
+
+
+def ndjson_lines(rows):
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    for row in rows:
+        record = dict(zip(EXPORT_COLUMNS, row))
+        record["planned_start"] = record["planned_start"].isoformat()
+        yield dumps(record) + "\n"
+
+
+def gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(simulation_id, fmt, gzip=False, rows=None):
+    """Encode `rows` (default: the stored rows of `simulation_id`) as fmt, optionally gzipped."""
+    lines = csv_lines if fmt == "csv" else ndjson_lines
+    chunks = _buffered(lines(export_rows(simulation_id) if rows is None else rows))
+    return gzipped(chunks) if gzip else (c.encode() for c in chunks)
@@ -0,0 +1,94 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from core.simulation import TRAFFIC_LEVELS
+
+
+class KeysetOrderingFilter(OrderingFilter):
+    """OrderingFilter that always ends with the view's unique key so pages are stable."""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view) or [])
+        key = view.ordering[0]
+        if key not in ordering and f"-{key}" not in ordering:
+            ordering.append(key)
+        return ordering
+
+
+def parse_number(params, name, cast=int):
+    """Query param `name` as a number, None when absent; 400 if malformed."""
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        return cast(raw)
+    except (TypeError, ValueError):
+        raise ValidationError({name: f"Expected a number, got {raw!r}."})
+
+
+def parse_ids(params, name):
+    """Query param `name` as a list of comma-separated ids, None when absent; 400 if malformed."""
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        return [int(x) for x in raw.split(",")]
+    except ValueError:
+        raise ValidationError({name: f"Expected comma-separated ids, got {raw!r}."})
+
+
+def _traffic(params, name="traffic_level"):
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    levels = [level.strip() for level in raw.split(",")]
+    unknown = [level for level in levels if level not in TRAFFIC_LEVELS]
+    if unknown:
+        raise ValidationError({name: f"Unknown traffic level(s): {', '.join(unknown)}."})
+    return levels
+
+
+class QueryParamFilter(BaseFilterBackend):
+    """
+    Applies `view.filter_params`: {query param: (lookup, parser)}. Parsers
+    return None to skip the filter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        for param, (lookup, parse) in getattr(view, "filter_params", {}).items():
+            value = parse(request.query_params, param)
+            if value is not None:
+                queryset = queryset.filter(**{lookup: value})
+        return queryset
+
+
+ORDER_FILTERS = {
+    "route": ("route_id", parse_number),
+    "route_id": ("route__route_id", parse_number),
+    "traffic_level": ("route__traffic_level__in", _traffic),
+    "min_value": ("value_rs__gte", parse_number),
+    "max_value": ("value_rs__lte", parse_number),
+}
+
+def _bool(params, name):
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    if raw.lower() in ("1", "true", "yes"):
+        return True
+    if raw.lower() in ("0", "false", "no"):
+        return False
+    raise ValidationError({name: f"Expected true or false, got {raw!r}."})
+
+
+DRIVER_FILTERS = {
+    "fatigued": ("is_fatigued", _bool),
+    "min_avg_hours": ("week_avg_hours__gte", lambda p, n: parse_number(p, n, float)),
+    "max_avg_hours": ("week_avg_hours__lte", lambda p, n: parse_number(p, n, float)),
+}
+
+ROUTE_FILTERS = {
+    "traffic_level": ("traffic_level__in", _traffic),
+    "min_distance": ("distance_km__gte", lambda p, n: parse_number(p, n, float)),
+    "max_distance": ("distance_km__lte", lambda p, n: parse_number(p, n, float)),
+}
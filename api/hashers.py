@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    """
+    Django's bcrypt_sha256 hasher with the work factor from BCRYPT_ROUNDS.
+    Hashes made with another cost are re-hashed on the user's next login.
+    """
+
+    @property
+    def rounds(self):
+        return settings.BCRYPT_ROUNDS
@@ -0,0 +1,174 @@
+"""
+Per-request instrumentation exported at /metrics in the Prometheus text format.
+
+MetricsMiddleware records, per URL route pattern and method: a latency
+histogram, the number of SQL queries and the time spent in them (through
+connection execute wrappers), and the response size.
+
+Counters live in the memory of the process that served the request and are
+not shared. With several worker processes, /metrics answers with the counts
+of whichever worker handles the scrape, so scraping through a load balancer
+gives a different, partial view each time. Scrape every worker as its own
+target (or run one worker per instance) and sum in the queries.
+
+/metrics is closed unless METRICS_TOKEN or METRICS_ALLOWED_IPS is set, except
+with DEBUG on.
+
+Setting METRICS_SLOW_QUERY_MS logs every query slower than that, SQL text
+included, to the "api.metrics" logger.
+"""
+import hmac
+import logging
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+from threading import Lock
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.sum}"
+        yield f"{name}_count{{{labels}}} {cumulative}"
+
+
+class Series:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.db_seconds = 0.0
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Registry:
+    def __init__(self):
+        self._lock = Lock()
+        self.clear()
+
+    def clear(self):
+        self.requests = {}  # (route, method, status) -> count
+        self.series = {}    # (route, method) -> Series
+
+    def record(self, route, method, status, seconds, queries, db_seconds, size):
+        with self._lock:
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            series = self.series.setdefault((route, method), Series())
+            series.latency.observe(seconds)
+            series.queries.observe(queries)
+            series.db_seconds += db_seconds
+            if size is not None:
+                series.size.observe(size)
+
+    def render(self):
+        with self._lock:
+            lines = ["# HELP http_requests_total Requests handled.", "# TYPE http_requests_total counter"]
+            for (route, method, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{route="{_label(route)}",method="{method}",'
+                             f'status="{status}"}} {count}')
+            histograms = [
+                ("http_request_duration_seconds", "latency", "Request latency in seconds."),
+                ("http_request_db_queries", "queries", "SQL queries per request."),
+                ("http_response_size_bytes", "size", "Response body size (streaming responses excluded)."),
+            ]
+            for name, attr, help_text in histograms:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (route, method), series in sorted(self.series.items()):
+                    lines += getattr(series, attr).lines(name, f'route="{_label(route)}",method="{method}"')
+            lines += ["# HELP http_request_db_seconds_total Time spent in SQL.",
+                      "# TYPE http_request_db_seconds_total counter"]
+            for (route, method), series in sorted(self.series.items()):
+                lines.append(f'http_request_db_seconds_total{{route="{_label(route)}",method="{method}"}} '
+                             f"{round(series.db_seconds, 6)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class QueryTimer:
+    """execute_wrapper callable: counts and times every query of one request."""
+
+    def __init__(self, slow_ms):
+        self.count = 0
+        self.seconds = 0.0
+        self.slow_ms = slow_ms
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.seconds += elapsed
+            if self.slow_ms and elapsed * 1000 >= self.slow_ms:
+                logger.warning("slow query %.1fms on %s: %s", elapsed * 1000,
+                               context["connection"].alias, sql)
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "METRICS_ENABLED", True) or request.path == "/metrics":
+            return self.get_response(request)
+
+        timer = QueryTimer(getattr(settings, "METRICS_SLOW_QUERY_MS", 0))
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            started = time.perf_counter()
+            response = self.get_response(request)
+            elapsed = time.perf_counter() - started
+
+        match = getattr(request, "resolver_match", None)
+        # Route patterns, not paths, keep the label set bounded.
+        route = match.route if match else "<unmatched>"
+        size = None if response.streaming else len(response.content)
+        registry.record(route, request.method, response.status_code, elapsed, timer.count, timer.seconds, size)
+        return response
+
+
+def allowed(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    allowed_ips = getattr(settings, "METRICS_ALLOWED_IPS", [])
+    if not token and not allowed_ips:
+        return settings.DEBUG
+    if token and hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return True
+    return request.META.get("REMOTE_ADDR") in allowed_ips
+
+
+def metrics_view(request):
+    if not allowed(request):
+        return HttpResponse(status=401 if getattr(settings, "METRICS_TOKEN", "") else 403)
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
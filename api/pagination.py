@@ -0,0 +1,50 @@
+from operator import attrgetter
+
+from rest_framework.pagination import CursorPagination
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the list endpoints. Each view's `ordering` should
+    start with a unique, indexed field; ?ordering= (OrderingFilter) overrides it.
+    """
+    ordering = ("id",)
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view):
+        self.ordering = getattr(view, "ordering", None) or self.ordering
+        return super().get_ordering(request, queryset, view)
+
+
+class SimulationCursorPagination(CursorPagination):
+    ordering = ("-ran_at", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class AssignmentCursorPagination(CursorPagination):
+    ordering = ("id",)
+    page_size = 500
+    page_size_query_param = "page_size"
+    max_page_size = 5000
+
+
+class RowList(list):
+    """
+    Rows held in memory (a compacted run) with the part of the QuerySet API
+    that CursorPagination uses on an ("id",) ordering, so they page with the
+    same cursors as stored rows.
+    """
+
+    def order_by(self, *ordering):
+        return RowList(sorted(self, key=attrgetter("id"), reverse=ordering[0].startswith("-")))
+
+    def filter(self, **lookup):
+        (key, position), = lookup.items()
+        position = int(position)
+        if key.endswith("__gt"):
+            return RowList(row for row in self if row.id > position)
+        return RowList(row for row in self if row.id < position)
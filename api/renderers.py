@@ -0,0 +1,12 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Selected with ?format=columnar or Accept: application/vnd.greencart.columnar+json.
+    Views that offer it put assignments in {field: [values...]} form; the
+    encoding itself is plain compact JSON.
+    """
+    media_type = "application/vnd.greencart.columnar+json"
+    format = "columnar"
+    compact = True
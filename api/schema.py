@@ -0,0 +1,164 @@
+"""
+Precomputed OpenAPI schema.
+
+drf-spectacular introspects every view and serializer to build the schema,
+which is too much work to repeat per request. The schema is rendered once
+per code version into SCHEMA_CACHE_DIR (by `manage.py build_schema` at
+deploy time, or by the first request that finds no file), then served from
+memory with an ETag. Spectacular itself is only imported when a file has
+to be generated or the Swagger UI is requested.
+
+DEFAULT_SCHEMA_CLASS stays DRF's ViewInspector so views never load
+spectacular; generate() uses a private generator that gives each view an
+AutoSchema instead, without touching settings.
+"""
+import hashlib
+import os
+import tempfile
+from importlib.metadata import version as package_version
+from pathlib import Path
+from threading import Lock
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+
+# format -> (file suffix, media type), as drf-spectacular's renderers send them
+FORMATS = {
+    "yaml": ("yaml", "application/vnd.oai.openapi"),
+    "json": ("json", "application/vnd.oai.openapi+json"),
+}
+SOURCE_PACKAGES = ("api", "core", "greencart")
+
+_lock = Lock()
+_loaded = {}  # format -> (code version, content, etag)
+_code_version = None
+
+
+def code_version():
+    """
+    SCHEMA_CODE_VERSION (e.g. the deployed commit) if set, otherwise a hash
+    of the project's Python sources, the spectacular settings and version.
+    """
+    global _code_version
+    if _code_version is None:
+        _code_version = settings.SCHEMA_CODE_VERSION
+        if not _code_version:
+            digest = hashlib.sha256()
+            digest.update(package_version("drf-spectacular").encode())
+            digest.update(repr(sorted(settings.SPECTACULAR_SETTINGS.items())).encode())
+            for package in SOURCE_PACKAGES:
+                for path in sorted((Path(settings.BASE_DIR) / package).rglob("*.py")):
+                    digest.update(str(path.relative_to(settings.BASE_DIR)).encode())
+                    digest.update(path.read_bytes())
+            _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def schema_path(fmt, version=None):
+    return Path(settings.SCHEMA_CACHE_DIR) / f"openapi-{version or code_version()}.{FORMATS[fmt][0]}"
+
+
+def _generator():
+    from drf_spectacular.openapi import AutoSchema
+    from drf_spectacular.settings import spectacular_settings
+
+    class Generator(spectacular_settings.DEFAULT_GENERATOR_CLASS):
+        def create_view(self, callback, method, request=None):
+            view = super().create_view(callback, method, request)
+            if not isinstance(view.schema, AutoSchema):
+                view.schema = AutoSchema()
+            return view
+
+    return Generator()
+
+
+def generate():
+    """Render the schema in every format; returns {format: bytes}."""
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+    import api.schema_extensions  # noqa: F401  registers the auth scheme
+
+    schema = _generator().get_schema(request=None, public=True)
+    return {
+        "yaml": OpenApiYamlRenderer().render(schema, renderer_context={}),
+        "json": OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+
+
+def build(force=False):
+    """Write the schema files for the current code version; stale versions are removed."""
+    version = code_version()
+    paths = {fmt: schema_path(fmt, version) for fmt in FORMATS}
+    if not force and all(p.exists() for p in paths.values()):
+        return paths
+    directory = Path(settings.SCHEMA_CACHE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    for fmt, content in generate().items():
+        # Write-then-rename so concurrent workers never read a partial file.
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, paths[fmt])
+    for old in directory.glob("openapi-*.*"):
+        if old not in paths.values():
+            old.unlink(missing_ok=True)
+    return paths
+
+
+def load(fmt):
+    """(content, etag) for the current code version, generating the files if needed."""
+    version = code_version()
+    cached = _loaded.get(fmt)
+    if cached is None or cached[0] != version:
+        with _lock:
+            cached = _loaded.get(fmt)
+            if cached is None or cached[0] != version:
+                path = schema_path(fmt, version)
+                if not path.exists():
+                    build()
+                content = path.read_bytes()
+                etag = quote_etag(hashlib.sha256(content).hexdigest()[:32])
+                cached = _loaded[fmt] = (version, content, etag)
+    return cached[1], cached[2]
+
+
+def clear():
+    global _code_version
+    with _lock:
+        _loaded.clear()
+        _code_version = None
+
+
+def _format(request):
+    fmt = request.GET.get("format")
+    if fmt in FORMATS:
+        return fmt
+    return "json" if "json" in request.headers.get("Accept", "") else "yaml"
+
+
+@require_safe
+def schema_view(request):
+    fmt = _format(request)
+    content, etag = load(fmt)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type=FORMATS[fmt][1])
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+_docs_view = None
+
+
+def docs_view(request, *args, **kwargs):
+    global _docs_view
+    if _docs_view is None:
+        from drf_spectacular.views import SpectacularSwaggerView
+        _docs_view = SpectacularSwaggerView.as_view(url_name="schema")
+    return _docs_view(request, *args, **kwargs)
@@ -1,10 +1,14 @@
 from rest_framework import serializers
-from core.models import Driver, Route, Order, SimulationResult, DeliveryAssignment
+from core.models import Driver, Route, Order, SimulationResult, DeliveryAssignment, SimulationJob
 
 class DriverSerializer(serializers.ModelSerializer):
+    # Daily hours, oldest first; the derived columns assume non-negative ints.
+    past_week_hours = serializers.ListField(child=serializers.IntegerField(min_value=0), required=False)
+
     class Meta:
         model = Driver
         fields = "__all__"
+        read_only_fields = Driver.DERIVED_FIELDS
 
 class RouteSerializer(serializers.ModelSerializer):
     class Meta:
@@ -25,8 +29,22 @@ class DeliveryAssignmentSerializer(serializers.ModelSerializer):
         fields = ["id","order_id","driver_name","planned_start","planned_duration_min",
                   "on_time","penalty_rs","bonus_rs","fuel_cost_rs","profit_rs"]
 
+class SimulationResultSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SimulationResult
+        fields = ["id","ran_at","inputs","kpis","totals"]
+
 class SimulationResultSerializer(serializers.ModelSerializer):
     assignments = DeliveryAssignmentSerializer(many=True, read_only=True)
     class Meta:
         model = SimulationResult
-        fields = ["id","ran_at","inputs","kpis","totals","assignments"]
+        fields = ["id","ran_at","inputs","kpis","totals","profile","assignments"]
+
+class SimulationJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.IntegerField(source="id", read_only=True)
+    result = SimulationResultSummarySerializer(read_only=True)
+
+    class Meta:
+        model = SimulationJob
+        fields = ["job_id","status","progress","inputs","error","created_at",
+                  "started_at","finished_at","result"]
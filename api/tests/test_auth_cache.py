@@ -0,0 +1,79 @@
+import json
+import time
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import STAMP_CACHE, user_cache
+
+
+@override_settings(BCRYPT_ROUNDS=4)
+class CachedJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        caches[STAMP_CACHE].clear()
+        self.user = User.objects.create_user("alice", password="pw-123456")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get("/api/routes/").status_code, 200)
+        return [q for q in ctx.captured_queries if "auth_user" in q["sql"]]
+
+    def test_second_request_skips_user_query(self):
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(self.user_queries(), [])
+
+    def test_deactivation_evicts(self):
+        self.user_queries()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/routes/").status_code, 401)
+
+    def test_change_in_another_process_evicts(self):
+        self.user_queries()
+        self.user.is_active = False
+        # Saved elsewhere: only the shared stamp changes, not this process's LRU.
+        with mock.patch.object(user_cache, "discard"), self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(self.client.get("/api/routes/").status_code, 401)
+
+    def test_entries_expire(self):
+        self.user_queries()
+        with mock.patch("core.cache.time.monotonic", return_value=time.monotonic() + user_cache.ttl + 1):
+            self.assertEqual(len(self.user_queries()), 1)
+
+    def test_new_passwords_use_bcrypt(self):
+        self.assertTrue(self.user.password.startswith("bcrypt_sha256$"))
+        self.assertIn("$2b$04$", self.user.password)
+
+    def test_pbkdf2_hash_upgraded_on_login(self):
+        with override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.PBKDF2PasswordHasher"]):
+            self.user.set_password("pw-123456")
+            self.user.save()
+        response = self.client.post("/api/auth/login/", {"username": "alice", "password": "pw-123456"},
+                                    format="json")
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("bcrypt_sha256$"))
+
+
+class BenchAuthCommandTest(TransactionTestCase):
+    # The benchmark runs requests on worker threads, which need committed data.
+    def test_runs_and_cleans_up(self):
+        out = StringIO()
+        call_command("bench_auth", requests=3, concurrency=1, rounds=4, stdout=out)
+        result = json.loads(out.getvalue())
+        self.assertEqual(result["bcrypt_rounds"], 4)
+        self.assertEqual(set(result["scenarios"]), {"register", "login", "read"})
+        self.assertEqual(result["scenarios"]["login"]["errors"], 0)
+        self.assertFalse(User.objects.filter(username__startswith="bench-").exists())
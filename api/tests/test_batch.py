@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from core.models import Driver, Route, Order
+from core.versioning import current
+from rest_framework.test import APIClient
+
+
+class BatchEndpointTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("dispatch", password="x"))
+        self.route = Route.objects.create(route_id=1, distance_km=10, traffic_level="Low", base_time_min=30)
+        self.other = Route.objects.create(route_id=2, distance_km=4, traffic_level="High", base_time_min=15)
+        self.o1 = Order.objects.create(order_id=1, value_rs=100, route=self.route, delivery_time_min=30)
+        self.o2 = Order.objects.create(order_id=2, value_rs=200, route=self.route, delivery_time_min=30)
+
+    def batch(self, url, payload):
+        return self.client.post(url, payload, format="json")
+
+    def test_mixed_batch_applies_in_one_go(self):
+        version = current()["order"]
+        res = self.batch("/api/orders/batch/", {
+            "create": [{"order_id": 3, "value_rs": 300, "route": self.route.id, "delivery_time_min": 20},
+                       {"order_id": 4, "value_rs": 400, "route": self.other.id, "delivery_time_min": 25}],
+            "update": [{"id": self.o1.id, "value_rs": 150, "route": self.other.id}],
+            "delete": [self.o2.id, 999],
+        })
+        self.assertEqual(res.status_code, 200, res.content)
+        body = res.json()
+        self.assertEqual([r["index"] for r in body["created"]], [0, 1])
+        self.assertEqual(body["updated"], [{"index": 0, "id": self.o1.id}])
+        self.assertEqual([r["status"] for r in body["deleted"]], ["deleted", "not_found"])
+
+        self.o1.refresh_from_db()
+        self.assertEqual((self.o1.value_rs, self.o1.route_id), (150, self.other.id))
+        self.assertEqual(sorted(Order.objects.values_list("order_id", flat=True)), [1, 3, 4])
+        self.assertGreater(current()["order"], version)
+
+    def test_invalid_item_rejects_whole_batch(self):
+        res = self.batch("/api/drivers/batch/", {
+            "create": [{"name": "Ok", "shift_hours": 6, "past_week_hours": []},
+                       {"name": "Bad", "shift_hours": -1}],
+            "update": [{"id": 12345, "shift_hours": 4}],
+        })
+        self.assertEqual(res.status_code, 400)
+        body = res.json()
+        self.assertEqual(body["created"][0]["index"], 1)
+        self.assertIn("shift_hours", body["created"][0]["errors"])
+        self.assertEqual(body["updated"][0]["errors"], {"id": ["Not found."]})
+        self.assertFalse(Driver.objects.exists())
+
+    def test_protected_delete_conflicts(self):
+        res = self.batch("/api/routes/batch/", {"delete": [self.route.id]})
+        self.assertEqual(res.status_code, 409)
+        self.assertTrue(Route.objects.filter(pk=self.route.id).exists())
+
+    def test_batch_bumps_version_once(self):
+        version = current()["order"]
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.batch("/api/orders/batch/", {
+                "create": [{"order_id": 3, "value_rs": 300, "route": self.route.id, "delivery_time_min": 20}],
+                "delete": [self.o1.id, self.o2.id],
+            })
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(current()["order"], version + 1)
+        bumps = [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE") and "core_dataversion" in q["sql"]]
+        self.assertEqual(len(bumps), 1)
+
+    def test_non_object_body_is_rejected(self):
+        res = self.batch("/api/orders/batch/", [{"delete": [self.o1.id]}])
+        self.assertEqual(res.status_code, 400)
+        self.assertTrue(Order.objects.filter(pk=self.o1.id).exists())
+
+    def test_booleans_are_not_ids(self):
+        self.assertEqual(self.batch("/api/orders/batch/", {"delete": [True]}).status_code, 400)
+        res = self.batch("/api/orders/batch/", {"update": [{"id": True, "value_rs": 1}]})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.json()["updated"][0]["errors"], {"id": ["Not found."]})
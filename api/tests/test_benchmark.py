@@ -0,0 +1,71 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from core import bench, synthetic
+from core.models import Driver, Route, Order, SimulationResult
+
+
+class SyntheticDataTest(SimpleTestCase):
+    def test_same_seed_same_rows(self):
+        a = {k: list(v) for k, v in synthetic.dataset(5, 10, 50, seed=7).items()}
+        b = {k: list(v) for k, v in synthetic.dataset(5, 10, 50, seed=7).items()}
+        c = {k: list(v) for k, v in synthetic.dataset(5, 10, 50, seed=8).items()}
+        self.assertEqual(a, b)
+        self.assertNotEqual(a["orders"], c["orders"])
+        self.assertEqual(len(a["orders"]), 51)  # header + rows
+
+    def test_traffic_mix(self):
+        levels = [row[2] for row in synthetic.route_rows(300, seed=1, traffic_mix=(0, 0, 1))]
+        self.assertEqual(set(levels), {"High"})
+
+    def test_write_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = synthetic.write(synthetic.dataset(2, 3, 4), tmp)
+            self.assertEqual(Path(paths["routes"]).read_text().splitlines()[0],
+                             "route_id,distance_km,traffic_level,base_time_min")
+
+
+class BenchmarkCommandTest(TestCase):
+    def test_generate_and_bench(self):
+        call_command("generate_data", drivers=4, routes=6, orders=120, seed=3, stdout=StringIO())
+        self.assertEqual((Driver.objects.count(), Route.objects.count(), Order.objects.count()), (4, 6, 120))
+        self.assertTrue(Driver.objects.filter(is_fatigued=False).exists())
+
+        out = StringIO()
+        call_command("bench_simulation", mode="persist", repeat=1, warmup=0, max_hours=100, stdout=out)
+        result = json.loads(out.getvalue())
+        self.assertEqual(result["orders_simulated"], 120)
+        self.assertGreater(result["queries"], 0)
+        self.assertGreater(result["orders_per_sec"], 0)
+        self.assertIn("peak_memory_mb", result)
+        self.assertFalse(SimulationResult.objects.exists())
+
+        out = StringIO()
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as baseline:
+            json.dump(result, baseline)
+            baseline.flush()
+            call_command("bench_simulation", mode="api", repeat=1, warmup=0, baseline=baseline.name, stdout=out)
+        self.assertEqual(json.loads(out.getvalue())["compare"]["baseline_commit"], result["commit"])
+
+    def test_only_its_own_results_are_deleted(self):
+        call_command("generate_data", drivers=3, routes=2, orders=10, stdout=StringIO())
+        others = []
+
+        def persist_alongside_another_user(inputs, stream):
+            # Someone else's run lands while the benchmark is going.
+            others.append(SimulationResult.objects.create(inputs=inputs, kpis={}, totals={}).id)
+            return bench._persist(inputs, stream)
+
+        with mock.patch.dict(bench.RUNNERS, persist=persist_alongside_another_user):
+            call_command("bench_simulation", mode="persist", repeat=2, warmup=1, stdout=StringIO())
+        self.assertEqual(list(SimulationResult.objects.order_by("id").values_list("id", flat=True)), others)
+
+    def test_replace(self):
+        call_command("generate_data", drivers=3, routes=2, orders=10, stdout=StringIO())
+        call_command("generate_data", drivers=2, routes=2, orders=5, replace=True, stdout=StringIO())
+        self.assertEqual((Driver.objects.count(), Order.objects.count()), (2, 5))
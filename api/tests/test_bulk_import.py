@@ -0,0 +1,52 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from core.importing import import_csv
+from core.models import Driver, Route, Order
+from core.versioning import current
+from rest_framework.test import APIClient
+
+
+class BulkImportTest(TestCase):
+    def test_seed_command_loads_bundled_csvs(self):
+        call_command("seed_from_csv", stdout=io.StringIO())
+        self.assertEqual((Route.objects.count(), Driver.objects.count(), Order.objects.count()), (10, 10, 50))
+        self.assertEqual(Driver.objects.get(name="Amit").past_week_hours, [6, 8, 7, 7, 7, 6, 10])
+        self.assertEqual(Order.objects.get(order_id=1).delivery_time_min, 127)
+
+    def test_upsert_and_row_errors(self):
+        import_csv("routes", io.StringIO(
+            "route_id,distance_km,traffic_level,base_time_min\n1,10,Low,30\n2,5,High,20\n"))
+        version = current()["order"]
+        report = import_csv("orders", io.StringIO(
+            "order_id,value_rs,route_id,delivery_time\n"
+            "1,500,1,00:30\n"
+            "2,700,9,00:30\n"
+            "3,abc,2,00:30\n"
+            "1,900,2,00:45\n"
+        ), chunk_size=2)
+        self.assertEqual(report["rows"], 4)
+        self.assertEqual(report["error_count"], 2)
+        self.assertEqual([e["line"] for e in report["errors"]], [3, 4])
+        order = Order.objects.select_related("route").get(order_id=1)
+        self.assertEqual((order.value_rs, order.route.route_id, order.delivery_time_min), (900, 2, 45))
+        self.assertGreater(current()["order"], version)
+
+    def test_driver_week_hours_validated(self):
+        report = import_csv("drivers", io.StringIO(
+            "name,shift_hours,past_week_hours\nA,6,8|9\nB,6,4|-9\nC,6,8|x\n"))
+        self.assertEqual([e["line"] for e in report["errors"]], [3, 4])
+        self.assertEqual(report["imported"], 1)
+
+    def test_upload_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("planner", password="x"))
+        upload = SimpleUploadedFile("drivers.csv", b"name,shift_hours,past_week_hours\nRavi,6,8|9\n")
+        res = client.post("/api/import/drivers/", {"file": upload}, format="multipart")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["imported"], 1)
+        self.assertEqual(Driver.objects.get(name="Ravi").past_week_hours, [8, 9])
+        self.assertEqual(client.post("/api/import/trucks/", {}, format="multipart").status_code, 404)
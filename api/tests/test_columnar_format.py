@@ -0,0 +1,53 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from core.models import Driver, Route, Order, DeliveryAssignment
+from rest_framework.test import APIClient
+
+
+class ColumnarFormatTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        Driver.objects.create(name="B", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 10])
+        route = Route.objects.create(route_id=1, distance_km=4, traffic_level="High", base_time_min=20)
+        for i in range(1, 13):
+            Order.objects.create(order_id=i, value_rs=600 + i * 100, route=route, delivery_time_min=20)
+        self.sim_id = self.client.post("/api/simulations/run/", {
+            "available_drivers": 2, "route_start_time": "09:00", "max_hours_per_driver": 8
+        }, format="json").json()["id"]
+
+    def test_detail_matches_row_format(self):
+        rows = self.client.get(f"/api/simulations/{self.sim_id}/").json()
+        res = self.client.get(f"/api/simulations/{self.sim_id}/?format=columnar")
+        self.assertEqual(res["Content-Type"], "application/vnd.greencart.columnar+json")
+        body = res.json()
+        columns = body.pop("assignments")
+        self.assertEqual(list(body.items()), [(k, v) for k, v in rows.items() if k != "assignments"])
+        self.assertEqual(set(columns), set(rows["assignments"][0]))
+        rebuilt = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        self.assertEqual(rebuilt, rows["assignments"])
+        self.assertLess(len(res.content), len(self.client.get(f"/api/simulations/{self.sim_id}/").content))
+
+    def test_assignments_page_through_columns(self):
+        url = f"/api/simulations/{self.sim_id}/assignments/?format=columnar&page_size=5"
+        body = self.client.get(url).json()
+        self.assertEqual(body["results"]["order_id"], [1, 2, 3, 4, 5])
+        self.assertEqual(body["results"]["driver_name"], ["A", "B", "A", "B", "A"])
+        ids = list(body["results"]["id"])
+        while body["next"]:
+            body = self.client.get(body["next"]).json()
+            ids += body["results"]["id"]
+        self.assertEqual(len(ids), 12)
+        self.assertEqual(ids, sorted(ids))
+
+    def test_accept_header_and_unsupported_views(self):
+        res = self.client.get(f"/api/simulations/{self.sim_id}/assignments/",
+                              HTTP_ACCEPT="application/vnd.greencart.columnar+json")
+        self.assertIsInstance(res.json()["results"], dict)
+        self.assertEqual(self.client.get("/api/simulations/?format=columnar").status_code, 404)
+
+    def test_empty_simulation(self):
+        DeliveryAssignment.objects.filter(simulation_id=self.sim_id).delete()
+        body = self.client.get(f"/api/simulations/{self.sim_id}/assignments/?format=columnar").json()
+        self.assertEqual(body["results"]["profit_rs"], [])
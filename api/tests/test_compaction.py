@@ -0,0 +1,102 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db.models import ProtectedError
+from django.test import TestCase
+from django.utils import timezone
+from core.compaction import HydrationError, compact, hydrate
+from core.models import (Driver, Route, Order, SimulationResult, DeliveryAssignment, CompactedAssignments,
+                         CompactedReference)
+from rest_framework.test import APIClient
+
+
+class CompactionTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        Driver.objects.create(name="B", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 10])
+        route = Route.objects.create(route_id=1, distance_km=4, traffic_level="High", base_time_min=20)
+        for i in range(1, 41):
+            Order.objects.create(order_id=i, value_rs=600 + i * 30, route=route, delivery_time_min=20)
+        self.sim_id = self.run_sim(2)
+
+    def run_sim(self, drivers):
+        return self.client.post("/api/simulations/run/", {
+            "available_drivers": drivers, "route_start_time": "09:00", "max_hours_per_driver": 8
+        }, format="json").json()["id"]
+
+    def age(self, sim_id, days):
+        SimulationResult.objects.filter(pk=sim_id).update(ran_at=timezone.now() - timedelta(days=days))
+
+    def test_command_compacts_only_old_runs(self):
+        recent = self.run_sim(1)
+        self.age(self.sim_id, 40)
+        out = StringIO()
+        call_command("compact_simulations", "--days", "30", stdout=out)
+        self.assertIn("Compacted 1 simulations (40 assignment rows)", out.getvalue())
+        self.assertFalse(DeliveryAssignment.objects.filter(simulation_id=self.sim_id).exists())
+        self.assertTrue(DeliveryAssignment.objects.filter(simulation_id=recent).exists())
+        packed = CompactedAssignments.objects.get(simulation_id=self.sim_id)
+        self.assertEqual(packed.row_count, 40)
+        self.assertLess(len(packed.data), packed.raw_bytes)
+
+    def test_kpis_stay_queryable(self):
+        summary = self.client.get("/api/simulations/summary/").json()
+        compact(SimulationResult.objects.get(pk=self.sim_id))
+        self.assertEqual(self.client.get("/api/simulations/summary/").json(), summary)
+        listed = self.client.get("/api/simulations/").json()["results"][0]
+        self.assertEqual(listed["kpis"]["on_time"] + listed["kpis"]["late"], 40)
+
+    def test_api_reads_compacted_runs_in_place(self):
+        urls = [f"/api/simulations/{self.sim_id}/", f"/api/simulations/{self.sim_id}/?format=columnar",
+                f"/api/simulations/{self.sim_id}/assignments/?page_size=15",
+                f"/api/simulations/{self.sim_id}/assignments/?page_size=15&format=columnar"]
+        before = [self.client.get(url).content for url in urls]
+        export = self.client.get(f"/api/simulations/{self.sim_id}/export/?fmt=csv")
+        before_export = b"".join(export.streaming_content)
+        next_page = self.client.get(urls[2]).json()["next"]
+        before_next = self.client.get(next_page).content
+
+        compact(SimulationResult.objects.get(pk=self.sim_id))
+        caches["responses"].clear()  # otherwise the cached payload is served without opening the run
+        self.assertEqual([self.client.get(url).content for url in urls], before)
+        self.assertEqual(self.client.get(next_page).content, before_next)
+        export = self.client.get(f"/api/simulations/{self.sim_id}/export/?fmt=csv")
+        self.assertEqual(b"".join(export.streaming_content), before_export)
+        self.client.post("/api/simulations/run/", {
+            "available_drivers": 2, "route_start_time": "09:00", "max_hours_per_driver": 8
+        }, format="json")  # cached hit on the compacted run
+
+        self.assertIsNotNone(SimulationResult.objects.get(pk=self.sim_id).compacted_at)
+        self.assertTrue(CompactedAssignments.objects.filter(simulation_id=self.sim_id).exists())
+        self.assertFalse(DeliveryAssignment.objects.filter(simulation_id=self.sim_id).exists())
+
+    def test_referenced_orders_and_drivers_stay_protected(self):
+        compact(SimulationResult.objects.get(pk=self.sim_id))
+        with self.assertRaises(ProtectedError):
+            Order.objects.get(order_id=40).delete()
+        with self.assertRaises(ProtectedError):
+            Driver.objects.get(name="A").delete()
+        response = self.client.post("/api/orders/batch/", {"delete": [Order.objects.get(order_id=1).pk]},
+                                    format="json")
+        self.assertEqual(response.status_code, 409)
+
+        self.assertEqual(hydrate(SimulationResult.objects.get(pk=self.sim_id)), 40)
+        self.assertFalse(CompactedReference.objects.exists())
+
+    def test_hydrate_refuses_to_drop_rows(self):
+        # A run compacted before references were recorded.
+        compact(SimulationResult.objects.get(pk=self.sim_id))
+        CompactedReference.objects.all().delete()
+        Order.objects.get(order_id=40).delete()
+        with self.assertRaises(HydrationError):
+            hydrate(SimulationResult.objects.get(pk=self.sim_id))
+        self.assertTrue(CompactedAssignments.objects.filter(simulation_id=self.sim_id).exists())
+        response = self.client.post(f"/api/simulations/{self.sim_id}/resimulate/")
+        self.assertEqual(response.status_code, 409)
+        body = self.client.get(f"/api/simulations/{self.sim_id}/").json()
+        self.assertEqual(len(body["assignments"]), 40)
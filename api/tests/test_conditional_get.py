@@ -0,0 +1,62 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from core.models import Driver, Route, Order
+from core.services import run_simulation
+from rest_framework.test import APIClient
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        self.route = Route.objects.create(route_id=1, distance_km=5, traffic_level="Low", base_time_min=20)
+        for i in range(1, 4):
+            Order.objects.create(order_id=i, value_rs=500, route=self.route, delivery_time_min=30)
+
+    def test_unchanged_list_returns_304_without_querying_rows(self):
+        first = self.client.get("/api/drivers/")
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("Last-Modified", first)
+        with CaptureQueriesContext(connection) as ctx:
+            again = self.client.get("/api/drivers/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+        self.assertFalse([q for q in ctx.captured_queries if "core_driver" in q["sql"]])
+
+    def test_etag_changes_with_data_and_with_query(self):
+        etag = self.client.get("/api/orders/")["ETag"]
+        self.assertNotEqual(self.client.get("/api/orders/?min_value=100")["ETag"], etag)
+        Order.objects.create(order_id=4, value_rs=900, route=self.route, delivery_time_min=30)
+        res = self.client.get("/api/orders/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()["results"]), 4)
+        # Orders do not depend on drivers.
+        Driver.objects.create(name="B", shift_hours=6, past_week_hours=[])
+        self.assertEqual(self.client.get("/api/orders/", HTTP_IF_NONE_MATCH=res["ETag"]).status_code, 304)
+
+    def test_detail_and_simulation_endpoints(self):
+        route_etag = self.client.get(f"/api/routes/{self.route.pk}/")["ETag"]
+        self.assertEqual(self.client.get(f"/api/routes/{self.route.pk}/",
+                                         HTTP_IF_NONE_MATCH=route_etag).status_code, 304)
+
+        sim = run_simulation({"available_drivers": 1, "route_start_time": "09:00", "max_hours_per_driver": 8})
+        list_etag = self.client.get("/api/simulations/")["ETag"]
+        detail_etag = self.client.get(f"/api/simulations/{sim.pk}/")["ETag"]
+        assignments_etag = self.client.get(f"/api/simulations/{sim.pk}/assignments/")["ETag"]
+        self.assertEqual(self.client.get("/api/simulations/", HTTP_IF_NONE_MATCH=list_etag).status_code, 304)
+
+        # A renamed driver shows up in the detail's assignment rows but not in the list.
+        Driver.objects.filter(name="A").get().save()
+        self.assertEqual(self.client.get("/api/simulations/", HTTP_IF_NONE_MATCH=list_etag).status_code, 304)
+        self.assertEqual(self.client.get(f"/api/simulations/{sim.pk}/",
+                                         HTTP_IF_NONE_MATCH=detail_etag).status_code, 200)
+        self.assertEqual(self.client.get(f"/api/simulations/{sim.pk}/assignments/",
+                                         HTTP_IF_NONE_MATCH=assignments_etag).status_code, 200)
+
+    def test_requires_authentication(self):
+        etag = self.client.get("/api/drivers/")["ETag"]
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get("/api/drivers/", HTTP_IF_NONE_MATCH=etag).status_code, 401)
@@ -0,0 +1,69 @@
+from collections import defaultdict
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from core.models import Driver, Route, Order, DeliveryAssignment, SimulationAggregate
+from rest_framework.test import APIClient
+
+
+class DashboardSummaryTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        Driver.objects.create(name="B", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 10])
+        routes = [Route.objects.create(route_id=r, distance_km=3 * r, traffic_level=t, base_time_min=15 * r)
+                  for r, t in ((1, "Low"), (2, "High"), (3, "High"))]
+        for i in range(1, 19):
+            Order.objects.create(order_id=i, value_rs=400 + i * 80, route=routes[i % 3], delivery_time_min=20)
+        self.ids = [self.run_sim(n) for n in (1, 2)]
+
+    def run_sim(self, drivers):
+        return self.client.post("/api/simulations/run/", {
+            "available_drivers": drivers, "route_start_time": "09:00", "max_hours_per_driver": 8
+        }, format="json").json()["id"]
+
+    def expected(self, ids):
+        profit, fuel = defaultdict(int), defaultdict(int)
+        traffic = defaultdict(lambda: [0, 0])
+        for a in DeliveryAssignment.objects.filter(simulation_id__in=ids).select_related("driver", "order__route"):
+            profit[a.driver.name] += a.profit_rs
+            fuel[a.order.route.route_id] += a.fuel_cost_rs
+            traffic[a.traffic_level][0] += 1
+            traffic[a.traffic_level][1] += a.on_time
+        return profit, fuel, traffic
+
+    def test_run_materializes_aggregates(self):
+        rows = SimulationAggregate.objects.filter(simulation_id=self.ids[1])
+        self.assertEqual(sorted(rows.filter(dimension="driver").values_list("key", flat=True)), ["A", "B"])
+        self.assertEqual(sum(rows.filter(dimension="route").values_list("deliveries", flat=True)), 18)
+
+    def test_summary_matches_assignments_in_one_query(self):
+        with self.assertNumQueries(2):  # version stamp + grouped aggregate query
+            body = self.client.get("/api/simulations/summary/").json()
+        profit, fuel, traffic = self.expected(self.ids)
+        self.assertEqual({r["driver"]: r["profit_rs"] for r in body["profit_by_driver"]}, dict(profit))
+        self.assertEqual({r["route_id"]: r["fuel_cost_rs"] for r in body["fuel_by_route"]}, dict(fuel))
+        by_level = {r["traffic_level"]: r for r in body["on_time_by_traffic"]}
+        self.assertEqual(list(by_level), ["Low", "Medium", "High"])
+        self.assertEqual(by_level["Medium"]["deliveries"], 0)
+        deliveries, on_time = traffic["High"]
+        self.assertEqual((by_level["High"]["deliveries"], by_level["High"]["on_time"]), (deliveries, on_time))
+        self.assertEqual(by_level["High"]["on_time_rate"], round(on_time / deliveries * 100, 2))
+
+    def test_filters(self):
+        body = self.client.get(f"/api/simulations/summary/?simulation={self.ids[0]}").json()
+        self.assertEqual([r["driver"] for r in body["profit_by_driver"]], ["A"])
+        latest = self.client.get("/api/simulations/summary/?last=1").json()
+        self.assertEqual({r["driver"] for r in latest["profit_by_driver"]}, {"A", "B"})
+        self.assertEqual(self.client.get("/api/simulations/summary/?simulation=x").status_code, 400)
+        self.assertEqual(self.client.get("/api/simulations/summary/?last=0").status_code, 400)
+
+    def test_resimulate_refreshes_aggregates(self):
+        route = Route.objects.get(route_id=1)
+        route.traffic_level = "High"
+        route.save()
+        self.client.post(f"/api/simulations/{self.ids[1]}/resimulate/")
+        body = self.client.get(f"/api/simulations/summary/?simulation={self.ids[1]}").json()
+        self.assertEqual({r["traffic_level"]: r["deliveries"] for r in body["on_time_by_traffic"]},
+                         {"Low": 0, "Medium": 0, "High": 18})
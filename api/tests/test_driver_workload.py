@@ -0,0 +1,52 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from core.models import Driver
+from rest_framework.test import APIClient
+
+
+class DriverWorkloadTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("viewer", password="x"))
+        self.tired = Driver.objects.create(name="Tired", shift_hours=6, past_week_hours=[8, 8, 9, 10])
+        self.fresh = Driver.objects.create(name="Fresh", shift_hours=6, past_week_hours=[4, 6])
+
+    def test_columns_synced_on_save(self):
+        self.assertTrue(self.tired.is_fatigued)
+        self.assertEqual((self.tired.last_day_hours, self.tired.week_total_hours, self.tired.week_avg_hours),
+                         (10, 35, 8.75))
+        self.tired.past_week_hours = [9, 7]
+        self.tired.save(update_fields=["past_week_hours"])
+        self.tired.refresh_from_db()
+        self.assertFalse(self.tired.is_fatigued)
+        self.assertEqual(self.tired.week_avg_hours, 8)
+
+    def test_batch_update_keeps_columns_in_sync(self):
+        res = self.client.post("/api/drivers/batch/", {
+            "create": [{"name": "New", "shift_hours": 8, "past_week_hours": [12]}],
+            "update": [{"id": self.fresh.id, "past_week_hours": [9, 9, 9]}],
+        }, format="json")
+        self.assertEqual(res.status_code, 200, res.content)
+        self.assertEqual(
+            set(Driver.objects.filter(is_fatigued=True).values_list("name", flat=True)),
+            {"Tired", "Fresh", "New"},
+        )
+
+    def test_list_filters_and_read_only(self):
+        body = self.client.get("/api/drivers/?fatigued=false").json()
+        self.assertEqual([d["name"] for d in body["results"]], ["Fresh"])
+        body = self.client.get("/api/drivers/?min_avg_hours=6&ordering=-week_avg_hours").json()
+        self.assertEqual([d["name"] for d in body["results"]], ["Tired"])
+
+        res = self.client.patch(f"/api/drivers/{self.fresh.id}/", {"is_fatigued": True}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.fresh.refresh_from_db()
+        self.assertFalse(self.fresh.is_fatigued)
+
+    def test_invalid_week_hours_rejected(self):
+        for hours in ([4, -9], ["x"], "8,9"):
+            res = self.client.post("/api/drivers/", {"name": "Bad", "shift_hours": 6, "past_week_hours": hours},
+                                   format="json")
+            self.assertEqual(res.status_code, 400, hours)
+            self.assertIn("past_week_hours", res.json())
+        self.assertFalse(Driver.objects.filter(name="Bad").exists())
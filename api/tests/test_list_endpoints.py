@@ -0,0 +1,44 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from core.models import Route, Order
+from rest_framework.test import APIClient
+
+
+class ListEndpointTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("viewer", password="x"))
+        self.low = Route.objects.create(route_id=1, distance_km=5, traffic_level="Low", base_time_min=20)
+        self.high = Route.objects.create(route_id=2, distance_km=15, traffic_level="High", base_time_min=60)
+        for i in range(1, 21):
+            Order.objects.create(order_id=i, value_rs=i * 100, route=self.low if i % 2 else self.high,
+                                 delivery_time_min=30)
+
+    def collect(self, url):
+        ids, pages = [], 0
+        while url:
+            body = self.client.get(url).json()
+            ids += [o["order_id"] for o in body["results"]]
+            url, pages = body["next"], pages + 1
+        return ids, pages
+
+    def test_orders_are_cursor_paginated(self):
+        ids, pages = self.collect("/api/orders/?page_size=6")
+        self.assertEqual(ids, list(range(1, 21)))
+        self.assertEqual(pages, 4)
+
+    def test_order_filters(self):
+        ids, _ = self.collect("/api/orders/?traffic_level=High&min_value=500&max_value=1500")
+        self.assertEqual(ids, [6, 8, 10, 12, 14])
+        ids, _ = self.collect(f"/api/orders/?route={self.low.id}&max_value=500")
+        self.assertEqual(ids, [1, 3, 5])
+        ids, _ = self.collect("/api/orders/?route_id=2&ordering=-value_rs&page_size=3")
+        self.assertEqual(ids, list(range(20, 0, -2)))
+
+    def test_invalid_filter_values(self):
+        self.assertEqual(self.client.get("/api/orders/?min_value=lots").status_code, 400)
+        self.assertEqual(self.client.get("/api/routes/?traffic_level=Jammed").status_code, 400)
+
+    def test_route_filters(self):
+        body = self.client.get("/api/routes/?traffic_level=Low,Medium").json()
+        self.assertEqual([r["route_id"] for r in body["results"]], [1])
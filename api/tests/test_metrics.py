@@ -0,0 +1,75 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from core.models import Route
+from rest_framework.test import APIClient
+from api.metrics import registry
+
+
+@override_settings(METRICS_ALLOWED_IPS=["127.0.0.1"])
+class MetricsTest(TestCase):
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        for i in range(1, 4):
+            Route.objects.create(route_id=i, distance_km=i, traffic_level="Low", base_time_min=20)
+
+    def metrics(self, **headers):
+        return self.client.get("/metrics", **headers)
+
+    def sample(self, text, prefix):
+        return [line for line in text.splitlines() if line.startswith(prefix)]
+
+    def test_records_latency_queries_and_size_per_route(self):
+        self.client.get("/api/routes/")
+        self.client.get("/api/routes/")
+        self.client.get(f"/api/routes/{Route.objects.first().pk}/")
+        res = self.metrics()
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        text = res.content.decode()
+
+        list_route = 'route="api/routes/$",method="GET"'
+        self.assertIn(f'http_requests_total{{{list_route},status="200"}} 2', text)
+        self.assertIn(f"http_request_duration_seconds_count{{{list_route}}} 2", text)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{list_route},le="+Inf"}} 2', text)
+        queries = self.sample(text, f"http_request_db_queries_sum{{{list_route}}}")
+        self.assertGreater(float(queries[0].split()[-1]), 0)
+        self.assertTrue(self.sample(text, f"http_response_size_bytes_count{{{list_route}}} 2"))
+        self.assertTrue(self.sample(text, f"http_request_db_seconds_total{{{list_route}}}"))
+        self.assertIn('route="api/routes/(?P<pk>[^/.]+)/$"', text)
+        # /metrics itself is not recorded.
+        self.assertNotIn('route="metrics"', text)
+
+    def test_unmatched_paths_share_one_label(self):
+        self.client.get("/nope/1")
+        self.client.get("/nope/2")
+        self.assertIn('http_requests_total{route="<unmatched>",method="GET",status="404"} 2',
+                      self.metrics().content.decode())
+
+    @override_settings(METRICS_TOKEN="s3cret", METRICS_ALLOWED_IPS=[])
+    def test_token(self):
+        self.assertEqual(self.metrics().status_code, 401)
+        self.assertEqual(self.metrics(HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+        self.assertEqual(self.metrics(HTTP_AUTHORIZATION="Bearer s3cret").status_code, 200)
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.5"])
+    def test_allowed_ips(self):
+        self.assertEqual(self.metrics().status_code, 403)
+        self.assertEqual(self.metrics(REMOTE_ADDR="10.0.0.5").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="", METRICS_ALLOWED_IPS=[])
+    def test_closed_without_token_or_ips_unless_debug(self):
+        self.assertEqual(self.metrics().status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.metrics().status_code, 200)
+
+    @override_settings(METRICS_SLOW_QUERY_MS=0.000001)
+    def test_slow_query_log(self):
+        with self.assertLogs("api.metrics", level="WARNING") as logs:
+            self.client.get("/api/routes/")
+        self.assertTrue(any("core_route" in line for line in logs.output))
+
+    def test_slow_query_log_is_opt_in(self):
+        with self.assertNoLogs("api.metrics", level="WARNING"):
+            self.client.get("/api/routes/")
@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from core.models import Driver, Route, Order, DeliveryAssignment, SimulationResult
+from rest_framework.test import APIClient
+
+COMPARED = ["order__order_id", "driver_id", "planned_start", "planned_duration_min", "on_time",
+            "penalty_rs", "bonus_rs", "fuel_cost_rs", "profit_rs"]
+
+
+class ResimulateTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        self.d1 = Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6])
+        self.d2 = Driver.objects.create(name="B", shift_hours=6, past_week_hours=[7])
+        self.routes = [
+            Route.objects.create(route_id=i, distance_km=3 * i, traffic_level="Low", base_time_min=20 + 5 * i)
+            for i in range(1, 4)
+        ]
+        for i in range(1, 31):
+            Order.objects.create(order_id=i * 10, value_rs=600 + 40 * i, route=self.routes[i % 3],
+                                 delivery_time_min=30)
+
+    def run_sim(self, **extra):
+        payload = {"available_drivers": 2, "route_start_time": "09:00", "max_hours_per_driver": 5}
+        payload.update(extra)
+        return self.client.post("/api/simulations/run/", payload, format="json").json()
+
+    def rows(self, sim_id):
+        return list(DeliveryAssignment.objects.filter(simulation_id=sim_id)
+                    .order_by("order__order_id").values_list(*COMPARED))
+
+    def assert_matches_fresh_run(self, sim_id, **extra):
+        fresh = self.run_sim(refresh=True, **extra)
+        body = self.client.get(f"/api/simulations/{sim_id}/").json()
+        self.assertEqual(body["kpis"], fresh["kpis"])
+        self.assertEqual(body["totals"], fresh["totals"])
+        self.assertEqual(self.rows(sim_id), self.rows(fresh["id"]))
+
+    def resimulate(self, sim_id):
+        return self.client.post(f"/api/simulations/{sim_id}/resimulate/").json()["changes"]
+
+    def test_no_changes_is_a_no_op(self):
+        sim = self.run_sim()
+        self.assertEqual(self.resimulate(sim["id"])["changed"], False)
+
+    def test_route_change_only_recomputes_from_first_affected_order(self):
+        sim = self.run_sim()
+        route = self.routes[2]  # first used by order 20
+        route.traffic_level = "High"
+        route.base_time_min = 50
+        route.save()
+        changes = self.resimulate(sim["id"])
+        self.assertEqual(changes["from_order_id"], 20)
+        self.assertLess(changes["recomputed"], 30)
+        self.assert_matches_fresh_run(sim["id"])
+
+    def test_partitioned_run_keeps_its_prefix(self):
+        sim = self.run_sim(partitions=2)
+        route = self.routes[2]
+        route.base_time_min = 50
+        route.save()
+        changes = self.resimulate(sim["id"])
+        self.assertEqual(changes["from_order_id"], 20)
+        self.assert_matches_fresh_run(sim["id"])
+
+    def test_sharded_run_is_recomputed_from_the_start(self):
+        sim = self.run_sim(partitions=2, partition_mode="shards")
+        route = self.routes[2]
+        route.base_time_min = 50
+        route.save()
+        changes = self.resimulate(sim["id"])
+        self.assertIsNone(changes["from_order_id"])
+        self.assert_matches_fresh_run(sim["id"], partitions=2, partition_mode="shards")
+
+    def test_new_orders_and_driver_fatigue(self):
+        sim = self.run_sim()
+        Order.objects.create(order_id=155, value_rs=5000, route=self.routes[0], delivery_time_min=20)
+        self.d2.past_week_hours = [12]
+        self.d2.save()
+        changes = self.resimulate(sim["id"])
+        self.assertTrue(changes["changed"])
+        self.assert_matches_fresh_run(sim["id"])
+        self.assertEqual(self.resimulate(sim["id"])["changed"], False)
+
+    def test_renumbered_order_cuts_at_its_old_position(self):
+        sim = self.run_sim()
+        Order.objects.filter(order_id=20).update(order_id=500, updated_at=timezone.now())
+        changes = self.resimulate(sim["id"])
+        self.assertEqual(changes["from_order_id"], 20)
+        self.assert_matches_fresh_run(sim["id"])
+
+    def test_pool_driver_change_recomputes_from_start(self):
+        Order.objects.exclude(order_id=10).delete()
+        sim = self.run_sim()  # one order: driver B has no assignment
+        self.d2.past_week_hours = [12]
+        self.d2.save()
+        changes = self.resimulate(sim["id"])
+        self.assertIsNone(changes["from_order_id"])
+        self.assertEqual(changes["recomputed"], 1)
+
+    def test_pool_membership_change_recomputes_from_start(self):
+        sim = self.run_sim()
+        SimulationResult.objects.filter(pk=sim["id"]).update(driver_pool="")
+        changes = self.resimulate(sim["id"])
+        self.assertIsNone(changes["from_order_id"])
+        self.assertEqual(changes["recomputed"], len(self.rows(sim["id"])))
+        self.assertEqual(self.resimulate(sim["id"])["changed"], False)
+
+    def test_resimulated_result_is_served_from_cache(self):
+        sim = self.run_sim()
+        self.routes[0].distance_km = 30
+        self.routes[0].save()
+        self.resimulate(sim["id"])
+        res = self.client.post("/api/simulations/run/", {
+            "available_drivers": 2, "route_start_time": "09:00", "max_hours_per_driver": 5
+        }, format="json")
+        self.assertEqual(res["X-Simulation-Cache"], "hit")
+        self.assertEqual(res.json()["id"], sim["id"])
+
+    def test_resimulated_older_run_is_not_served_for_today(self):
+        sim = self.run_sim()
+        SimulationResult.objects.filter(pk=sim["id"]).update(ran_at=timezone.now() - timedelta(days=1))
+        self.routes[0].distance_km = 30
+        self.routes[0].save()
+        self.resimulate(sim["id"])
+        res = self.client.post("/api/simulations/run/", {
+            "available_drivers": 2, "route_start_time": "09:00", "max_hours_per_driver": 5
+        }, format="json")
+        self.assertEqual(res["X-Simulation-Cache"], "miss")
+        self.assertNotEqual(res.json()["id"], sim["id"])
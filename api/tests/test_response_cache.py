@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from core.models import Route
+from rest_framework.test import APIClient
+from api.conditional import response_stats
+from api.serializers import RouteSerializer
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        caches["responses"].clear()
+        response_stats.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        for i in range(1, 6):
+            Route.objects.create(route_id=i, distance_km=i, traffic_level="Low", base_time_min=20)
+
+    def test_payload_is_serialized_once_per_version(self):
+        first = self.client.get("/api/routes/").json()
+        with mock.patch.object(RouteSerializer, "to_representation") as serialize, \
+                CaptureQueriesContext(connection) as ctx:
+            again = self.client.get("/api/routes/").json()
+        serialize.assert_not_called()
+        self.assertFalse([q for q in ctx.captured_queries if "core_route" in q["sql"]])
+        self.assertEqual(again, first)
+
+        stats = self.client.get("/api/simulations/cache/").json()["responses"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_save_and_delete_invalidate(self):
+        self.client.get("/api/routes/")
+        route = Route.objects.get(route_id=1)
+        route.traffic_level = "High"
+        route.save()
+        self.assertEqual(self.client.get("/api/routes/").json()["results"][0]["traffic_level"], "High")
+        route.delete()
+        self.assertEqual(len(self.client.get("/api/routes/").json()["results"]), 4)
+
+    def test_keyed_by_query_string(self):
+        self.client.get("/api/routes/")
+        body = self.client.get("/api/routes/?min_distance=4").json()
+        self.assertEqual([r["route_id"] for r in body["results"]], [4, 5])
+
+    @override_settings(ALLOWED_HOSTS=["a.example.com", "b.example.com"])
+    def test_keyed_by_host_and_scheme(self):
+        self.client.get("/api/routes/?page_size=2", HTTP_HOST="a.example.com")
+        body = self.client.get("/api/routes/?page_size=2", HTTP_HOST="b.example.com", secure=True).json()
+        self.assertTrue(body["next"].startswith("https://b.example.com/"))
+        self.assertEqual(response_stats.stats()["hits"], 0)
+
+    @override_settings(RESPONSE_CACHE_MAX_BYTES=64)
+    def test_oversized_payloads_are_not_stored(self):
+        first = self.client.get("/api/routes/").json()
+        self.assertEqual(self.client.get("/api/routes/").json(), first)
+        stats = response_stats.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["oversized"]), (0, 2, 2))
@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.test import SimpleTestCase, override_settings
+
+from api import schema
+
+
+class SchemaCacheTest(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        overrides = override_settings(SCHEMA_CACHE_DIR=tmp.name, SCHEMA_CODE_VERSION="v1")
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        schema.clear()
+        self.addCleanup(schema.clear)
+
+    def test_etag_and_not_modified(self):
+        response = self.client.get("/api/schema/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/vnd.oai.openapi")
+        self.assertIn(b"openapi:", response.content)
+        again = self.client.get("/api/schema/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+
+    def test_json_format(self):
+        response = self.client.get("/api/schema/?format=json")
+        self.assertEqual(response["Content-Type"], "application/vnd.oai.openapi+json")
+        document = json.loads(response.content)
+        self.assertIn("/api/simulations/run/", document["paths"])
+        self.assertIn("jwtAuth", document["components"]["securitySchemes"])
+
+    def test_generation_leaves_settings_alone(self):
+        changed = []
+
+        def record(setting, **kwargs):
+            changed.append(setting)
+
+        setting_changed.connect(record)
+        self.addCleanup(setting_changed.disconnect, record)
+        document = json.loads(schema.generate()["json"])
+        self.assertIn("/api/simulations/run/", document["paths"])
+        self.assertEqual(changed, [])
+        self.assertEqual(settings.REST_FRAMEWORK["DEFAULT_SCHEMA_CLASS"],
+                         "rest_framework.schemas.inspectors.ViewInspector")
+
+    def test_generated_once_per_version(self):
+        schema.build()
+        with mock.patch.object(schema, "generate", wraps=schema.generate) as generate:
+            self.client.get("/api/schema/")
+            self.client.get("/api/schema/?format=json")
+            self.assertEqual(generate.call_count, 0)
+            with override_settings(SCHEMA_CODE_VERSION="v2"):
+                schema.clear()
+                self.client.get("/api/schema/")
+                self.client.get("/api/schema/")
+            self.assertEqual(generate.call_count, 1)
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ["openapi-v2.json", "openapi-v2.yaml"])
+
+    def test_spectacular_not_imported_by_urls(self):
+        code = ("import sys, django; django.setup(); import greencart.urls; "
+                "print(sorted(m for m in sys.modules if m.startswith('drf_spectacular.')))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=settings.BASE_DIR, capture_output=True, text=True,
+                             env={**os.environ, "DJANGO_SETTINGS_MODULE": "greencart.settings"}, check=True)
+        self.assertEqual(out.stdout.strip(), "['drf_spectacular.apps', 'drf_spectacular.checks']")
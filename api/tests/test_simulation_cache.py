@@ -0,0 +1,63 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from core.cache import LRUCache
+from core.models import Driver, Route, Order, SimulationResult
+from core.services import result_cache
+from rest_framework.test import APIClient
+
+
+class SimulationCacheTest(TestCase):
+    def setUp(self):
+        result_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        self.route = Route.objects.create(route_id=1, distance_km=10, traffic_level="Low", base_time_min=30)
+        Order.objects.create(order_id=1, value_rs=1500, route=self.route, delivery_time_min=30)
+
+    def run_sim(self, **extra):
+        payload = {"available_drivers": 1, "route_start_time": "09:00", "max_hours_per_driver": 8}
+        payload.update(extra)
+        return self.client.post("/api/simulations/run/", payload, format="json")
+
+    def test_repeat_run_reuses_result(self):
+        first = self.run_sim()
+        second = self.run_sim()
+        self.assertEqual(first["X-Simulation-Cache"], "miss")
+        self.assertEqual(second["X-Simulation-Cache"], "hit")
+        self.assertEqual(first.json()["id"], second.json()["id"])
+        self.assertEqual(SimulationResult.objects.count(), 1)
+
+        stats = self.client.get("/api/simulations/cache/").json()
+        self.assertEqual((stats["hits"], stats["size"]), (1, 1))
+
+    def test_database_fallback_counts_as_hit(self):
+        self.run_sim()
+        result_cache.clear()  # as if another worker process had produced the run
+        self.assertEqual(self.run_sim()["X-Simulation-Cache"], "hit")
+        stats = self.client.get("/api/simulations/cache/").json()
+        self.assertEqual((stats["hits"], stats["misses"], stats["fallback_hits"]), (0, 1, 1))
+        self.assertEqual(stats["overall_hit_rate"], 1.0)
+
+    def test_data_change_invalidates(self):
+        first = self.run_sim().json()
+        self.route.traffic_level = "High"
+        self.route.save()
+        second = self.run_sim()
+        self.assertEqual(second["X-Simulation-Cache"], "miss")
+        self.assertNotEqual(first["totals"], second.json()["totals"])
+
+    def test_refresh_and_different_inputs_miss(self):
+        self.run_sim()
+        self.assertEqual(self.run_sim(refresh=True)["X-Simulation-Cache"], "miss")
+        self.assertEqual(self.run_sim(max_hours_per_driver=4)["X-Simulation-Cache"], "miss")
+
+    def test_lru_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
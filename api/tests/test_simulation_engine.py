@@ -0,0 +1,101 @@
+from django.test import SimpleTestCase
+from core.services import SimulationInputError, parse_strategy
+from core.simulation import TRAFFIC_CODES, Simulator, order_economics, simulate
+
+
+def orders(n, value=1500, km=10, base=60, traffic="Low"):
+    return {
+        "id": list(range(1, n + 1)),
+        "value_rs": [value] * n,
+        "distance_km": [km] * n,
+        "base_time_min": [base] * n,
+        "traffic": [TRAFFIC_CODES[traffic]] * n,
+    }
+
+
+class SimulationEngineTest(SimpleTestCase):
+    def test_rules_on_columns(self):
+        econ = order_economics([2000, 800], [10, 10], [60, 60],
+                               [TRAFFIC_CODES["Low"], TRAFFIC_CODES["High"]], [False, True])
+        self.assertEqual(econ["duration_min"], [60, 78])
+        self.assertEqual(econ["on_time"], [True, False])
+        self.assertEqual(econ["penalty_rs"], [0, 50])
+        self.assertEqual(econ["fuel_cost_rs"], [50, 70])
+        self.assertEqual(econ["bonus_rs"], [200, 0])
+        self.assertEqual(econ["profit_rs"], [2150, 680])
+
+    def test_round_robin_stops_when_drivers_saturated(self):
+        drivers = {"id": [10, 20], "fatigued": [False, False]}
+        batch, kpis, totals = simulate(orders(10), drivers, max_hours_per_driver=2)
+        self.assertEqual(batch["driver"], [10, 20, 10, 20])
+        self.assertEqual(batch["start_min"], [0, 0, 60, 60])
+        self.assertEqual(kpis["on_time"], 4)
+        self.assertEqual(totals["fuel_by_traffic"], {"Low": 200, "Medium": 0, "High": 0})
+
+    def test_chunked_feed_matches_single_run(self):
+        drivers = {"id": [1, 2, 3], "fatigued": [True, False, False]}
+        _, kpis, totals = simulate(orders(40), drivers, max_hours_per_driver=8)
+        sim = Simulator(drivers, 8)
+        all_orders = orders(40)
+        for i in range(0, 40, 7):
+            sim.feed({k: v[i:i + 7] for k, v in all_orders.items()})
+        self.assertEqual(sim.kpis(), kpis)
+        self.assertEqual(sim.totals(), totals)
+
+
+class SchedulerStrategyTest(SimpleTestCase):
+    def legacy_round_robin(self, durations_by_driver, n_orders, max_minutes):
+        """The original spin loop from SimulationViewSet.run."""
+        n = len(durations_by_driver)
+        used, idx, out = [0] * n, 0, []
+        for i in range(n_orders):
+            chosen = None
+            for _ in range(n):
+                if used[idx % n] < max_minutes:
+                    chosen = idx % n
+                    break
+                idx += 1
+            if chosen is None:
+                break
+            out.append(chosen)
+            used[chosen] += durations_by_driver[chosen][i]
+            idx += 1
+        return out
+
+    def test_round_robin_matches_legacy_loop(self):
+        base = [25, 60, 45, 90, 30, 15, 120, 40] * 6
+        data = {"id": list(range(48)), "value_rs": [900] * 48, "distance_km": [5] * 48,
+                "base_time_min": base, "traffic": [0] * 48}
+        fatigued = [True, False, False, True, False]
+        drivers = {"id": [0, 1, 2, 3, 4], "fatigued": fatigued}
+        batch, _, _ = simulate(data, drivers, max_hours_per_driver=3)
+        per_driver = [[int(round(b * 1.3)) if f else b for b in base] for f in fatigued]
+        self.assertEqual(batch["driver"], self.legacy_round_robin(per_driver, 48, 180))
+
+    def test_earliest_available_balances_minutes(self):
+        data = orders(4)
+        data["base_time_min"] = [100, 10, 10, 10]
+        drivers = {"id": [1, 2], "fatigued": [False, False]}
+        batch, _, _ = simulate(data, drivers, 8, strategy="earliest_available")
+        self.assertEqual(batch["driver"], [1, 2, 2, 2])
+        self.assertEqual(batch["start_min"], [0, 0, 10, 20])
+
+    def test_least_loaded_balances_order_counts(self):
+        data = orders(4)
+        data["base_time_min"] = [100, 10, 10, 10]
+        drivers = {"id": [1, 2], "fatigued": [False, False]}
+        batch, _, _ = simulate(data, drivers, 8, strategy="least_loaded")
+        self.assertEqual(batch["driver"], [1, 2, 2, 1])
+
+    def test_all_strategies_respect_max_hours(self):
+        for strategy in ("round_robin", "earliest_available", "least_loaded"):
+            sim = Simulator({"id": [1, 2, 3], "fatigued": [False, True, False]}, 1, strategy)
+            sim.feed(orders(50, base=25))
+            self.assertTrue(sim.exhausted)
+            self.assertTrue(all(m < 60 + 33 for m in sim.minutes_used), strategy)
+
+    def test_parse_strategy_rejects_non_strings(self):
+        self.assertEqual(parse_strategy({}), "round_robin")
+        for bad in (["round_robin"], {"a": 1}, 3, "zigzag"):
+            with self.assertRaises(SimulationInputError):
+                parse_strategy({"strategy": bad})
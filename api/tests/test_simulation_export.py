@@ -0,0 +1,47 @@
+import csv
+import gzip
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from core.models import Driver, Route, Order
+from rest_framework.test import APIClient
+
+
+class SimulationExportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        route = Route.objects.create(route_id=1, distance_km=4, traffic_level="High", base_time_min=20)
+        for i in range(1, 8):
+            Order.objects.create(order_id=i, value_rs=1100, route=route, delivery_time_min=20)
+        self.sim_id = self.client.post("/api/simulations/run/", {
+            "available_drivers": 1, "route_start_time": "09:00", "max_hours_per_driver": 8
+        }, format="json").json()["id"]
+        self.detail = self.client.get(f"/api/simulations/{self.sim_id}/").json()["assignments"]
+
+    def export(self, query):
+        res = self.client.get(f"/api/simulations/{self.sim_id}/export/?{query}")
+        self.assertTrue(res.streaming)
+        return res, b"".join(res.streaming_content)
+
+    def test_csv(self):
+        res, body = self.export("fmt=csv")
+        self.assertEqual(res["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[0]["driver_name"], "A")
+        self.assertEqual(int(rows[3]["profit_rs"]), self.detail[3]["profit_rs"])
+
+    def test_gzipped_ndjson(self):
+        res, body = self.export("fmt=ndjson&gzip=1")
+        self.assertIn(".ndjson.gz", res["Content-Disposition"])
+        records = [json.loads(line) for line in gzip.decompress(body).decode().splitlines()]
+        self.assertEqual([r["order_id"] for r in records], list(range(1, 8)))
+        self.assertEqual(records[0]["fuel_cost_rs"], self.detail[0]["fuel_cost_rs"])
+
+    def test_unknown_format(self):
+        res = self.client.get(f"/api/simulations/{self.sim_id}/export/?fmt=xml")
+        self.assertEqual(res.status_code, 400)
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from core.models import SimulationResult
+from rest_framework.test import APIClient
+
+T0 = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class SimulationHistoryTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        # Three runs per day for four days, every 8 hours.
+        for i in range(12):
+            SimulationResult.objects.create(
+                ran_at=T0 + timedelta(hours=8 * i), inputs={},
+                kpis={"total_profit": 1000 + i * 10, "efficiency": 50 + i, "on_time": i, "late": 1},
+            )
+
+    def get(self, query=""):
+        return self.client.get(f"/api/simulations/history/{query}")
+
+    def test_kpi_columns_follow_kpis(self):
+        sim = SimulationResult.objects.order_by("ran_at").first()
+        self.assertEqual((sim.total_profit, sim.efficiency, sim.on_time_count, sim.late_count), (1000, 50, 0, 1))
+        sim.kpis = {**sim.kpis, "total_profit": 5}
+        sim.save(update_fields=["kpis"])
+        sim.refresh_from_db()
+        self.assertEqual(sim.total_profit, 5)
+
+    def test_daily_buckets(self):
+        with self.assertNumQueries(2):  # version stamp + grouped query
+            body = self.get("?bucket=day").json()
+        self.assertEqual(body["bucket"], "day")
+        self.assertEqual(len(body["points"]), 4)
+        first = body["points"][0]
+        self.assertEqual(first["runs"], 3)
+        self.assertEqual(first["total_profit"], {"min": 1000, "max": 1020, "avg": 1010.0})
+        self.assertEqual(first["efficiency"]["max"], 52)
+
+    def test_auto_bucket_respects_max_points(self):
+        self.assertEqual(self.get().json()["bucket"], "none")
+        body = self.get("?max_points=5").json()
+        self.assertEqual(body["bucket"], "day")
+        self.assertLessEqual(len(body["points"]), 5)
+        self.assertFalse(body["truncated"])
+
+    def test_auto_bucket_counts_aligned_buckets(self):
+        # 25 hours apart but spread over three calendar days.
+        SimulationResult.objects.all().delete()
+        for ran_at in (T0 + timedelta(hours=23, minutes=30), T0 + timedelta(hours=36),
+                       T0 + timedelta(hours=48, minutes=30)):
+            SimulationResult.objects.create(ran_at=ran_at, inputs={},
+                                            kpis={"total_profit": 1, "efficiency": 1, "on_time": 1, "late": 0})
+        body = self.get("?max_points=2").json()
+        self.assertEqual(body["bucket"], "week")
+        self.assertEqual(len(body["points"]), 1)
+        self.assertFalse(body["truncated"])
+
+    def test_raw_points_are_latest_and_truncated(self):
+        body = self.get("?bucket=none&max_points=3").json()
+        self.assertTrue(body["truncated"])
+        self.assertEqual([p["total_profit"]["avg"] for p in body["points"]], [1090, 1100, 1110])
+
+    def test_since_until(self):
+        body = self.get("?bucket=day&since=2026-01-02T00:00:00Z&until=2026-01-03T00:00:00").json()
+        self.assertEqual([p["runs"] for p in body["points"]], [3])
+
+    @override_settings(SIMULATION_HISTORY_MAX_POINTS=10)
+    def test_invalid_params(self):
+        self.assertEqual(self.get("?bucket=year").status_code, 400)
+        self.assertEqual(self.get("?max_points=11").status_code, 400)
+        self.assertEqual(self.get("?max_points=0").status_code, 400)
+        self.assertEqual(self.get("?since=yesterday").status_code, 400)
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from django.test import TestCase, override_settings
+from core import jobs
+from core.models import Driver, Route, Order, SimulationJob, SimulationResult
+from rest_framework.test import APIClient
+
+
+@override_settings(SIMULATION_JOBS_IN_PROCESS=False)
+class SimulationJobTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        route = Route.objects.create(route_id=1, distance_km=10, traffic_level="High", base_time_min=30)
+        for i in range(1, 6):
+            Order.objects.create(order_id=i, value_rs=1200, route=route, delivery_time_min=30)
+
+    def enqueue(self, **payload):
+        data = {"available_drivers": 1, "max_hours_per_driver": 8, "async": True}
+        data.update(payload)
+        return self.client.post("/api/simulations/run/", data, format="json")
+
+    def test_async_run_returns_job_immediately(self):
+        res = self.enqueue()
+        self.assertEqual(res.status_code, 202)
+        self.assertEqual(res.json()["status"], "queued")
+        self.assertFalse(SimulationResult.objects.exists())
+
+    def test_worker_completes_job_and_status_exposes_result(self):
+        job_id = self.enqueue().json()["job_id"]
+        self.assertEqual(jobs.next_queued(10), [job_id])
+        self.assertTrue(jobs.claim(job_id))
+        self.assertFalse(jobs.claim(job_id))
+        jobs.execute(job_id)
+
+        body = self.client.get(f"/api/simulations/jobs/{job_id}/").json()
+        self.assertEqual(body["status"], "done")
+        self.assertEqual(body["progress"], 100)
+        self.assertEqual(body["result"]["kpis"]["on_time"], 5)
+
+    def test_stale_running_job_is_reclaimed(self):
+        job_id = self.enqueue().json()["job_id"]
+        self.assertTrue(jobs.claim(job_id))
+        self.assertEqual(jobs.next_queued(10), [])
+        SimulationJob.objects.filter(pk=job_id).update(started_at=timezone.now() - timedelta(hours=1))
+        with self.settings(SIMULATION_JOB_TIMEOUT=600):
+            self.assertEqual(jobs.next_queued(10), [job_id])
+            self.assertTrue(jobs.claim(job_id))
+            self.assertFalse(jobs.claim(job_id))
+
+    def test_invalid_inputs_fail_the_job(self):
+        job_id = self.enqueue().json()["job_id"]
+        Driver.objects.all().delete()
+        jobs.claim(job_id)
+        jobs.execute(job_id)
+        job = SimulationJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, SimulationJob.FAILED)
+        self.assertIn("available_drivers", job.error["error"])
+
+    def test_unknown_job_is_404(self):
+        self.assertEqual(self.client.get("/api/simulations/jobs/999/").status_code, 404)
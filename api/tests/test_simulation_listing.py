@@ -0,0 +1,52 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from core.models import Driver, Route, Order
+from rest_framework.test import APIClient
+
+
+class SimulationListingTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        Driver.objects.create(name="B", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        route = Route.objects.create(route_id=1, distance_km=4, traffic_level="Low", base_time_min=20)
+        for i in range(1, 13):
+            Order.objects.create(order_id=i, value_rs=700, route=route, delivery_time_min=20)
+        self.ids = [
+            self.client.post("/api/simulations/run/", {
+                "available_drivers": n, "route_start_time": "09:00", "max_hours_per_driver": 8
+            }, format="json").json()["id"]
+            for n in (1, 2)
+        ]
+
+    def test_list_is_summary_and_constant_queries(self):
+        # Version stamp (ETag) + page.
+        with self.assertNumQueries(2):
+            body = self.client.get("/api/simulations/").json()
+        self.assertIn("next", body)
+        self.assertEqual([r["id"] for r in body["results"]], self.ids[::-1])
+        self.assertNotIn("assignments", body["results"][0])
+
+    def test_assignments_are_paginated_from_one_joined_query(self):
+        url = f"/api/simulations/{self.ids[0]}/assignments/?page_size=5"
+        with self.assertNumQueries(3):
+            body = self.client.get(url).json()
+        self.assertEqual(len(body["results"]), 5)
+        self.assertEqual(body["results"][0]["driver_name"], "A")
+        self.assertEqual(body["results"][0]["order_id"], 1)
+
+        seen = [r["id"] for r in body["results"]]
+        while body["next"]:
+            body = self.client.get(body["next"]).json()
+            seen += [r["id"] for r in body["results"]]
+        self.assertEqual(len(seen), 12)
+        self.assertEqual(seen, sorted(seen))
+
+    def test_detail_nests_assignments_without_n_plus_one(self):
+        with self.assertNumQueries(3):
+            body = self.client.get(f"/api/simulations/{self.ids[1]}/").json()
+        self.assertEqual(len(body["assignments"]), 12)
+
+    def test_unknown_simulation_assignments_404(self):
+        self.assertEqual(self.client.get("/api/simulations/999/assignments/").status_code, 404)
@@ -0,0 +1,144 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from core.models import DeliveryAssignment, Driver, Route, Order
+from core.partitioned import (PartitionedSimulator, merge_partials, shard, simulate_partitioned, simulate_shard,
+                              spawn_pool)
+from core.scheduling import SCHEDULERS
+from core.services import (SimulationInputError, input_hash, load_drivers, load_orders, parse_inputs,
+                           run_simulation)
+from core.simulation import TRAFFIC_LEVELS, Simulator, simulate
+
+
+def mixed_orders(n):
+    return {
+        "id": list(range(1, n + 1)),
+        "value_rs": [400 + (i * 137) % 1500 for i in range(n)],
+        "distance_km": [1 + (i * 7) % 20 for i in range(n)],
+        "base_time_min": [15 + (i * 11) % 60 for i in range(n)],
+        "traffic": [i % len(TRAFFIC_LEVELS) for i in range(n)],
+    }
+
+
+def shard_range(columns, start, stop):
+    return {key: values[start:stop] for key, values in columns.items()}
+
+
+def serial_shards(orders, drivers, max_hours, strategy, partitions):
+    results = [simulate_shard((shard(orders, k, partitions), shard(drivers, k, partitions), max_hours, strategy))
+               for k in range(partitions)]
+    sim = Simulator(drivers, max_hours, strategy)
+    merge_partials(sim, [partial for _, partial in results])
+    batch = {key: sum((b[key] for b, _ in results), []) for key in results[0][0]}
+    return batch, sim.kpis(), sim.totals()
+
+
+class PartitionedSimulationTest(SimpleTestCase):
+    drivers = {"id": [11, 12, 13, 14, 15], "fatigued": [True, False, False, True, False]}
+
+    def test_rules_mode_is_the_sequential_engine(self):
+        for strategy in SCHEDULERS:
+            for partitions in (1, 2, 3):
+                with self.subTest(strategy=strategy, partitions=partitions):
+                    self.assertEqual(simulate_partitioned(mixed_orders(300), self.drivers, 6, strategy, partitions),
+                                     simulate(mixed_orders(300), self.drivers, 6, strategy))
+
+    def test_rules_mode_in_chunks(self):
+        orders = mixed_orders(300)
+        with spawn_pool(3) as pool:
+            sim = PartitionedSimulator(self.drivers, 6, pool=pool, partitions=3)
+            batches = [sim.feed(shard_range(orders, i, i + 70)) for i in range(0, 300, 70)]
+        batch, kpis, totals = simulate(orders, self.drivers, 6)
+        self.assertEqual((sim.kpis(), sim.totals()), (kpis, totals))
+        self.assertEqual({key: sum((b[key] for b in batches), []) for key in batch}, batch)
+
+    def test_single_shard_is_the_sequential_engine(self):
+        for strategy in SCHEDULERS:
+            with self.subTest(strategy=strategy):
+                self.assertEqual(simulate_partitioned(mixed_orders(300), self.drivers, 6, strategy, 1, "shards"),
+                                 simulate(mixed_orders(300), self.drivers, 6, strategy))
+
+    def test_workers_match_running_the_shards_one_after_another(self):
+        for strategy in SCHEDULERS:
+            for partitions in (2, 3):
+                with self.subTest(strategy=strategy, partitions=partitions):
+                    self.assertEqual(
+                        simulate_partitioned(mixed_orders(300), self.drivers, 6, strategy, partitions, "shards"),
+                        serial_shards(mixed_orders(300), self.drivers, 6, strategy, partitions),
+                    )
+
+    def test_shards_hold_drivers_and_orders_together(self):
+        batch, kpis, _ = simulate_partitioned(mixed_orders(30), self.drivers, 8, partitions=2, mode="shards")
+        shard_of = {driver: k % 2 for k, driver in enumerate(self.drivers["id"])}
+        for order, driver in zip(batch["order"], batch["driver"]):
+            self.assertEqual((order - 1) % 2, shard_of[driver])
+        self.assertEqual(kpis["on_time"] + kpis["late"], 30)
+
+    def test_more_partitions_than_drivers(self):
+        drivers = {"id": [1], "fatigued": [False]}
+        for mode in ("rules", "shards"):
+            with self.subTest(mode=mode):
+                self.assertEqual(simulate_partitioned(mixed_orders(20), drivers, 8, partitions=4, mode=mode),
+                                 simulate(mixed_orders(20), drivers, 8))
+
+
+class PartitionedPersistenceTest(TestCase):
+    def setUp(self):
+        Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 10])
+        Driver.objects.create(name="B", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        Driver.objects.create(name="C", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        for route_id, traffic in enumerate(TRAFFIC_LEVELS, start=1):
+            Route.objects.create(route_id=route_id, distance_km=4 * route_id, traffic_level=traffic,
+                                 base_time_min=25 * route_id)
+        routes = list(Route.objects.order_by("route_id"))
+        for i in range(1, 61):
+            Order.objects.create(order_id=i, value_rs=300 + i * 40, route=routes[i % 3], delivery_time_min=30)
+        self.data = {"available_drivers": 3, "route_start_time": "09:00", "max_hours_per_driver": 8,
+                     "strategy": "earliest_available"}
+
+    def rows(self, result):
+        return list(DeliveryAssignment.objects.filter(simulation=result).order_by("order_number")
+                    .values_list("order_id", "driver_id", "planned_start", "planned_duration_min", "on_time",
+                                 "profit_rs", "fuel_cost_rs", "traffic_level", "order_number"))
+
+    def test_persisted_run_matches_the_sequential_run(self):
+        sequential = run_simulation(parse_inputs(self.data))
+        for stream in (False, True):
+            with self.subTest(stream=stream), override_settings(SIMULATION_BULK_BATCH_SIZE=7):
+                result = run_simulation(parse_inputs({**self.data, "partitions": 3}), stream=stream)
+                self.assertEqual((result.kpis, result.totals), (sequential.kpis, sequential.totals))
+                self.assertEqual(self.rows(result), self.rows(sequential))
+
+    def test_persisted_sharded_run_matches_the_engine(self):
+        inputs = parse_inputs({**self.data, "partitions": 2, "partition_mode": "shards"})
+        result = run_simulation(inputs)
+        _, kpis, totals = simulate_partitioned(load_orders(), load_drivers(3), 8, "earliest_available", 2,
+                                               "shards")
+        self.assertEqual(result.kpis, kpis)
+        self.assertEqual(result.totals, totals)
+        self.assertEqual(result.assignments.count(), kpis["on_time"] + kpis["late"])
+        for order_id, number in result.assignments.values_list("order__order_id", "order_number"):
+            self.assertEqual(number, order_id)
+
+    def test_only_sharding_changes_the_cache_key(self):
+        sequential = parse_inputs(self.data)
+        self.assertNotIn("partitions", sequential)
+        self.assertEqual(parse_inputs({**self.data, "partitions": 1, "partition_mode": "shards"}), sequential)
+        self.assertEqual(input_hash(parse_inputs({**self.data, "partitions": 2})), input_hash(sequential))
+        sharded = parse_inputs({**self.data, "partitions": 2, "partition_mode": "shards"})
+        self.assertEqual(sharded["partition_mode"], "shards")
+        self.assertNotEqual(input_hash(sharded), input_hash(sequential))
+        with override_settings(SIMULATION_PARTITIONS=3):
+            self.assertEqual(parse_inputs(self.data)["partitions"], 3)
+
+    def test_unknown_partition_mode_is_rejected(self):
+        for value in ("drivers", 2, ["rules"]):
+            with self.subTest(value=value), self.assertRaises(SimulationInputError):
+                parse_inputs({**self.data, "partitions": 2, "partition_mode": value})
+
+    def test_partitions_are_coerced_like_the_other_fields(self):
+        self.assertEqual(parse_inputs({**self.data, "partitions": "2"}), parse_inputs({**self.data, "partitions": 2}))
+        self.assertEqual(parse_inputs({**self.data, "partitions": 2.0})["partitions"], 2)
+
+    def test_invalid_partitions_are_rejected(self):
+        for value in (0, -1, 17, True, "1.5", "two", 1.5, [2]):
+            with self.subTest(value=value), self.assertRaises(SimulationInputError):
+                parse_inputs({**self.data, "partitions": value})
@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from core.models import Driver, Route, Order, SimulationResult, DeliveryAssignment
+from rest_framework.test import APIClient
+
+
+class SimulationPersistenceTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        Driver.objects.create(name="B", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 10])
+        route = Route.objects.create(route_id=1, distance_km=5, traffic_level="Low", base_time_min=20)
+        for i in range(1, 26):
+            Order.objects.create(order_id=i, value_rs=500 + i * 50, route=route, delivery_time_min=30)
+
+    def run_sim(self, **extra):
+        payload = {"available_drivers": 2, "route_start_time": "09:00", "max_hours_per_driver": 8}
+        payload.update(extra)
+        return self.client.post("/api/simulations/run/", payload, format="json")
+
+    def inserts(self, queries):
+        return [q for q in queries if q["sql"].startswith('INSERT INTO "core_deliveryassignment"')]
+
+    def test_assignments_written_in_bulk(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.run_sim()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(self.inserts(ctx.captured_queries)), 1)
+        self.assertEqual(DeliveryAssignment.objects.filter(simulation_id=res.json()["id"]).count(), 25)
+
+    def test_run_returns_summary_with_assignments_link(self):
+        body = self.run_sim().json()
+        self.assertNotIn("assignments", body)
+        self.assertEqual(body["assignments_url"], f"http://testserver/api/simulations/{body['id']}/assignments/")
+        page = self.client.get(body["assignments_url"]).json()
+        self.assertEqual(len(page["results"]), 25)
+
+    @override_settings(SIMULATION_BULK_BATCH_SIZE=10)
+    def test_streamed_run_matches_buffered_run(self):
+        buffered = self.run_sim().json()
+        with CaptureQueriesContext(connection) as ctx:
+            streamed = self.run_sim(stream=True, refresh=True).json()
+        self.assertEqual(len(self.inserts(ctx.captured_queries)), 3)
+        self.assertEqual(buffered["kpis"], streamed["kpis"])
+        self.assertEqual(DeliveryAssignment.objects.filter(simulation_id=streamed["id"]).count(), 25)
+
+    def test_start_time_must_be_a_time_of_day(self):
+        for value in ("25:99", "09:60", "-1:00", "9", "nine", None, 9):
+            with self.subTest(value=value):
+                res = self.run_sim(route_start_time=value)
+                self.assertEqual(res.status_code, 400)
+                self.assertEqual(res.json()["error"], "route_start_time must be HH:MM format")
+        self.assertFalse(SimulationResult.objects.exists())
+        self.assertEqual(self.run_sim(route_start_time="9:05").json()["inputs"]["route_start_time"], "09:05")
+
+    def test_failed_run_leaves_no_result(self):
+        failing = mock.patch.object(DeliveryAssignment.objects, "bulk_create",
+                                    side_effect=DatabaseError("disk full"))
+        with failing, self.assertRaises(DatabaseError):
+            self.run_sim()
+        self.assertFalse(SimulationResult.objects.exists())
@@ -0,0 +1,73 @@
+import sys
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from core.models import Driver, Route, Order, SimulationResult
+from rest_framework.test import APIClient
+
+PAYLOAD = {"available_drivers": 2, "route_start_time": "09:00", "max_hours_per_driver": 8}
+
+
+class SimulationProfilingTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = User.objects.create_user("ops", password="x", is_staff=True)
+        self.planner = User.objects.create_user("planner", password="x")
+        Driver.objects.create(name="A", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 6])
+        Driver.objects.create(name="B", shift_hours=6, past_week_hours=[6, 8, 7, 7, 7, 6, 10])
+        route = Route.objects.create(route_id=1, distance_km=4, traffic_level="High", base_time_min=20)
+        for i in range(1, 31):
+            Order.objects.create(order_id=i, value_rs=600 + i * 30, route=route, delivery_time_min=20)
+
+    def run_sim(self, user, query="", **extra):
+        self.client.force_authenticate(user)
+        return self.client.post(f"/api/simulations/run/{query}", {**PAYLOAD, **extra}, format="json")
+
+    def stages(self, profile):
+        return {s["name"]: s for s in profile["stages"]}
+
+    def test_staff_can_profile_a_run(self):
+        self.run_sim(self.staff)  # a cached result must not be reused
+        res = self.run_sim(self.staff, "?profile=1")
+        self.assertEqual(res["X-Simulation-Cache"], "miss")
+        profile = res.json()["profile"]
+        stages = self.stages(profile)
+        self.assertEqual(list(stages), ["load_drivers", "load_orders", "schedule", "rules", "insert",
+                                        "aggregates", "serialize"])
+        self.assertEqual(stages["load_drivers"]["queries"], 1)
+        self.assertEqual(stages["schedule"]["queries"], 0)
+        self.assertGreaterEqual(stages["insert"]["queries"], 1)
+        self.assertEqual(profile["total_queries"], sum(s["queries"] for s in profile["stages"]))
+        self.assertIsNone(profile["cprofile"])
+        self.assertEqual(SimulationResult.objects.get(pk=res.json()["id"]).profile, profile)
+        self.assertEqual(self.client.get(f"/api/simulations/{res.json()['id']}/").json()["profile"], profile)
+        columnar = self.client.get(f"/api/simulations/{res.json()['id']}/?format=columnar").json()
+        self.assertEqual(columnar["profile"], profile)
+
+    def test_streamed_stages_are_summed_per_chunk(self):
+        with override_settings(SIMULATION_BULK_BATCH_SIZE=10):
+            profile = self.run_sim(self.staff, "?profile=1", stream=True).json()["profile"]
+        stages = self.stages(profile)
+        self.assertEqual(stages["insert"]["calls"], 3)
+        self.assertEqual(stages["rules"]["calls"], 3)
+
+    def test_cprofile(self):
+        profile = self.run_sim(self.staff, "?profile=cprofile").json()["profile"]
+        self.assertIn("cumulative", profile["cprofile"])
+        self.assertIn("run_simulation", profile["cprofile"])
+
+    def test_cprofile_is_disabled_when_the_run_fails(self):
+        before = sys.getprofile()
+        with mock.patch("core.services.assignment_objects", side_effect=RuntimeError("boom")), \
+                self.assertRaises(RuntimeError):
+            self.run_sim(self.staff, "?profile=cprofile")
+        self.assertIs(sys.getprofile(), before)
+
+    def test_flag_is_staff_only(self):
+        self.assertIsNone(self.run_sim(self.planner, "?profile=1").json()["profile"])
+
+    @override_settings(SIMULATION_PROFILE="stages")
+    def test_setting_profiles_every_run(self):
+        self.assertIsNotNone(self.run_sim(self.planner).json()["profile"])
+        self.assertIsNone(self.run_sim(self.staff, "?profile=0", refresh=True).json()["profile"])
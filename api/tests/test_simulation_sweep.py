@@ -0,0 +1,62 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from core.models import Driver, Route, Order, SimulationResult, DeliveryAssignment
+from core.sweep import pareto_front
+from rest_framework.test import APIClient
+
+
+class SimulationSweepTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("planner", password="x"))
+        for i in range(4):
+            Driver.objects.create(name=f"D{i}", shift_hours=6, past_week_hours=[8] * 6 + [9 if i % 2 else 6])
+        route = Route.objects.create(route_id=1, distance_km=8, traffic_level="Medium", base_time_min=45)
+        for i in range(1, 31):
+            Order.objects.create(order_id=i, value_rs=900 + 10 * i, route=route, delivery_time_min=45)
+
+    def sweep(self, **payload):
+        return self.client.post("/api/simulations/sweep/", payload, format="json")
+
+    def test_grid_matches_individual_runs_without_persisting(self):
+        res = self.sweep(available_drivers={"start": 1, "stop": 4},
+                         max_hours_per_driver=[2, 6], route_start_time=["08:00", "09:30"])
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertEqual(len(body["rows"]), 4 * 2 * 2)
+        self.assertFalse(SimulationResult.objects.exists())
+        self.assertFalse(DeliveryAssignment.objects.exists())
+
+        cols = body["columns"]
+        row = next(r for r in body["rows"] if r[0] == 3 and r[1] == 2)
+        single = self.client.post("/api/simulations/run/", {
+            "available_drivers": 3, "max_hours_per_driver": 2, "route_start_time": "08:00"
+        }, format="json").json()["kpis"]
+        self.assertEqual(row[cols.index("total_profit")], single["total_profit"])
+        self.assertEqual(row[cols.index("efficiency")], single["efficiency"])
+
+    def test_pool_matches_serial(self):
+        payload = {"available_drivers": {"start": 1, "stop": 4}, "max_hours_per_driver": [2, 4, 6]}
+        with self.settings(SIMULATION_SWEEP_WORKERS=1):
+            serial = self.sweep(**payload).json()
+        with self.settings(SIMULATION_SWEEP_WORKERS=2):
+            pooled = self.sweep(**payload).json()
+        self.assertEqual(serial, pooled)
+
+    def test_rejects_out_of_range_drivers(self):
+        res = self.sweep(available_drivers=[1, 9], max_hours_per_driver=8)
+        self.assertEqual(res.status_code, 400)
+
+    def test_point_cap_counts_distinct_points(self):
+        with self.settings(SIMULATION_SWEEP_MAX_POINTS=2):
+            self.assertEqual(self.sweep(available_drivers=[1, 1, 1], max_hours_per_driver=[8, 8]).status_code, 200)
+            self.assertEqual(self.sweep(available_drivers=[1, 2, 3], max_hours_per_driver=8).status_code, 400)
+
+    def test_huge_range_is_rejected_before_it_is_built(self):
+        res = self.sweep(available_drivers=1, max_hours_per_driver={"start": 1, "stop": 10 ** 10})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("exceeds", res.json()["error"])
+
+    def test_pareto_front(self):
+        rows = [[100, 50.0], [90, 80.0], [80, 70.0], [120, 40.0], [90, 80.0]]
+        self.assertEqual(pareto_front(rows, 0, 1), [0, 1, 3, 4])
@@ -1,176 +1,284 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.utils import timezone
-from core.models import Driver, Route, Order, SimulationResult, DeliveryAssignment
+from core import jobs
+from core.models import Driver, Route, Order, SimulationResult, SimulationJob, DeliveryAssignment
+from core.services import SimulationInputError, cached_simulation, parse_inputs, result_cache
+from core.aggregates import summarize
+from core.compaction import HydrationError, read
+from core.history import BUCKETS, history
+from core.incremental import resimulate
+from core.profiling import StageProfiler
+from core.sweep import parse_grid, run_sweep
 from .serializers import (DriverSerializer, RouteSerializer, OrderSerializer,
-                          SimulationResultSerializer)
-from datetime import datetime, timedelta
+                          SimulationResultSerializer, SimulationResultSummarySerializer,
+                          SimulationJobSerializer, DeliveryAssignmentSerializer)
+from .batch import BatchMixin
+from .conditional import ConditionalGetMixin, response_stats
+from .filters import (KeysetOrderingFilter, QueryParamFilter, DRIVER_FILTERS, ORDER_FILTERS,
+                      ROUTE_FILTERS, parse_ids, parse_number)
+from .exports import CONTENT_TYPES, assignment_values, instance_values, stream_export, to_columns
+from .renderers import ColumnarJSONRenderer
+from .pagination import SimulationCursorPagination, AssignmentCursorPagination, RowList
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.reverse import reverse
+from contextlib import nullcontext
+from django.conf import settings
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+def _flag(value):
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def _profile_mode(request):
+    """
+    Profiling mode for a run: "stages", "cprofile" or "" (off). Staff choose
+    with ?profile=1 or ?profile=cprofile; otherwise SIMULATION_PROFILE applies.
+    """
+    requested = request.query_params.get("profile")
+    if requested is not None and request.user.is_staff:
+        return "cprofile" if requested == "cprofile" else ("stages" if _flag(requested) else "")
+    return getattr(settings, "SIMULATION_PROFILE", "")
+
+
+def assignment_rows():
+    # One joined query for everything DeliveryAssignmentSerializer reads.
+    return (DeliveryAssignment.objects.select_related("order", "driver")
+            .only("id", "simulation_id", "planned_start", "planned_duration_min", "on_time",
+                  "penalty_rs", "bonus_rs", "fuel_cost_rs", "profit_rs",
+                  "order__order_id", "driver__name"))
+
 
+def with_assignments(queryset):
+    return queryset.prefetch_related(Prefetch("assignments", queryset=assignment_rows().order_by("id")))
 
-class DriverViewSet(viewsets.ModelViewSet):
+
+class DriverViewSet(ConditionalGetMixin, BatchMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
-    queryset = Driver.objects.all().order_by("id")
+    version_names = ("driver",)
+    queryset = Driver.objects.all()
     serializer_class = DriverSerializer
+    filter_backends = [QueryParamFilter, KeysetOrderingFilter]
+    filter_params = DRIVER_FILTERS
+    ordering = ("id",)
+    ordering_fields = ["id", "name", "week_avg_hours"]
 
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(ConditionalGetMixin, BatchMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
-    queryset = Route.objects.all().order_by("route_id")
+    version_names = ("route",)
+    queryset = Route.objects.all()
     serializer_class = RouteSerializer
+    filter_backends = [QueryParamFilter, KeysetOrderingFilter]
+    filter_params = ROUTE_FILTERS
+    ordering = ("route_id",)
+    ordering_fields = ["route_id"]
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(ConditionalGetMixin, BatchMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
-    queryset = Order.objects.select_related("route").all().order_by("order_id")
+    version_names = ("order",)
+    queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    filter_backends = [QueryParamFilter, KeysetOrderingFilter]
+    filter_params = ORDER_FILTERS
+    ordering = ("order_id",)
+    ordering_fields = ["order_id", "value_rs"]
 
-class SimulationViewSet(viewsets.ReadOnlyModelViewSet):
+class SimulationViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
-    queryset = SimulationResult.objects.order_by("-ran_at")
+    queryset = SimulationResult.objects.order_by("-ran_at", "-id")
     serializer_class = SimulationResultSerializer
+    pagination_class = SimulationCursorPagination
+
+    def get_queryset(self):
+        if self.action == "retrieve":
+            return with_assignments(self.queryset)
+        return self.queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return SimulationResultSummarySerializer
+        return SimulationResultSerializer
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.action in ("retrieve", "assignments"):
+            renderers.append(ColumnarJSONRenderer())
+        return renderers
+
+    def get_version_names(self):
+        # Assignment rows show driver names and order ids.
+        if self.action in ("list", "summary", "history"):
+            return ("simulation",)
+        return ("simulation", "driver", "order")
+
+    def retrieve(self, request, *args, **kwargs):
+        if request.accepted_renderer.format == "columnar":
+            return self.conditional(request, self._columnar_detail, *args, **kwargs)
+        return self.conditional(request, self._detail, *args, **kwargs)
+
+    def _detail(self, request, *args, **kwargs):
+        simulation = self.get_object()
+        data = self.get_serializer(simulation).data
+        if simulation.compacted_at is not None:
+            # Decoded in memory; the run stays compacted.
+            data["assignments"] = DeliveryAssignmentSerializer(read(simulation), many=True).data
+        return Response(data)
+
+    def _columnar_detail(self, request, pk=None):
+        # Same shape as the JSON detail, with assignments as parallel arrays.
+        simulation = get_object_or_404(SimulationResult, pk=pk)
+        data = SimulationResultSummarySerializer(simulation).data
+        data["profile"] = simulation.profile
+        if simulation.compacted_at is not None:
+            data["assignments"] = to_columns(instance_values(read(simulation)))
+        else:
+            data["assignments"] = to_columns(assignment_values(simulation.id))
+        return Response(data)
+
+    @action(detail=True, methods=["get"])
+    def assignments(self, request, pk=None):
+        return self.conditional(request, self._assignments, pk=pk)
+
+    def _assignments(self, request, pk=None):
+        simulation = get_object_or_404(SimulationResult.objects.only("id", "compacted_at"), pk=pk)
+        compacted = RowList(read(simulation)) if simulation.compacted_at is not None else None
+        paginator = AssignmentCursorPagination()
+        if request.accepted_renderer.format == "columnar":
+            rows = assignment_values(simulation.id) if compacted is None else RowList(instance_values(compacted))
+            page = paginator.paginate_queryset(rows, request, view=self)
+            return paginator.get_paginated_response(to_columns(page))
+        rows = assignment_rows().filter(simulation=simulation) if compacted is None else compacted
+        page = paginator.paginate_queryset(rows, request, view=self)
+        return paginator.get_paginated_response(DeliveryAssignmentSerializer(page, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        return self.conditional(request, self._summary)
+
+    def _summary(self, request):
+        # ?simulation=1,2,3 and/or ?last=N (most recent N); default: all runs.
+        simulations = self.queryset
+        ids = parse_ids(request.query_params, "simulation")
+        if ids is not None:
+            simulations = simulations.filter(pk__in=ids)
+        last = parse_number(request.query_params, "last")
+        if last is not None:
+            if last < 1:
+                return Response({"last": "Must be at least 1."}, status=status.HTTP_400_BAD_REQUEST)
+            simulations = simulations[:last]
+        return Response(summarize(simulations))
+
+    @action(detail=False, methods=["get"])
+    def history(self, request):
+        return self.conditional(request, self._history)
+
+    def _history(self, request):
+        params = request.query_params
+        bucket = params.get("bucket", "auto")
+        if bucket not in ("auto", "none", *BUCKETS):
+            return Response({"bucket": f"Must be one of auto, none, {', '.join(BUCKETS)}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        limit = settings.SIMULATION_HISTORY_MAX_POINTS
+        max_points = parse_number(params, "max_points")
+        max_points = limit if max_points is None else max_points
+        if not 1 <= max_points <= limit:
+            return Response({"max_points": f"Must be between 1 and {limit}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        simulations = SimulationResult.objects.all()
+        for param, lookup in (("since", "ran_at__gte"), ("until", "ran_at__lt")):
+            if params.get(param):
+                value = parse_datetime(params[param])
+                if value is None:
+                    return Response({param: "Expected an ISO 8601 datetime."},
+                                    status=status.HTTP_400_BAD_REQUEST)
+                if timezone.is_naive(value):
+                    value = timezone.make_aware(value)
+                simulations = simulations.filter(**{lookup: value})
+        return Response(history(simulations, bucket, max_points))
+
+    @action(detail=True, methods=["get"])
+    def export(self, request, pk=None):
+        fmt = request.query_params.get("fmt", "csv")
+        if fmt not in CONTENT_TYPES:
+            return Response({"error": "fmt must be csv or ndjson"}, status=status.HTTP_400_BAD_REQUEST)
+        simulation = get_object_or_404(SimulationResult.objects.only("id", "compacted_at"), pk=pk)
+        # Compacted runs are exported from memory without being restored.
+        rows = instance_values(read(simulation)) if simulation.compacted_at is not None else None
+        gzip = _flag(request.query_params.get("gzip"))
+
+        filename = f"simulation-{simulation.id}.{fmt}" + (".gz" if gzip else "")
+        response = StreamingHttpResponse(
+            stream_export(simulation.id, fmt, gzip=gzip, rows=rows),
+            content_type="application/gzip" if gzip else CONTENT_TYPES[fmt],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
 
     @action(detail=False, methods=["post"])
     def run(self, request):
         try:
-            available_drivers = int(request.data.get("available_drivers"))
-            route_start_time = request.data.get("route_start_time", "09:00")
-            max_hours_per_driver = int(request.data.get("max_hours_per_driver"))
-        except (ValueError, TypeError):
-            return Response(
-                {"error": "Invalid parameter types."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+            inputs = parse_inputs(request.data)
+        except SimulationInputError as exc:
+            return Response(exc.payload, status=status.HTTP_400_BAD_REQUEST)
 
-        if available_drivers <= 0 or max_hours_per_driver <= 0:
+        stream = _flag(request.data.get("stream"))
+        if _flag(request.data.get("async")):
+            job = jobs.enqueue(inputs, stream=stream)
             return Response(
-                {"error": "available_drivers and max_hours_per_driver must be positive."},
-                status=status.HTTP_400_BAD_REQUEST
+                {"job_id": job.id, "status": job.status,
+                 "status_url": reverse("simulations-job", args=[job.id], request=request)},
+                status=status.HTTP_202_ACCEPTED
             )
-             
-        total_drivers_count = Driver.objects.count()
-
-        if available_drivers > total_drivers_count:
-          return Response(
-        {
-            "error": "available_drivers exceeds total drivers in database",
-            "requested": available_drivers,
-            "available_in_db": total_drivers_count
-        },
-        status=status.HTTP_400_BAD_REQUEST
-        )
 
-        drivers = list(Driver.objects.all().order_by("id")[:available_drivers])
-        if not drivers:
-            return Response({"error": "No drivers available."}, status=400)
+        mode = _profile_mode(request)
+        profiler = StageProfiler(cprofile=mode == "cprofile") if mode else None
+        with profiler or nullcontext():
+            # A profiled run must actually run, so it never reuses a cached result.
+            sim_result, hit = cached_simulation(inputs, stream=stream, profiler=profiler,
+                                                refresh=bool(profiler) or _flag(request.data.get("refresh")))
+            # Assignments are paged from the sub-resource rather than nested here.
+            with (profiler.stage("serialize") if profiler else nullcontext()):
+                data = SimulationResultSummarySerializer(sim_result).data
+                data["profile"] = sim_result.profile
+                data["assignments_url"] = reverse("simulations-assignments", args=[sim_result.pk],
+                                                  request=request)
+        if profiler:
+            data["profile"] = profiler.summary()
+            SimulationResult.objects.filter(pk=sim_result.pk).update(profile=data["profile"])
+        response = Response(data, status=200)
+        response["X-Simulation-Cache"] = "hit" if hit else "miss"
+        return response
 
+    @action(detail=True, methods=["post"])
+    def resimulate(self, request, pk=None):
+        sim_result = get_object_or_404(SimulationResult, pk=pk)
         try:
-            start_hour, start_minute = map(int, route_start_time.split(":"))
-        except ValueError:
-            return Response({"error": "route_start_time must be HH:MM format"}, status=400)
-
-        now = timezone.now().replace(
-            hour=start_hour, minute=start_minute, second=0, microsecond=0
-        )
+            changes = resimulate(sim_result)
+        except HydrationError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_409_CONFLICT)
+        return Response({
+            "simulation": SimulationResultSummarySerializer(sim_result).data,
+            "changes": changes,
+        })
 
-        
-        driver_minutes_used = {d.id: 0 for d in drivers}
-        on_time_count = 0
-        late_count = 0
-        total_profit = 0
-        fuel_by_traffic = {"Low": 0, "Medium": 0, "High": 0}
-
-        sim_result = SimulationResult.objects.create(
-            ran_at=timezone.now(),
-            inputs={
-                "available_drivers": available_drivers,
-                "route_start_time": route_start_time,
-                "max_hours_per_driver": max_hours_per_driver
-            },
-            kpis={}, totals={}
-        )
+    @action(detail=False, methods=["get"], url_path="cache")
+    def cache_stats(self, request):
+        return Response({**result_cache.stats(), "responses": response_stats.stats()})
 
-        
-        orders = list(Order.objects.select_related("route").all().order_by("order_id"))
-        driver_idx = 0
-
-        for order in orders:
-            
-            spins = 0
-            chosen_driver = None
-            while spins < len(drivers):
-                candidate = drivers[driver_idx % len(drivers)]
-                if driver_minutes_used[candidate.id] < max_hours_per_driver * 60:
-                    chosen_driver = candidate
-                    break
-                driver_idx += 1
-                spins += 1
-
-            if not chosen_driver:
-                break  
-
-            route = order.route
-            fatigue_factor = 1.3 if chosen_driver.is_fatigued_today() else 1.0
-            actual_time = int(round(route.base_time_min * fatigue_factor))
-
-            # Company Rule 1: Late Delivery Penalty
-            late_threshold = route.base_time_min + 10
-            on_time = actual_time <= late_threshold
-            penalty = 0 if on_time else 50
-
-            # Company Rule 4: Fuel Cost
-            fuel_cost = route.distance_km * 5
-            if route.traffic_level == "High":
-                fuel_cost += route.distance_km * 2
-            fuel_cost = int(round(fuel_cost))
-            fuel_by_traffic[route.traffic_level] += fuel_cost
-
-            # Company Rule 3: High-Value Bonus
-            bonus = 0
-            if order.value_rs > 1000 and on_time:
-                bonus = int(round(order.value_rs * 0.10))
-
-            # Company Rule 5: Profit
-            profit = order.value_rs + bonus - penalty - fuel_cost
-
-            # Update counters
-            if on_time:
-                on_time_count += 1
-            else:
-                late_count += 1
-            total_profit += profit
-
-            # Save assignment
-            DeliveryAssignment.objects.create(
-                simulation=sim_result,
-                order=order,
-                driver=chosen_driver,
-                planned_start=now + timedelta(minutes=driver_minutes_used[chosen_driver.id]),
-                planned_duration_min=actual_time,
-                on_time=on_time,
-                penalty_rs=penalty,
-                bonus_rs=bonus,
-                fuel_cost_rs=fuel_cost,
-                profit_rs=profit
-            )
+    @action(detail=False, methods=["post"])
+    def sweep(self, request):
+        try:
+            grid = parse_grid(request.data)
+        except SimulationInputError as exc:
+            return Response(exc.payload, status=status.HTTP_400_BAD_REQUEST)
+        return Response(run_sweep(*grid), status=200)
 
-            # Increment driver time
-            driver_minutes_used[chosen_driver.id] += actual_time
-            driver_idx += 1
-
-        # Company Rule 6: Efficiency
-        total_deliveries = on_time_count + late_count
-        efficiency = (on_time_count / total_deliveries * 100) if total_deliveries else 0
-
-        # Save KPIs
-        sim_result.kpis = {
-            "total_profit": total_profit,
-            "efficiency": round(efficiency, 2),
-            "on_time": on_time_count,
-            "late": late_count
-        }
-        sim_result.totals = {
-            "fuel_by_traffic": fuel_by_traffic
-        }
-        sim_result.save()
-
-        return Response(SimulationResultSerializer(sim_result).data, status=200)
+    @action(detail=False, methods=["get"], url_path=r"jobs/(?P<job_id>\d+)", url_name="job")
+    def job(self, request, job_id=None):
+        job = get_object_or_404(SimulationJob.objects.select_related("result"), pk=job_id)
+        return Response(SimulationJobSerializer(job).data)
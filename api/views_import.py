@@ -0,0 +1,35 @@
+import io
+
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.importing import IMPORTERS, import_csv
+
+
+class BulkImportView(APIView):
+    """POST a CSV as multipart field `file` to /api/import/<routes|drivers|orders>/."""
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, kind):
+        if kind not in IMPORTERS:
+            return Response({"error": f"Unknown import kind {kind!r}."}, status=status.HTTP_404_NOT_FOUND)
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "Upload a CSV in the 'file' field."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            chunk_size = int(request.data.get("chunk_size", 5000))
+        except (TypeError, ValueError):
+            chunk_size = 0
+        if chunk_size <= 0:
+            return Response({"error": "chunk_size must be a positive integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        try:
+            report = import_csv(kind, text, chunk_size=chunk_size)
+        except UnicodeDecodeError:
+            return Response({"error": "File must be UTF-8 encoded CSV."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_200_OK)
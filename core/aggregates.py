@@ -0,0 +1,75 @@
+"""
+Materialized per-simulation breakdowns.
+
+At the end of every run the assignments are grouped in the database by
+driver, route and traffic level and stored as SimulationAggregate rows, so
+dashboard charts across many simulations read a few rows per simulation
+instead of every DeliveryAssignment.
+"""
+from django.db.models import CharField, Count, F, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from core.models import DeliveryAssignment, SimulationAggregate
+from core.simulation import TRAFFIC_LEVELS
+
+MEASURES = {
+    "deliveries": Count("id"),
+    "on_time": Count("id", filter=Q(on_time=True)),
+    "profit_rs": Coalesce(Sum("profit_rs"), 0),
+    "fuel_cost_rs": Coalesce(Sum("fuel_cost_rs"), 0),
+    "penalty_rs": Coalesce(Sum("penalty_rs"), 0),
+    "bonus_rs": Coalesce(Sum("bonus_rs"), 0),
+}
+
+DIMENSION_KEYS = {
+    SimulationAggregate.DRIVER: F("driver__name"),
+    SimulationAggregate.ROUTE: Cast("order__route__route_id", CharField()),
+    # Rows written before traffic_level was stored fall back to the route's level.
+    SimulationAggregate.TRAFFIC: Coalesce(NullIf("traffic_level", Value("")), "order__route__traffic_level"),
+}
+
+
+def materialize(sim_result):
+    """(Re)build the aggregate rows for `sim_result`; one grouped query per dimension."""
+    assignments = DeliveryAssignment.objects.filter(simulation=sim_result)
+    rows = [
+        SimulationAggregate(simulation=sim_result, dimension=dimension, **row)
+        for dimension, key in DIMENSION_KEYS.items()
+        for row in assignments.annotate(key=key).values("key").annotate(**MEASURES).order_by()
+    ]
+    SimulationAggregate.objects.filter(simulation=sim_result).delete()
+    SimulationAggregate.objects.bulk_create(rows)
+    return rows
+
+
+def summarize(simulations):
+    """
+    Dashboard breakdowns summed over `simulations` (a SimulationResult
+    queryset) in a single grouped query on the aggregate table.
+    """
+    rows = (SimulationAggregate.objects.filter(simulation__in=simulations.values("id"))
+            .values("dimension", "key")
+            .annotate(**{name: Sum(name) for name in MEASURES}).order_by())
+    by_dimension = {dimension: [] for dimension in DIMENSION_KEYS}
+    for row in rows:
+        by_dimension[row.pop("dimension")].append(row)
+
+    traffic = {row["key"]: row for row in by_dimension[SimulationAggregate.TRAFFIC]}
+    return {
+        "profit_by_driver": sorted(
+            ({"driver": r["key"], "deliveries": r["deliveries"], "profit_rs": r["profit_rs"]}
+             for r in by_dimension[SimulationAggregate.DRIVER]),
+            key=lambda r: (-r["profit_rs"], r["driver"]),
+        ),
+        "on_time_by_traffic": [
+            {"traffic_level": level, "deliveries": r["deliveries"], "on_time": r["on_time"],
+             "on_time_rate": round(r["on_time"] / r["deliveries"] * 100, 2) if r["deliveries"] else 0}
+            for level, r in ((level, traffic.get(level, {"deliveries": 0, "on_time": 0}))
+                             for level in TRAFFIC_LEVELS)
+        ],
+        "fuel_by_route": sorted(
+            ({"route_id": int(r["key"]), "deliveries": r["deliveries"], "fuel_cost_rs": r["fuel_cost_rs"]}
+             for r in by_dimension[SimulationAggregate.ROUTE]),
+            key=lambda r: r["route_id"],
+        ),
+    }
@@ -20,11 +20,9 @@ def seed_if_empty(sender, **kwargs):
     if os.environ.get("AUTO_SEED") != "1":
         return
 
-    # Run your existing management command
-    # (replace 'seed_db' with your command name)
-    call_command("seed_db")
-    # or with custom CSVs:
-    # call_command("seed_db", drivers="core/data/drivers.csv", routes="core/data/routes.csv", orders="core/data/orders.csv")
+    # Load the bundled CSVs; for custom files use:
+    # call_command("bulk_import", drivers="...", routes="...", orders="...")
+    call_command("seed_from_csv")
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
@@ -33,3 +31,6 @@ class CoreConfig(AppConfig):
     def ready(self):
         # Connect after this app’s migrations run
         post_migrate.connect(seed_if_empty, sender=self)
+
+        from core import signals
+        signals.connect()
@@ -0,0 +1,149 @@
+"""
+End-to-end simulation benchmark.
+
+Each mode times one layer of the stack against whatever data is loaded:
+
+    engine   load drivers/orders and run the engine in memory
+    persist  run_simulation(): engine + DeliveryAssignment inserts + aggregates
+    api      POST /api/simulations/run/ through the view (serializer included)
+
+Timed repeats run without instrumentation; one extra pass collects the SQL
+query count/time and the peak Python heap (tracemalloc), which would
+otherwise skew the timings.
+
+Each runner returns (kpis, id of the SimulationResult it created or None);
+only those results are deleted afterwards.
+"""
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Driver, Order, Route, SimulationResult
+from core.partitioned import DEFAULT_PARTITION_MODE, simulate_partitioned
+from core.services import load_drivers, load_orders, run_simulation
+from core.simulation import simulate
+
+MODES = ("engine", "persist", "api")
+
+
+def _engine(inputs, stream):
+    args = (load_orders(), load_drivers(inputs["available_drivers"]), inputs["max_hours_per_driver"],
+            inputs["strategy"])
+    if "partitions" in inputs:
+        _, kpis, _ = simulate_partitioned(*args, partitions=inputs["partitions"],
+                                          mode=inputs.get("partition_mode", DEFAULT_PARTITION_MODE))
+    else:
+        _, kpis, _ = simulate(*args)
+    return kpis, None
+
+
+def _persist(inputs, stream):
+    result = run_simulation(inputs, stream=stream)
+    return result.kpis, result.id
+
+
+def _api(inputs, stream):
+    from api.views import SimulationViewSet  # core must not import api at module load
+
+    request = APIRequestFactory().post("/api/simulations/run/", {**inputs, "stream": stream, "refresh": True},
+                                       format="json")
+    force_authenticate(request, user=User(username="bench"))
+    response = SimulationViewSet.as_view({"post": "run"})(request)
+    response.render()
+    if response.status_code != 200:
+        raise RuntimeError(f"run returned {response.status_code}: {response.data}")
+    return response.data["kpis"], response.data["id"]
+
+
+RUNNERS = {"engine": _engine, "persist": _persist, "api": _api}
+
+
+def commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark(mode, inputs, repeat=3, warmup=1, partitions=1, stream=False, keep=False,
+              partition_mode=DEFAULT_PARTITION_MODE):
+    run = RUNNERS[mode]
+    if partitions > 1:
+        inputs = {**inputs, "partitions": partitions}
+        if partition_mode != DEFAULT_PARTITION_MODE:
+            inputs["partition_mode"] = partition_mode
+    created = []
+
+    def timed():
+        kpis, result_id = run(inputs, stream)
+        if result_id is not None:
+            created.append(result_id)
+        return kpis
+
+    try:
+        for _ in range(warmup):
+            timed()
+        timings = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            kpis = timed()
+            timings.append(time.perf_counter() - t0)
+
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as ctx:
+            timed()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        if not keep:
+            SimulationResult.objects.filter(id__in=created).delete()
+
+    median = statistics.median(timings)
+    simulated = kpis["on_time"] + kpis["late"]
+    return {
+        "benchmark": "simulation",
+        "mode": mode,
+        "commit": commit(),
+        "timestamp": datetime.now(dt_timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "database": connection.vendor,
+        "dataset": {"drivers": Driver.objects.count(), "routes": Route.objects.count(),
+                    "orders": Order.objects.count()},
+        "params": {**inputs, "partitions": partitions, "stream": stream, "repeat": repeat, "warmup": warmup},
+        "orders_simulated": simulated,
+        "wall_time_s": {"min": round(min(timings), 4), "median": round(median, 4),
+                        "mean": round(statistics.fmean(timings), 4), "runs": [round(t, 4) for t in timings]},
+        "orders_per_sec": round(simulated / median, 1) if median else None,
+        "queries": len(ctx.captured_queries),
+        "sql_time_s": round(sum(float(q["time"]) for q in ctx.captured_queries), 4),
+        "peak_memory_mb": round(peak / 2 ** 20, 2),
+        # ru_maxrss is KiB on Linux, bytes on macOS.
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                            / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1),
+        "kpis": kpis,
+    }
+
+
+def compare(result, baseline):
+    """Relative change vs. an earlier benchmark() result (negative time = faster)."""
+    def change(new, old):
+        return round((new - old) / old * 100, 1) if old else None
+
+    return {
+        "baseline_commit": baseline.get("commit"),
+        "median_time_pct": change(result["wall_time_s"]["median"], baseline["wall_time_s"]["median"]),
+        "orders_per_sec_pct": change(result["orders_per_sec"] or 0, baseline.get("orders_per_sec") or 0),
+        "queries_delta": result["queries"] - baseline["queries"],
+        "peak_memory_pct": change(result["peak_memory_mb"], baseline["peak_memory_mb"]),
+    }
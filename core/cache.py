@@ -0,0 +1,67 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU map with hit/miss/eviction counters. With `ttl`
+    (seconds), entries older than that are treated as missing. Callers that
+    fall back to a slower store after a miss report a successful fallback
+    with record_fallback_hit(), which counts towards overall_hit_rate.
+    """
+
+    def __init__(self, maxsize=256, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at or None, value)
+        self._lock = Lock()
+        self.hits = self.misses = self.evictions = self.fallback_hits = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+                del self._data[key]
+                entry = None
+            if entry is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl if self.ttl else None, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def record_fallback_hit(self):
+        with self._lock:
+            self.fallback_hits += 1
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.fallback_hits = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "fallback_hits": self.fallback_hits,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "overall_hit_rate": round((self.hits + self.fallback_hits) / lookups, 4) if lookups else 0.0,
+        }
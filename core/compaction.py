@@ -0,0 +1,156 @@
+"""
+Retention for DeliveryAssignment rows.
+
+After SIMULATION_RETENTION_DAYS a simulation's assignments are packed into a
+single CompactedAssignments blob (zlib-compressed JSON, one array per field)
+and the rows are deleted. The KPI columns and SimulationAggregate rows are
+left alone, so lists, summaries and history keep working without the rows.
+CompactedReference rows carry the PROTECT foreign keys the packed rows had,
+so the orders and drivers a compacted run refers to cannot be deleted.
+
+Reading a compacted run (detail, assignments, export) decodes the blob in
+memory with read() and leaves it compacted. Only resimulate, which rewrites
+rows, calls hydrate() to restore them with their original ids.
+"""
+import json
+import time
+import zlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import zip_longest
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import (CompactedAssignments, CompactedReference, DeliveryAssignment, Driver, Order,
+                         SimulationResult)
+
+FIELDS = ["id", "order_id", "driver_id", "planned_start", "planned_duration_min", "on_time",
+          "penalty_rs", "bonus_rs", "fuel_cost_rs", "profit_rs", "traffic_level", "order_number"]
+START, ORDER, DRIVER = (FIELDS.index(f) for f in ("planned_start", "order_id", "driver_id"))
+
+
+class HydrationError(Exception):
+    """A compacted run refers to orders or drivers that no longer exist."""
+
+
+def pack(rows):
+    """values_list(*FIELDS) rows -> (compressed blob, uncompressed size)."""
+    columns = [list(col) for col in zip(*rows)] or [[] for _ in FIELDS]
+    columns[START] = [int(dt.timestamp()) for dt in columns[START]]
+    raw = json.dumps(dict(zip(FIELDS, columns)), separators=(",", ":")).encode()
+    return zlib.compress(raw, 9), len(raw)
+
+
+def unpack(data):
+    """Inverse of pack(): a list of dicts with FIELDS keys."""
+    columns = json.loads(zlib.decompress(bytes(data)))
+    columns["planned_start"] = [datetime.fromtimestamp(ts, tz=dt_timezone.utc) for ts in columns["planned_start"]]
+    # Blobs packed before order_number existed; hydrate() fills it in.
+    columns.setdefault("order_number", [None] * len(columns["id"]))
+    return [dict(zip(FIELDS, values)) for values in zip(*(columns[f] for f in FIELDS))]
+
+
+def compact(sim_result):
+    """Pack and delete one simulation's assignments. Returns (rows, raw bytes, stored bytes)."""
+    with transaction.atomic():
+        if CompactedAssignments.objects.filter(simulation=sim_result).exists():
+            return 0, 0, 0
+        assignments = DeliveryAssignment.objects.filter(simulation=sim_result)
+        rows = list(assignments.order_by("id").values_list(*FIELDS))
+        data, raw_bytes = pack(rows)
+        packed = CompactedAssignments.objects.create(simulation=sim_result, data=data, row_count=len(rows),
+                                                     raw_bytes=raw_bytes)
+        orders = sorted({row[ORDER] for row in rows})
+        drivers = sorted({row[DRIVER] for row in rows})
+        CompactedReference.objects.bulk_create(
+            [CompactedReference(compacted=packed, order_id=o, driver_id=d) for o, d in zip_longest(orders, drivers)],
+            batch_size=getattr(settings, "SIMULATION_BULK_BATCH_SIZE", 1000),
+        )
+        assignments.delete()
+        # update() rather than save(): API output is unchanged, so no version bump.
+        SimulationResult.objects.filter(pk=sim_result.pk).update(compacted_at=timezone.now())
+    return len(rows), raw_bytes, len(data)
+
+
+def compact_older_than(days, limit=None, dry_run=False):
+    """Apply the retention policy; each simulation is compacted in its own transaction."""
+    cutoff = timezone.now() - timedelta(days=days)
+    candidates = (SimulationResult.objects.filter(ran_at__lt=cutoff, compacted_at__isnull=True)
+                  .order_by("ran_at").only("id"))
+    if limit:
+        candidates = candidates[:limit]
+    started = time.perf_counter()
+    report = {"cutoff": cutoff.isoformat(), "simulations": 0, "rows": 0, "raw_bytes": 0, "stored_bytes": 0}
+    for sim_result in candidates:
+        report["simulations"] += 1
+        if dry_run:
+            report["rows"] += DeliveryAssignment.objects.filter(simulation=sim_result).count()
+            continue
+        rows, raw_bytes, stored = compact(sim_result)
+        report["rows"] += rows
+        report["raw_bytes"] += raw_bytes
+        report["stored_bytes"] += stored
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def read(sim_result):
+    """
+    Decode a compacted simulation's assignments in memory without restoring
+    them: unsaved DeliveryAssignment objects in id order, with `order` and
+    `driver` loaded. The blob and the compacted state are left as they are.
+    """
+    packed = CompactedAssignments.objects.filter(simulation=sim_result).only("data").first()
+    if packed is None:
+        return []
+    rows = unpack(packed.data)
+    orders = Order.objects.only("id", "order_id").in_bulk({r["order_id"] for r in rows})
+    drivers = Driver.objects.only("id", "name").in_bulk({r["driver_id"] for r in rows})
+    assignments = []
+    for r in rows:
+        obj = DeliveryAssignment(simulation_id=packed.simulation_id, **r)
+        # Only blobs packed before CompactedReference existed can miss these.
+        obj.order = orders.get(r["order_id"]) or Order(pk=r["order_id"], order_id=r["order_number"])
+        obj.driver = drivers.get(r["driver_id"]) or Driver(pk=r["driver_id"], name=None)
+        if obj.order_number is None:
+            obj.order_number = obj.order.order_id
+        assignments.append(obj)
+    return assignments
+
+
+def hydrate(sim_result):
+    """
+    Restore a compacted simulation's assignment rows and drop the blob.
+    Returns the number of rows restored. Raises HydrationError, leaving the
+    run compacted, if any row's order or driver is gone (only possible for
+    runs compacted before CompactedReference existed).
+    """
+    with transaction.atomic():
+        packed = CompactedAssignments.objects.select_for_update().filter(simulation=sim_result).first()
+        if packed is None:
+            return 0
+        rows = unpack(packed.data)
+        orders = dict(Order.objects.filter(pk__in={r["order_id"] for r in rows}).values_list("pk", "order_id"))
+        drivers = set(Driver.objects.filter(pk__in={r["driver_id"] for r in rows}).values_list("pk", flat=True))
+        missing = sum(1 for r in rows if r["order_id"] not in orders or r["driver_id"] not in drivers)
+        if missing:
+            raise HydrationError(f"Simulation {packed.simulation_id}: {missing} compacted assignments "
+                                 f"reference deleted orders/drivers")
+        for r in rows:
+            if r["order_number"] is None:
+                r["order_number"] = orders[r["order_id"]]
+        objs = [DeliveryAssignment(simulation_id=packed.simulation_id, **r) for r in rows]
+        DeliveryAssignment.objects.bulk_create(
+            objs, batch_size=getattr(settings, "SIMULATION_BULK_BATCH_SIZE", 1000), ignore_conflicts=True
+        )
+        packed.delete()
+        SimulationResult.objects.filter(pk=packed.simulation_id).update(compacted_at=None)
+    sim_result.compacted_at = None
+    return len(objs)
+
+
+def ensure_hydrated(sim_result):
+    if sim_result.compacted_at is not None:
+        hydrate(sim_result)
+    return sim_result
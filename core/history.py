@@ -0,0 +1,82 @@
+"""
+KPI history for trend charts.
+
+Reads only ran_at and the KPI columns of SimulationResult (covered by
+simulation_history_idx). Runs are grouped into time buckets in the database
+with min/max/avg per bucket, and the number of points returned is capped,
+so the cost of a chart does not grow with the number of stored runs.
+"""
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Max, Min
+from django.db.models.functions import TruncDay, TruncHour, TruncMonth, TruncWeek
+from django.utils import timezone
+
+METRICS = ("total_profit", "efficiency")
+
+# Smallest first; "auto" picks the first that fits within max_points.
+BUCKETS = {
+    "hour": (TruncHour, timedelta(hours=1)),
+    "day": (TruncDay, timedelta(days=1)),
+    "week": (TruncWeek, timedelta(weeks=1)),
+    "month": (TruncMonth, timedelta(days=31)),
+}
+
+
+def bucket_count(name, first, last):
+    """
+    Buckets of `name` that runs between `first` and `last` fall into. Counted
+    from the aligned bucket starts (as the database truncates, in the current
+    time zone), so a short span straddling a boundary counts both buckets.
+    """
+    first, last = timezone.localtime(first), timezone.localtime(last)
+    if name == "month":
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    if name == "hour":
+        first, last = (t.replace(minute=0, second=0, microsecond=0) for t in (first, last))
+        return (last - first) // BUCKETS["hour"][1] + 1
+    first, last = first.date(), last.date()
+    if name == "week":
+        first, last = first - timedelta(days=first.weekday()), last - timedelta(days=last.weekday())
+    return (last - first) // BUCKETS[name][1] + 1
+
+
+def auto_bucket(simulations, max_points):
+    span = simulations.aggregate(first=Min("ran_at"), last=Max("ran_at"))
+    if span["first"] is None or simulations.count() <= max_points:
+        return "none"
+    for name in BUCKETS:
+        if bucket_count(name, span["first"], span["last"]) <= max_points:
+            return name
+    return "month"
+
+
+def history(simulations, bucket="auto", max_points=500):
+    """
+    {"bucket", "truncated", "points"} for a SimulationResult queryset.
+    With bucket "none" every run is a point; otherwise each point is a bucket
+    with the run count and min/max/avg of every metric. Only the most recent
+    `max_points` points are returned.
+    """
+    simulations = simulations.order_by()
+    if bucket == "auto":
+        bucket = auto_bucket(simulations, max_points)
+
+    if bucket == "none":
+        rows = list(simulations.order_by("-ran_at", "-id")
+                    .values("id", "ran_at", *METRICS)[:max_points + 1])
+        points = [{"t": r["ran_at"], "runs": 1, "simulation": r["id"],
+                   **{m: {"min": r[m], "max": r[m], "avg": r[m]} for m in METRICS}} for r in rows]
+    else:
+        trunc = BUCKETS[bucket][0]
+        aggregates = {}
+        for m in METRICS:
+            aggregates.update({f"{m}_min": Min(m), f"{m}_max": Max(m), f"{m}_avg": Avg(m)})
+        rows = list(simulations.annotate(t=trunc("ran_at")).values("t")
+                    .annotate(runs=Count("id"), **aggregates).order_by("-t")[:max_points + 1])
+        points = [{"t": r["t"], "runs": r["runs"],
+                   **{m: {"min": r[f"{m}_min"], "max": r[f"{m}_max"], "avg": round(r[f"{m}_avg"], 2)}
+                      for m in METRICS}} for r in rows]
+
+    truncated = len(points) > max_points
+    return {"bucket": bucket, "truncated": truncated, "points": points[:max_points][::-1]}
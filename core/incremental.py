@@ -0,0 +1,156 @@
+"""
+Incremental re-simulation of a stored SimulationResult.
+
+Orders are scheduled in order_id order, so an order or route change can
+only affect assignments from the first changed order onwards (each row keeps
+the order_id it was scheduled at in order_number, so a renumbered order cuts
+at the lower of its old and new id). The prefix is replayed from the stored
+rows to rebuild driver time, only the suffix goes through the engine again,
+and only the rows that actually differ are written. KPIs and fuel totals are
+adjusted by the difference. A changed driver pool (membership or any pool
+driver edited) affects scheduling from the first order, so the whole run is
+recomputed, as is any run in partition mode "shards".
+"""
+from contextlib import nullcontext
+
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from core.aggregates import materialize
+from core.compaction import ensure_hydrated
+from core.models import Driver, Order, DeliveryAssignment, SimulationResult
+from core.partitioned import PartitionedSimulator, run_partitioned, spawn_pool
+from core.scheduling import DEFAULT_STRATEGY
+from core.services import (assignment_objects, feed_orders, input_hash, load_drivers, order_columns,
+                           order_rows, pool_hash, start_datetime)
+from core.simulation import Simulator
+
+COMPARED_FIELDS = ["driver_id", "planned_start", "planned_duration_min", "on_time", "penalty_rs",
+                   "bonus_rs", "fuel_cost_rs", "profit_rs", "traffic_level", "order_number"]
+FROM_START = 0
+
+
+def first_affected_order(sim_result, pool_ids, since):
+    """
+    Smallest order position whose assignment may differ (FROM_START when the
+    driver pool changed), or None if nothing changed.
+    """
+    if (sim_result.driver_pool != pool_hash(pool_ids)
+            or Driver.objects.filter(pk__in=pool_ids, updated_at__gt=since).exists()):
+        return FROM_START
+    changed = Order.objects.filter(Q(updated_at__gt=since) | Q(route__updated_at__gt=since))
+    new_position = changed.aggregate(first=Min("order_id"))["first"]
+    old_position = (sim_result.assignments.filter(order__in=changed.values("pk"))
+                    .aggregate(first=Min("order_number"))["first"])
+    candidates = [x for x in (new_position, old_position) if x is not None]
+    return min(candidates) if candidates else None
+
+
+def _apply_delta(kpis, fuel, row, sign, current_traffic):
+    kpis["total_profit"] += sign * row.profit_rs
+    kpis["on_time" if row.on_time else "late"] += sign
+    # Rows written before traffic_level was stored fall back to the route's current level.
+    level = row.traffic_level or current_traffic.get(row.order_id, "Low")
+    fuel[level] = fuel.get(level, 0) + sign * row.fuel_cost_rs
+
+
+def resimulate(sim_result):
+    """
+    Bring `sim_result` up to date with the current Driver/Route/Order data.
+    Returns a dict describing what was recomputed and written. The run is
+    row-locked for the duration, so concurrent calls apply one after another.
+    """
+    with transaction.atomic():
+        locked = SimulationResult.objects.select_for_update().get(pk=sim_result.pk)
+        changes = _resimulate(ensure_hydrated(locked))
+    sim_result.refresh_from_db()
+    return changes
+
+
+def _resimulate(sim_result):
+    inputs = sim_result.inputs
+    since = sim_result.data_as_of or sim_result.ran_at
+    data_as_of = timezone.now()
+    drivers = load_drivers(inputs["available_drivers"])
+    cut = first_affected_order(sim_result, drivers["id"], since)
+    if cut is None:
+        return {"changed": False, "from_order_id": None, "recomputed": 0,
+                "updated": 0, "created": 0, "deleted": 0}
+
+    partitions = inputs.get("partitions", 1)
+    sharded = inputs.get("partition_mode") == "shards"
+    pool = spawn_pool(partitions) if partitions > 1 and not sharded else None
+
+    def fresh():
+        if pool is not None:
+            return PartitionedSimulator(drivers, inputs["max_hours_per_driver"],
+                                        inputs.get("strategy", DEFAULT_STRATEGY), pool, partitions)
+        return Simulator(drivers, inputs["max_hours_per_driver"], inputs.get("strategy", DEFAULT_STRATEGY))
+
+    if sharded:
+        # Shards interleave the whole order book, so there is no prefix to keep.
+        cut = FROM_START
+    else:
+        sim = fresh()
+        prefix = list(sim_result.assignments.filter(order_number__lt=cut).order_by("order_number")
+                      .values_list("driver_id", "planned_duration_min"))
+        if prefix and not sim.replay(*zip(*prefix)):
+            # The stored prefix no longer schedules the same way; redo everything.
+            sim, cut = fresh(), FROM_START
+
+    orders = order_columns(order_rows().filter(order_id__gte=cut))
+    old_rows = sim_result.assignments.filter(order_number__gte=cut)
+    old = {row.order_id: row for row in old_rows.only("id", "order_id", *COMPARED_FIELDS)}
+
+    if sharded:
+        batch, _ = run_partitioned(orders, drivers, inputs["max_hours_per_driver"],
+                                   inputs.get("strategy", DEFAULT_STRATEGY), partitions)
+    else:
+        with pool or nullcontext():
+            batch = feed_orders(sim, orders)
+    start = start_datetime(inputs["route_start_time"], day=sim_result.ran_at)
+    new = {obj.order_id: obj for obj in assignment_objects(sim_result, batch, start)}
+    current_traffic = dict(zip(batch["order"], (obj.traffic_level for obj in new.values())))
+
+    kpis = dict(sim_result.kpis)
+    fuel = dict(sim_result.totals.get("fuel_by_traffic", {}))
+    to_create, to_update, to_delete = [], [], []
+    for order_pk, obj in new.items():
+        prev = old.pop(order_pk, None)
+        if prev is None:
+            to_create.append(obj)
+            _apply_delta(kpis, fuel, obj, +1, current_traffic)
+        elif any(getattr(prev, f) != getattr(obj, f) for f in COMPARED_FIELDS):
+            _apply_delta(kpis, fuel, prev, -1, current_traffic)
+            _apply_delta(kpis, fuel, obj, +1, current_traffic)
+            obj.pk = prev.pk
+            to_update.append(obj)
+    for prev in old.values():
+        to_delete.append(prev.pk)
+        _apply_delta(kpis, fuel, prev, -1, current_traffic)
+
+    total = kpis["on_time"] + kpis["late"]
+    kpis["efficiency"] = round(kpis["on_time"] / total * 100, 2) if total else 0
+
+    DeliveryAssignment.objects.bulk_create(to_create)
+    DeliveryAssignment.objects.bulk_update(to_update, COMPARED_FIELDS, batch_size=1000)
+    DeliveryAssignment.objects.filter(pk__in=to_delete).delete()
+    sim_result.kpis = kpis
+    sim_result.totals = {**sim_result.totals, "fuel_by_traffic": fuel}
+    sim_result.data_as_of = data_as_of
+    # Rows stay anchored to the run's own day, so only a same-day request may reuse it.
+    sim_result.input_hash = input_hash(inputs, day=sim_result.ran_at)
+    sim_result.driver_pool = pool_hash(drivers["id"])
+    sim_result.save(update_fields=["kpis", "totals", "data_as_of", "input_hash", "driver_pool"])
+    if to_create or to_update or to_delete:
+        materialize(sim_result)
+
+    return {
+        "changed": bool(to_create or to_update or to_delete),
+        "from_order_id": None if cut == FROM_START else cut,
+        "recomputed": len(batch["order"]),
+        "updated": len(to_update),
+        "created": len(to_create),
+        "deleted": len(to_delete),
+    }
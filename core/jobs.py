@@ -0,0 +1,104 @@
+"""
+DB-backed simulation job queue.
+
+Jobs are rows in SimulationJob. They are executed in a process pool, either
+by the `simulation_worker` management command (the production path) or, when
+SIMULATION_JOBS_IN_PROCESS is set, by a pool owned by the web process.
+A job left running longer than SIMULATION_JOB_TIMEOUT (its worker died) can
+be claimed again.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import SimulationJob
+from core.procpool import executor
+from core.services import SimulationInputError, cached_simulation, parse_inputs
+
+_pool = None
+
+
+def get_pool(max_workers=None):
+    global _pool
+    if _pool is None:
+        _pool = executor(max_workers or getattr(settings, "SIMULATION_JOB_WORKERS", 2))
+    return _pool
+
+
+def enqueue(inputs, stream=False):
+    job = SimulationJob.objects.create(inputs=inputs, stream=stream)
+    if getattr(settings, "SIMULATION_JOBS_IN_PROCESS", False):
+        transaction.on_commit(lambda: dispatch(job.pk))
+    return job
+
+
+def claimable():
+    """Queued jobs, plus running ones whose worker has exceeded SIMULATION_JOB_TIMEOUT."""
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, "SIMULATION_JOB_TIMEOUT", 1800))
+    return (Q(status=SimulationJob.QUEUED)
+            | Q(status=SimulationJob.RUNNING, started_at__lt=cutoff))
+
+
+def claim(job_id):
+    """Atomically move a claimable job to running; False if someone else got it."""
+    return bool(SimulationJob.objects.filter(claimable(), pk=job_id)
+                .update(status=SimulationJob.RUNNING, started_at=timezone.now(), progress=0))
+
+
+def dispatch(job_id):
+    if claim(job_id):
+        return get_pool().submit(execute, job_id)
+    return None
+
+
+def execute(job_id):
+    """Run a claimed job to completion and record its outcome."""
+    job = SimulationJob.objects.get(pk=job_id)
+
+    def progress(done, total):
+        if connections["default"].in_atomic_block:
+            return  # would only become visible on commit
+        pct = int(done * 100 / total) if total else 100
+        SimulationJob.objects.filter(pk=job_id).update(progress=min(pct, 99))
+
+    try:
+        inputs = parse_inputs(job.inputs)
+        result, _ = cached_simulation(inputs, stream=job.stream, progress=progress)
+    except SimulationInputError as exc:
+        _finish(job_id, SimulationJob.FAILED, error=exc.payload)
+    except Exception as exc:
+        _finish(job_id, SimulationJob.FAILED, error={"error": str(exc)})
+        raise
+    else:
+        _finish(job_id, SimulationJob.DONE, result=result, progress=100)
+    return job_id
+
+
+def _finish(job_id, status, **fields):
+    SimulationJob.objects.filter(pk=job_id).update(status=status, finished_at=timezone.now(), **fields)
+
+
+def next_queued(limit):
+    return list(SimulationJob.objects.filter(claimable())
+                .order_by("created_at", "id").values_list("id", flat=True)[:limit])
+
+
+def run_worker(processes=None, poll_interval=1.0, once=False, log=None):
+    """Poll the queue and feed jobs to a process pool until interrupted."""
+    processes = processes or getattr(settings, "SIMULATION_JOB_WORKERS", 2)
+    in_flight = set()
+    with executor(processes) as pool:
+        while True:
+            in_flight = {f for f in in_flight if not f.done()}
+            for job_id in next_queued(processes - len(in_flight)):
+                if claim(job_id):
+                    in_flight.add(pool.submit(execute, job_id))
+                    if log:
+                        log(f"Started job {job_id}")
+            if once and not in_flight and not next_queued(1):
+                return
+            time.sleep(poll_interval)
@@ -0,0 +1,111 @@
+import json
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import Client
+from django.test.utils import override_settings
+
+SCENARIOS = ("register", "login", "read")
+PASSWORD = "bench-Passw0rd!"
+
+
+def _register(client, run, i, token):
+    return client.post("/api/auth/register/", {"username": f"{run}-r{i}", "password": PASSWORD},
+                       content_type="application/json")
+
+
+def _login(client, run, i, token):
+    return client.post("/api/auth/login/", {"username": f"{run}-login", "password": PASSWORD},
+                       content_type="application/json")
+
+
+def _read(client, run, i, token):
+    return client.get("/api/routes/?page_size=1", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+CALLS = {"register": _register, "login": _login, "read": _read}
+EXPECTED = {"register": 201, "login": 200, "read": 200}
+
+
+def run_scenario(name, run, token, requests, concurrency):
+    """Fire `requests` calls from `concurrency` threads; returns throughput and latency."""
+    call = CALLS[name]
+
+    def one(i):
+        client = Client(HTTP_HOST="localhost")
+        started = time.perf_counter()
+        try:
+            ok = call(client, run, i, token).status_code == EXPECTED[name]
+        except Exception:
+            ok = False
+        finally:
+            close_old_connections()
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(t * 1000 for t, _ in results)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": sum(1 for _, ok in results if not ok),
+        "seconds": round(elapsed, 3),
+        "req_per_sec": round(requests / elapsed, 1) if elapsed else None,
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+        "max_ms": round(latencies[-1], 2),
+    }
+
+
+class Command(BaseCommand):
+    help = ("Benchmark register, login and authenticated reads under concurrent load "
+            "and print the results as JSON. Users created are removed afterwards.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                            help="Repeatable (default: all)")
+        parser.add_argument("--requests", type=int, default=100)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--rounds", type=int, default=None,
+                            help=f"bcrypt work factor (default: BCRYPT_ROUNDS={settings.BCRYPT_ROUNDS})")
+        parser.add_argument("--output", help="Also write the JSON result to this file")
+
+    def handle(self, *args, **opts):
+        if opts["requests"] < 1 or opts["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1")
+        if opts["rounds"] is not None and not 4 <= opts["rounds"] <= 31:
+            raise CommandError("--rounds must be between 4 and 31")
+        rounds = opts["rounds"] or settings.BCRYPT_ROUNDS
+        run = f"bench-{uuid.uuid4().hex[:8]}"
+
+        with override_settings(BCRYPT_ROUNDS=rounds):
+            User.objects.create_user(f"{run}-login", password=PASSWORD)
+            try:
+                token = Client(HTTP_HOST="localhost").post(
+                    "/api/auth/login/", {"username": f"{run}-login", "password": PASSWORD},
+                    content_type="application/json").json()["access"]
+                result = {
+                    "hasher": get_hasher().algorithm,
+                    "bcrypt_rounds": rounds,
+                    "scenarios": {
+                        name: run_scenario(name, run, token, opts["requests"], opts["concurrency"])
+                        for name in opts["scenario"] or SCENARIOS
+                    },
+                }
+            finally:
+                User.objects.filter(username__startswith=f"{run}-").delete()
+
+        output = json.dumps(result, indent=2)
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
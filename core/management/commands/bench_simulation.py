@@ -0,0 +1,57 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bench import MODES, benchmark, compare
+from core.models import Driver
+from core.partitioned import DEFAULT_PARTITION_MODE, PARTITION_MODES
+from core.services import SimulationInputError, parse_inputs
+
+
+class Command(BaseCommand):
+    help = ("Benchmark a simulation end to end against the loaded data (see generate_data) "
+            "and print the results as JSON.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=MODES, default="api")
+        parser.add_argument("--drivers", type=int, default=None, help="available_drivers (default: all)")
+        parser.add_argument("--max-hours", type=int, default=8)
+        parser.add_argument("--start", default="09:00")
+        parser.add_argument("--strategy", default="round_robin")
+        parser.add_argument("--partitions", type=int, default=1)
+        parser.add_argument("--partition-mode", choices=PARTITION_MODES, default=DEFAULT_PARTITION_MODE)
+        parser.add_argument("--stream", action="store_true")
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--warmup", type=int, default=1)
+        parser.add_argument("--keep", action="store_true", help="Keep the SimulationResults created")
+        parser.add_argument("--output", help="Also write the JSON result to this file")
+        parser.add_argument("--baseline", help="Earlier JSON result to compare against")
+
+    def handle(self, *args, **opts):
+        try:
+            inputs = parse_inputs({
+                "available_drivers": opts["drivers"] or Driver.objects.count(),
+                "route_start_time": opts["start"],
+                "max_hours_per_driver": opts["max_hours"],
+                "strategy": opts["strategy"],
+            })
+        except SimulationInputError as exc:
+            raise CommandError(json.dumps(exc.payload))
+        if opts["repeat"] < 1 or opts["partitions"] < 1:
+            raise CommandError("--repeat and --partitions must be at least 1")
+
+        result = benchmark(opts["mode"], inputs, repeat=opts["repeat"], warmup=opts["warmup"],
+                           partitions=opts["partitions"], stream=opts["stream"], keep=opts["keep"],
+                           partition_mode=opts["partition_mode"])
+        if opts["baseline"]:
+            try:
+                with open(opts["baseline"], encoding="utf-8") as f:
+                    result["compare"] = compare(result, json.load(f))
+            except (OSError, ValueError, KeyError) as exc:
+                raise CommandError(f"Cannot compare with {opts['baseline']}: {exc}")
+
+        output = json.dumps(result, indent=2)
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api import schema
+
+
+class Command(BaseCommand):
+    help = ("Render the OpenAPI schema for the current code version into SCHEMA_CACHE_DIR. "
+            "Run at deploy time so request workers never generate it.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenerate even if the files exist")
+
+    def handle(self, *args, **opts):
+        for path in schema.build(force=opts["force"]).values():
+            self.stdout.write(str(path))
@@ -0,0 +1,34 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importing import import_paths
+
+
+class Command(BaseCommand):
+    help = "Upsert drivers, routes and orders from CSV files in chunked bulk statements."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--routes", help="routes.csv (route_id,distance_km,traffic_level,base_time_min)")
+        parser.add_argument("--drivers", help="drivers.csv (name,shift_hours,past_week_hours)")
+        parser.add_argument("--orders", help="orders.csv (order_id,value_rs,route_id,delivery_time)")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **opts):
+        paths = {kind: opts[kind] for kind in ("routes", "drivers", "orders")}
+        if not any(paths.values()):
+            raise CommandError("Pass at least one of --routes, --drivers, --orders.")
+        try:
+            reports = import_paths(paths, chunk_size=opts["chunk_size"])
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        for report in reports:
+            self.stdout.write(
+                f"{report['kind']}: {report['imported']}/{report['rows']} rows in {report['seconds']}s "
+                f"({report['rows_per_sec']} rows/s), {report['error_count']} errors"
+            )
+            for err in report["errors"][:20]:
+                self.stderr.write(f"  line {err['line']}: {err['error']}")
+        if opts["verbosity"] > 1:
+            self.stdout.write(json.dumps(reports, indent=2))
@@ -0,0 +1,29 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.compaction import compact_older_than
+
+
+class Command(BaseCommand):
+    help = "Pack the assignment rows of old simulations into compressed blobs and delete the rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None,
+                            help="Compact runs older than this (default: SIMULATION_RETENTION_DAYS)")
+        parser.add_argument("--limit", type=int, default=None, help="At most this many simulations")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be compacted")
+
+    def handle(self, *args, **opts):
+        days = settings.SIMULATION_RETENTION_DAYS if opts["days"] is None else opts["days"]
+        if days < 0:
+            raise CommandError("--days must not be negative")
+        report = compact_older_than(days, limit=opts["limit"], dry_run=opts["dry_run"])
+        verb = "Would compact" if opts["dry_run"] else "Compacted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['simulations']} simulations ({report['rows']} assignment rows) "
+            f"in {report['seconds']}s"
+        ))
+        if opts["verbosity"] > 1:
+            self.stdout.write(json.dumps(report, indent=2))
@@ -0,0 +1,64 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core import synthetic, versioning
+from core.models import Driver, Route, Order, SimulationResult
+
+
+def _mix(value):
+    try:
+        weights = [float(x) for x in value.split(",")]
+    except ValueError:
+        weights = []
+    if len(weights) != 3 or min(weights) < 0 or not sum(weights):
+        raise CommandError("--traffic-mix takes three non-negative weights: Low,Medium,High")
+    return weights
+
+
+class Command(BaseCommand):
+    help = "Generate a reproducible synthetic dataset and import it (or write it out as CSV)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--drivers", type=int, default=50)
+        parser.add_argument("--routes", type=int, default=100)
+        parser.add_argument("--orders", type=int, default=10000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--traffic-mix", default="50,30,20", help="Route weights for Low,Medium,High")
+        parser.add_argument("--fatigue-rate", type=float, default=0.2,
+                            help="Share of drivers over the fatigue threshold yesterday")
+        parser.add_argument("--out", help="Write routes/drivers/orders.csv here instead of importing")
+        parser.add_argument("--replace", action="store_true",
+                            help="Delete all simulations, orders, routes and drivers first")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **opts):
+        if min(opts["drivers"], opts["routes"], opts["orders"]) < 0:
+            raise CommandError("Counts must not be negative.")
+        try:
+            data = synthetic.dataset(opts["drivers"], opts["routes"], opts["orders"], seed=opts["seed"],
+                                     traffic_mix=_mix(opts["traffic_mix"]),
+                                     fatigue_rate=opts["fatigue_rate"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if opts["out"]:
+            for kind, path in synthetic.write(data, opts["out"]).items():
+                self.stdout.write(f"Wrote {path}")
+            return
+
+        if opts["replace"]:
+            with transaction.atomic():
+                SimulationResult.objects.all().delete()
+                Order.objects.all().delete()
+                Route.objects.all().delete()
+                Driver.objects.all().delete()
+                versioning.bump("simulation", "order", "route", "driver")
+
+        reports = synthetic.load(data, chunk_size=opts["chunk_size"])
+        for report in reports:
+            self.stdout.write(f"{report['kind']}: {report['imported']} rows in {report['seconds']}s "
+                              f"({report['rows_per_sec']} rows/s)")
+        if opts["verbosity"] > 1:
+            self.stdout.write(json.dumps(reports, indent=2))
@@ -0,0 +1,56 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.partitioned import DEFAULT_PARTITION_MODE, PARTITION_MODES, simulate_partitioned
+from core.services import SimulationInputError, load_drivers, load_orders, parse_inputs, run_simulation
+from core.simulation import simulate
+
+
+class Command(BaseCommand):
+    help = "Run a delivery simulation against the current data without going through the API."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--drivers", type=int, required=True, help="available_drivers")
+        parser.add_argument("--max-hours", type=int, default=8, help="max_hours_per_driver")
+        parser.add_argument("--start", default="09:00", help="route_start_time (HH:MM)")
+        parser.add_argument("--strategy", default="round_robin",
+                            help="round_robin, earliest_available or least_loaded")
+        parser.add_argument("--save", action="store_true", help="Persist a SimulationResult")
+        parser.add_argument("--stream", action="store_true", help="With --save, write in batches")
+        parser.add_argument("--partitions", type=int, default=1,
+                            help="Worker processes to split the run across (1 = sequential)")
+        parser.add_argument("--partition-mode", default=DEFAULT_PARTITION_MODE, choices=PARTITION_MODES,
+                            help="rules (same results as sequential) or shards (drivers and orders split together)")
+
+    def handle(self, *args, **opts):
+        try:
+            inputs = parse_inputs({
+                "available_drivers": opts["drivers"],
+                "route_start_time": opts["start"],
+                "max_hours_per_driver": opts["max_hours"],
+                "strategy": opts["strategy"],
+                "partitions": opts["partitions"],
+                "partition_mode": opts["partition_mode"],
+            })
+        except SimulationInputError as exc:
+            raise CommandError(json.dumps(exc.payload))
+
+        t0 = time.perf_counter()
+        if opts["save"]:
+            result = run_simulation(inputs, stream=opts["stream"])
+            kpis, totals = result.kpis, result.totals
+            self.stdout.write(f"Saved SimulationResult {result.id}")
+        else:
+            args = (load_orders(), load_drivers(inputs["available_drivers"]), inputs["max_hours_per_driver"],
+                    inputs["strategy"])
+            if "partitions" in inputs:
+                _, kpis, totals = simulate_partitioned(*args, partitions=inputs["partitions"],
+                                                       mode=inputs.get("partition_mode", DEFAULT_PARTITION_MODE))
+            else:
+                _, kpis, totals = simulate(*args)
+        elapsed = time.perf_counter() - t0
+
+        self.stdout.write(json.dumps({"kpis": kpis, "totals": totals}, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Done in {elapsed:.3f}s"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = "Execute queued simulation jobs in a local process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=None,
+                            help="Worker processes (default: SIMULATION_JOB_WORKERS)")
+        parser.add_argument("--poll", type=float, default=1.0, help="Seconds between queue polls")
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is drained")
+
+    def handle(self, *args, **opts):
+        self.stdout.write("Simulation worker started")
+        try:
+            run_worker(processes=opts["processes"], poll_interval=opts["poll"],
+                       once=opts["once"], log=self.stdout.write)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Simulation worker stopped"))
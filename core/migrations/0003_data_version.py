@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:54
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_simulationjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=20, unique=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='simulationresult',
+            name='input_hash',
+            field=models.CharField(blank=True, db_index=True, help_text='hash(inputs, data version) used to reuse identical runs', max_length=64),
+        ),
+    ]
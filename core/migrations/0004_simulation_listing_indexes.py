@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_data_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='ran_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='deliveryassignment',
+            index=models.Index(fields=['simulation', 'id'], name='assignment_sim_id_idx'),
+        ),
+    ]
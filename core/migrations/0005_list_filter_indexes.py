@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_simulation_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['route', 'order_id'], name='order_route_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['value_rs', 'order_id'], name='order_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='route',
+            index=models.Index(fields=['traffic_level', 'route_id'], name='route_traffic_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:03
+
+from django.db import migrations, models
+
+
+def backfill_workload(apps, schema_editor):
+    # Historical models don't carry Driver.sync_derived(), so mirror it here.
+    Driver = apps.get_model("core", "Driver")
+    drivers = list(Driver.objects.all())
+    for d in drivers:
+        hours = [int(h) for h in d.past_week_hours or []]
+        d.last_day_hours = hours[-1] if hours else 0
+        d.is_fatigued = d.last_day_hours > 8
+        d.week_total_hours = sum(hours)
+        d.week_avg_hours = round(d.week_total_hours / len(hours), 2) if hours else 0
+    Driver.objects.bulk_update(
+        drivers, ["last_day_hours", "is_fatigued", "week_total_hours", "week_avg_hours"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='driver',
+            name='is_fatigued',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AddField(
+            model_name='driver',
+            name='last_day_hours',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='driver',
+            name='week_avg_hours',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='driver',
+            name='week_total_hours',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_workload, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_driver_workload_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deliveryassignment',
+            name='traffic_level',
+            field=models.CharField(blank=True, help_text='Route traffic when simulated', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='driver',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='route',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='simulationresult',
+            name='data_as_of',
+            field=models.DateTimeField(blank=True, help_text='Driver/Route/Order changes after this are not reflected', null=True),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import CharField, Count, F, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+def backfill_aggregates(apps, schema_editor):
+    # Mirrors core.aggregates.materialize() against the historical models.
+    SimulationResult = apps.get_model("core", "SimulationResult")
+    DeliveryAssignment = apps.get_model("core", "DeliveryAssignment")
+    SimulationAggregate = apps.get_model("core", "SimulationAggregate")
+    measures = {
+        "deliveries": Count("id"),
+        "on_time": Count("id", filter=Q(on_time=True)),
+        "profit_rs": Coalesce(Sum("profit_rs"), 0),
+        "fuel_cost_rs": Coalesce(Sum("fuel_cost_rs"), 0),
+        "penalty_rs": Coalesce(Sum("penalty_rs"), 0),
+        "bonus_rs": Coalesce(Sum("bonus_rs"), 0),
+    }
+    keys = {
+        "driver": F("driver__name"),
+        "route": Cast("order__route__route_id", CharField()),
+        "traffic": Coalesce(NullIf("traffic_level", Value("")), "order__route__traffic_level"),
+    }
+    for sim_id in SimulationResult.objects.values_list("id", flat=True).iterator():
+        assignments = DeliveryAssignment.objects.filter(simulation_id=sim_id)
+        SimulationAggregate.objects.bulk_create([
+            SimulationAggregate(simulation_id=sim_id, dimension=dimension, **row)
+            for dimension, key in keys.items()
+            for row in assignments.annotate(key=key).values("key").annotate(**measures).order_by()
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_incremental_resimulation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimulationAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('driver', 'Driver'), ('route', 'Route'), ('traffic', 'Traffic level')], max_length=10)),
+                ('key', models.CharField(help_text='Driver name, route_id or traffic level', max_length=100)),
+                ('deliveries', models.PositiveIntegerField(default=0)),
+                ('on_time', models.PositiveIntegerField(default=0)),
+                ('profit_rs', models.BigIntegerField(default=0)),
+                ('fuel_cost_rs', models.BigIntegerField(default=0)),
+                ('penalty_rs', models.BigIntegerField(default=0)),
+                ('bonus_rs', models.BigIntegerField(default=0)),
+                ('simulation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aggregates', to='core.simulationresult')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dimension', 'key'], name='aggregate_dim_key_idx')],
+                'constraints': [models.UniqueConstraint(fields=('simulation', 'dimension', 'key'), name='aggregate_sim_dim_key_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:17
+
+from django.db import migrations, models
+
+
+def backfill_kpis(apps, schema_editor):
+    # Historical models don't carry SimulationResult.sync_kpis(), so mirror it here.
+    SimulationResult = apps.get_model("core", "SimulationResult")
+    results = list(SimulationResult.objects.only("id", "kpis"))
+    for r in results:
+        kpis = r.kpis or {}
+        r.total_profit = kpis.get("total_profit", 0)
+        r.efficiency = kpis.get("efficiency", 0)
+        r.on_time_count = kpis.get("on_time", 0)
+        r.late_count = kpis.get("late", 0)
+    SimulationResult.objects.bulk_update(
+        results, ["total_profit", "efficiency", "on_time_count", "late_count"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_simulation_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='simulationresult',
+            name='efficiency',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='simulationresult',
+            name='late_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='simulationresult',
+            name='on_time_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='simulationresult',
+            name='total_profit',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='simulationresult',
+            index=models.Index(fields=['ran_at', 'total_profit', 'efficiency'], name='simulation_history_idx'),
+        ),
+        migrations.RunPython(backfill_kpis, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_simulation_kpi_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='simulationresult',
+            name='compacted_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Assignments packed into CompactedAssignments', null=True),
+        ),
+        migrations.CreateModel(
+            name='CompactedAssignments',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.BinaryField()),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('raw_bytes', models.PositiveIntegerField(default=0, help_text='Size before compression')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('simulation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='compacted_assignments', to='core.simulationresult')),
+            ],
+        ),
+    ]
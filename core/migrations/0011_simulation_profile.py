@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_compacted_assignments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='simulationresult',
+            name='profile',
+            field=models.JSONField(blank=True, help_text='Stage timings when run with profiling', null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:54
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_order_numbers(apps, schema_editor):
+    # driver_pool stays blank: such runs are recomputed from the start on
+    # their next resimulate.
+    DeliveryAssignment = apps.get_model("core", "DeliveryAssignment")
+    Order = apps.get_model("core", "Order")
+    DeliveryAssignment.objects.update(
+        order_number=Subquery(Order.objects.filter(pk=OuterRef("order_id")).values("order_id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_simulation_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deliveryassignment',
+            name='order_number',
+            field=models.PositiveIntegerField(default=0, help_text="Order.order_id when simulated (the row's position)"),
+        ),
+        migrations.AddField(
+            model_name='simulationresult',
+            name='driver_pool',
+            field=models.CharField(blank=True, help_text='hash of the driver ids the run scheduled over; see services.pool_hash', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='deliveryassignment',
+            index=models.Index(fields=['simulation', 'order_number'], name='assignment_sim_order_idx'),
+        ),
+        migrations.RunPython(backfill_order_numbers, migrations.RunPython.noop),
+    ]
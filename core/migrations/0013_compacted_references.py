@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-17 22:07
+
+import json
+import zlib
+from itertools import zip_longest
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_references(apps, schema_editor):
+    # Orders/drivers deleted while their runs were compacted are already gone;
+    # hydrate() refuses to restore those runs rather than dropping rows.
+    CompactedAssignments = apps.get_model("core", "CompactedAssignments")
+    CompactedReference = apps.get_model("core", "CompactedReference")
+    Driver = apps.get_model("core", "Driver")
+    Order = apps.get_model("core", "Order")
+    for packed in CompactedAssignments.objects.iterator():
+        columns = json.loads(zlib.decompress(bytes(packed.data)))
+        orders = Order.objects.filter(pk__in=set(columns["order_id"])).values_list("pk", flat=True)
+        drivers = Driver.objects.filter(pk__in=set(columns["driver_id"])).values_list("pk", flat=True)
+        CompactedReference.objects.bulk_create(
+            [CompactedReference(compacted=packed, order_id=o, driver_id=d)
+             for o, d in zip_longest(sorted(orders), sorted(drivers))],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_resimulation_positions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompactedReference',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('compacted', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='references', to='core.compactedassignments')),
+                ('driver', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.driver')),
+                ('order', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.order')),
+            ],
+        ),
+        migrations.RunPython(backfill_references, migrations.RunPython.noop),
+    ]
@@ -2,14 +2,38 @@ from django.db import models
 from django.utils import timezone
 from django.core.validators import MinValueValidator
 
+FATIGUE_THRESHOLD_HOURS = 8
+
 class Driver(models.Model):
     name = models.CharField(max_length=100, unique=True)
     shift_hours = models.PositiveIntegerField(validators=[MinValueValidator(0)])
     past_week_hours = models.JSONField(default=list)  
+    # Derived from past_week_hours by sync_derived(); kept as columns so they
+    # can be filtered and aggregated in SQL.
+    last_day_hours = models.PositiveIntegerField(default=0)
+    is_fatigued = models.BooleanField(default=False, db_index=True)
+    week_total_hours = models.PositiveIntegerField(default=0)
+    week_avg_hours = models.FloatField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    DERIVED_FIELDS = ["last_day_hours", "is_fatigued", "week_total_hours", "week_avg_hours"]
+
+    def sync_derived(self):
+        hours = [int(h) for h in self.past_week_hours or []]
+        self.last_day_hours = hours[-1] if hours else 0
+        self.is_fatigued = self.last_day_hours > FATIGUE_THRESHOLD_HOURS
+        self.week_total_hours = sum(hours)
+        self.week_avg_hours = round(self.week_total_hours / len(hours), 2) if hours else 0
+
+    def save(self, *args, **kwargs):
+        self.sync_derived()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "past_week_hours" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | set(self.DERIVED_FIELDS)
+        super().save(*args, **kwargs)
 
     def is_fatigued_today(self) -> bool:
-        if not self.past_week_hours: return False
-        return int(self.past_week_hours[-1]) > 8
+        return self.is_fatigued
 
     def __str__(self): return self.name
 
@@ -18,6 +42,10 @@ class Route(models.Model):
     distance_km = models.FloatField(validators=[MinValueValidator(0)])
     traffic_level = models.CharField(max_length=10, choices=[("Low","Low"),("Medium","Medium"),("High","High")])
     base_time_min = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["traffic_level", "route_id"], name="route_traffic_idx")]
 
     def __str__(self): return f"Route {self.route_id}"
 
@@ -26,14 +54,54 @@ class Order(models.Model):
     value_rs = models.PositiveIntegerField()
     route = models.ForeignKey(Route, on_delete=models.PROTECT, related_name="orders")
     delivery_time_min = models.PositiveIntegerField(help_text="Planned delivery time in minutes")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["route", "order_id"], name="order_route_idx"),
+            models.Index(fields=["value_rs", "order_id"], name="order_value_idx"),
+        ]
 
     def __str__(self): return f"Order {self.order_id}"
 
 class SimulationResult(models.Model):
-    ran_at = models.DateTimeField(default=timezone.now)
+    ran_at = models.DateTimeField(default=timezone.now, db_index=True)
     inputs = models.JSONField()
     kpis = models.JSONField()
     totals = models.JSONField(default=dict)
+    input_hash = models.CharField(max_length=64, blank=True, db_index=True,
+                                  help_text="hash(inputs, data version) used to reuse identical runs")
+    data_as_of = models.DateTimeField(null=True, blank=True,
+                                      help_text="Driver/Route/Order changes after this are not reflected")
+    # Copied out of `kpis` by sync_kpis() so history charts read indexed columns.
+    total_profit = models.BigIntegerField(default=0)
+    efficiency = models.FloatField(default=0)
+    on_time_count = models.PositiveIntegerField(default=0)
+    late_count = models.PositiveIntegerField(default=0)
+    compacted_at = models.DateTimeField(null=True, blank=True, db_index=True,
+                                        help_text="Assignments packed into CompactedAssignments")
+    profile = models.JSONField(null=True, blank=True, help_text="Stage timings when run with profiling")
+    driver_pool = models.CharField(max_length=64, blank=True,
+                                   help_text="hash of the driver ids the run scheduled over; see services.pool_hash")
+
+    KPI_FIELDS = ["total_profit", "efficiency", "on_time_count", "late_count"]
+
+    class Meta:
+        indexes = [models.Index(fields=["ran_at", "total_profit", "efficiency"], name="simulation_history_idx")]
+
+    def sync_kpis(self):
+        kpis = self.kpis or {}
+        self.total_profit = kpis.get("total_profit", 0)
+        self.efficiency = kpis.get("efficiency", 0)
+        self.on_time_count = kpis.get("on_time", 0)
+        self.late_count = kpis.get("late", 0)
+
+    def save(self, *args, **kwargs):
+        self.sync_kpis()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "kpis" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | set(self.KPI_FIELDS)
+        super().save(*args, **kwargs)
 
 class DeliveryAssignment(models.Model):
     simulation = models.ForeignKey(SimulationResult, on_delete=models.CASCADE, related_name="assignments")
@@ -46,3 +114,70 @@ class DeliveryAssignment(models.Model):
     bonus_rs = models.IntegerField(default=0)
     fuel_cost_rs = models.IntegerField(default=0)
     profit_rs = models.IntegerField(default=0)
+    traffic_level = models.CharField(max_length=10, blank=True, help_text="Route traffic when simulated")
+    order_number = models.PositiveIntegerField(default=0, help_text="Order.order_id when simulated (the row's position)")
+
+    class Meta:
+        indexes = [models.Index(fields=["simulation", "id"], name="assignment_sim_id_idx"),
+                   models.Index(fields=["simulation", "order_number"], name="assignment_sim_order_idx")]
+
+class CompactedAssignments(models.Model):
+    """A simulation's DeliveryAssignment rows as one zlib-compressed columnar blob; see core.compaction."""
+    simulation = models.OneToOneField(SimulationResult, on_delete=models.CASCADE,
+                                      related_name="compacted_assignments")
+    data = models.BinaryField()
+    row_count = models.PositiveIntegerField(default=0)
+    raw_bytes = models.PositiveIntegerField(default=0, help_text="Size before compression")
+    created_at = models.DateTimeField(default=timezone.now)
+
+class CompactedReference(models.Model):
+    """
+    An order and/or driver a CompactedAssignments blob refers to. The packed
+    rows lose their PROTECT foreign keys; these keep them, so referenced
+    orders and drivers still cannot be deleted.
+    """
+    compacted = models.ForeignKey(CompactedAssignments, on_delete=models.CASCADE, related_name="references")
+    order = models.ForeignKey(Order, on_delete=models.PROTECT, null=True, related_name="+")
+    driver = models.ForeignKey(Driver, on_delete=models.PROTECT, null=True, related_name="+")
+
+class SimulationAggregate(models.Model):
+    """Per-simulation breakdown by driver, route or traffic level; see core.aggregates."""
+    DRIVER, ROUTE, TRAFFIC = "driver", "route", "traffic"
+    DIMENSION_CHOICES = [(DRIVER, "Driver"), (ROUTE, "Route"), (TRAFFIC, "Traffic level")]
+
+    simulation = models.ForeignKey(SimulationResult, on_delete=models.CASCADE, related_name="aggregates")
+    dimension = models.CharField(max_length=10, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=100, help_text="Driver name, route_id or traffic level")
+    deliveries = models.PositiveIntegerField(default=0)
+    on_time = models.PositiveIntegerField(default=0)
+    profit_rs = models.BigIntegerField(default=0)
+    fuel_cost_rs = models.BigIntegerField(default=0)
+    penalty_rs = models.BigIntegerField(default=0)
+    bonus_rs = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["simulation", "dimension", "key"],
+                                               name="aggregate_sim_dim_key_uniq")]
+        indexes = [models.Index(fields=["dimension", "key"], name="aggregate_dim_key_idx")]
+
+class SimulationJob(models.Model):
+    QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+    STATUS_CHOICES = [(QUEUED, "Queued"), (RUNNING, "Running"), (DONE, "Done"), (FAILED, "Failed")]
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    inputs = models.JSONField()
+    stream = models.BooleanField(default=False)
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent of orders simulated")
+    result = models.ForeignKey(SimulationResult, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    error = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+class DataVersion(models.Model):
+    """Change counter per core table, bumped by save/delete signals."""
+    name = models.CharField(max_length=20, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self): return f"{self.name}@{self.version}"
@@ -0,0 +1,172 @@
+"""
+Multi-process execution of a simulation.
+
+Two partition modes:
+
+"rules" (the default) gives the same results as the sequential engine.
+Every scheduling strategy hands out orders in order_id sequence against
+shared driver state, so the (cheap, integer-only) scheduling pass stays in
+the parent. The assigned orders are then partitioned by driver shard and
+each shard's rules, rows and partial KPIs are computed in a worker process.
+Partial KPIs are sums, so merging them reproduces the sequential run
+exactly, and `partitions` is only an execution setting.
+
+"shards" splits the driver pool and the order book together: with P
+partitions, shard k holds drivers k, k+P, k+2P, ... (in id order) and orders
+k, k+P, k+2P, ... (in order_id sequence), and each shard is scheduled and run
+end to end in its own worker. A driver only serves orders of its own shard,
+which is a different dispatch plan from the sequential engine, so this mode
+and its partition count are part of the simulation inputs (and cache key).
+
+Both modes start a pool per run, spawned so workers inherit no database
+sockets.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+from core.profiling import no_stage
+from core.scheduling import DEFAULT_STRATEGY
+from core.simulation import TRAFFIC_LEVELS, Simulator, order_economics
+
+PARTITION_MODES = ("rules", "shards")
+DEFAULT_PARTITION_MODE = "rules"
+
+
+def spawn_pool(workers):
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def evaluate_partition(part):
+    """Apply the rules to one shard; returns its rows and partial KPIs."""
+    econ = order_economics(part["value_rs"], part["distance_km"], part["base_time_min"],
+                           part["traffic"], part["fatigued"])
+    fuel = [0] * len(TRAFFIC_LEVELS)
+    for t, cost in zip(part["traffic"], econ["fuel_cost_rs"]):
+        fuel[t] += cost
+    on_time = sum(econ["on_time"])
+    return {
+        "positions": part["positions"],
+        "econ": econ,
+        "partial": {
+            "total_profit": sum(econ["profit_rs"]),
+            "on_time": on_time,
+            "late": len(econ["on_time"]) - on_time,
+            "fuel_by_traffic": fuel,
+        },
+    }
+
+
+def merge_partials(sim, partials):
+    for p in partials:
+        sim.total_profit += p["total_profit"]
+        sim.on_time += p["on_time"]
+        sim.late += p["late"]
+        sim.fuel_by_traffic = [a + b for a, b in zip(sim.fuel_by_traffic, p["fuel_by_traffic"])]
+
+
+class PartitionedSimulator(Simulator):
+    """
+    Simulator whose rules run in `pool` across `partitions` driver shards
+    (partition mode "rules"). Scheduling, feed() chunking, replay() and the
+    results are those of Simulator.
+    """
+
+    def __init__(self, drivers, max_hours_per_driver, strategy=DEFAULT_STRATEGY, pool=None, partitions=2):
+        super().__init__(drivers, max_hours_per_driver, strategy)
+        self.pool = pool
+        self.partitions = partitions
+
+    def feed(self, orders, stage=no_stage):
+        base_time = list(orders["base_time_min"])
+        with stage("schedule"):
+            chosen, starts = self.schedule(base_time)
+        with stage("rules"):
+            shards = [[] for _ in range(self.partitions)]
+            for pos, idx in enumerate(chosen):
+                shards[idx % self.partitions].append(pos)
+            parts = [
+                {
+                    "positions": positions,
+                    "value_rs": [orders["value_rs"][i] for i in positions],
+                    "distance_km": [orders["distance_km"][i] for i in positions],
+                    "base_time_min": [base_time[i] for i in positions],
+                    "traffic": [orders["traffic"][i] for i in positions],
+                    "fatigued": [self.fatigued[chosen[i]] for i in positions],
+                }
+                for positions in shards if positions
+            ]
+            if self.pool is not None and len(parts) > 1:
+                results = list(self.pool.map(evaluate_partition, parts))
+            else:
+                results = [evaluate_partition(p) for p in parts]
+
+            n = len(chosen)
+            batch = {
+                "order": list(orders["id"][:n]),
+                "driver": [self.driver_ids[idx] for idx in chosen],
+                "traffic": list(orders["traffic"][:n]),
+                "start_min": starts,
+            }
+            for column in ("duration_min", "on_time", "penalty_rs", "bonus_rs", "fuel_cost_rs", "profit_rs"):
+                merged = [None] * n
+                for res in results:
+                    for pos, value in zip(res["positions"], res["econ"][column]):
+                        merged[pos] = value
+                batch[column] = merged
+            merge_partials(self, [res["partial"] for res in results])
+        return batch
+
+
+def shard(columns, k, partitions):
+    return {key: values[k::partitions] for key, values in columns.items()}
+
+
+def simulate_shard(task):
+    """Run one shard; returns its assignment columns and partial KPIs."""
+    orders, drivers, max_hours_per_driver, strategy = task
+    sim = Simulator(drivers, max_hours_per_driver, strategy)
+    batch = sim.feed(orders)
+    if "number" in orders:
+        batch["number"] = list(orders["number"][:len(batch["order"])])
+    return batch, {
+        "total_profit": sim.total_profit,
+        "on_time": sim.on_time,
+        "late": sim.late,
+        "fuel_by_traffic": sim.fuel_by_traffic,
+    }
+
+
+def run_partitioned(orders, drivers, max_hours_per_driver, strategy=DEFAULT_STRATEGY, partitions=2,
+                    stage=no_stage):
+    """
+    Partition mode "shards". Returns (assignment columns, Simulator holding
+    the merged KPIs). Rows are grouped by shard. Shards never outnumber
+    drivers.
+    """
+    partitions = max(1, min(partitions, len(drivers["id"])))
+    tasks = [(shard(orders, k, partitions), shard(drivers, k, partitions), max_hours_per_driver, strategy)
+             for k in range(partitions)]
+    with stage("partitions"):
+        if partitions == 1:
+            results = [simulate_shard(tasks[0])]
+        else:
+            with spawn_pool(partitions) as pool:
+                results = list(pool.map(simulate_shard, tasks))
+
+    merged = Simulator(drivers, max_hours_per_driver, strategy)
+    merge_partials(merged, [partial for _, partial in results])
+    batch = {key: list(chain.from_iterable(b[key] for b, _ in results)) for key in results[0][0]}
+    return batch, merged
+
+
+def simulate_partitioned(orders, drivers, max_hours_per_driver, strategy=DEFAULT_STRATEGY, partitions=2,
+                         mode=DEFAULT_PARTITION_MODE):
+    """Same contract as core.simulation.simulate(), split into `partitions` worker processes."""
+    if mode == "shards":
+        batch, sim = run_partitioned(orders, drivers, max_hours_per_driver, strategy, partitions)
+        return batch, sim.kpis(), sim.totals()
+    with spawn_pool(partitions) as pool:
+        sim = PartitionedSimulator(drivers, max_hours_per_driver, strategy, pool, partitions)
+        batch = sim.feed(orders)
+    return batch, sim.kpis(), sim.totals()
@@ -0,0 +1,20 @@
+"""
+Process pools for simulation work.
+
+Workers are spawned rather than forked: a forked child inherits the parent's
+database sockets and, on Postgres, closing them terminates the parent's
+session. This module must not import models, since spawned children load it
+before Django is set up.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def init_worker():
+    import django
+    django.setup()
+
+
+def executor(max_workers):
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                               mp_context=multiprocessing.get_context("spawn"))
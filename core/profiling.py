@@ -0,0 +1,85 @@
+"""
+Stage-level profiling of a simulation run.
+
+Code that supports profiling takes a `stage` callable and wraps each phase
+in `with stage("name"):`. The default, no_stage, costs nothing. A
+StageProfiler's stage() records wall time, calls and SQL queries per stage
+name (repeated stages, e.g. once per streamed chunk, are summed) and can run
+cProfile over the whole run. Use it as a context manager: cProfile is only
+enabled inside the `with` block and is disabled on exit even if the run
+raises, so it never stays attached to the thread.
+"""
+import cProfile
+import io
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+
+from django.db import connection
+
+CPROFILE_TOP = 30
+
+
+def no_stage(name):
+    return nullcontext()
+
+
+class StageProfiler:
+    def __init__(self, cprofile=False):
+        self.stages = {}  # name -> {"seconds", "queries", "calls"}
+        self.started = time.perf_counter()
+        self.finished = None
+        self._profile = cProfile.Profile() if cprofile else None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        if self._profile:
+            self._profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.finished = time.perf_counter()
+        if self._profile:
+            self._profile.disable()
+        return False
+
+    @contextmanager
+    def stage(self, name):
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(count):
+                yield
+        finally:
+            entry = self.stages.setdefault(name, {"seconds": 0.0, "queries": 0, "calls": 0})
+            entry["seconds"] += time.perf_counter() - started
+            entry["queries"] += queries
+            entry["calls"] += 1
+
+    def summary(self):
+        """JSON-serializable report of the (finished) `with` block."""
+        total = (self.finished or time.perf_counter()) - self.started
+        cprofile = None
+        if self._profile:
+            out = io.StringIO()
+            pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(CPROFILE_TOP)
+            cprofile = out.getvalue()
+            self._profile = None
+        tracked = sum(s["seconds"] for s in self.stages.values())
+        return {
+            "total_seconds": round(total, 4),
+            "untracked_seconds": round(max(total - tracked, 0), 4),
+            "total_queries": sum(s["queries"] for s in self.stages.values()),
+            "stages": [
+                {"name": name, "seconds": round(s["seconds"], 4), "queries": s["queries"], "calls": s["calls"],
+                 "share": round(s["seconds"] / total, 4) if total else 0}
+                for name, s in self.stages.items()
+            ],
+            "cprofile": cprofile,
+        }
@@ -0,0 +1,64 @@
+"""
+Driver selection strategies for the simulation engine.
+
+A scheduler hands out driver indices one order at a time. `pick()` removes the
+chosen driver from the pool and `assigned()` puts it back (unless it is now
+over its limit), so every assignment costs O(1) or O(log drivers).
+"""
+import heapq
+from collections import deque
+
+
+class RoundRobinScheduler:
+    """Cycles through drivers in order, skipping ones that hit max minutes (the original behaviour)."""
+
+    def __init__(self, n_drivers, max_minutes):
+        self.max_minutes = max_minutes
+        self.queue = deque(range(n_drivers)) if max_minutes > 0 else deque()
+
+    def pick(self):
+        return self.queue.popleft() if self.queue else None
+
+    def assigned(self, idx, minutes_used):
+        if minutes_used < self.max_minutes:
+            self.queue.append(idx)
+
+
+class EarliestAvailableScheduler:
+    """Gives each order to the driver who becomes free first (fewest minutes booked)."""
+
+    def __init__(self, n_drivers, max_minutes):
+        self.max_minutes = max_minutes
+        self.heap = [(0, idx) for idx in range(n_drivers)] if max_minutes > 0 else []
+
+    def pick(self):
+        return heapq.heappop(self.heap)[1] if self.heap else None
+
+    def assigned(self, idx, minutes_used):
+        if minutes_used < self.max_minutes:
+            heapq.heappush(self.heap, (minutes_used, idx))
+
+
+class LeastLoadedScheduler:
+    """Gives each order to the driver with the fewest orders so far (ties: fewest minutes)."""
+
+    def __init__(self, n_drivers, max_minutes):
+        self.max_minutes = max_minutes
+        self.counts = [0] * n_drivers
+        self.heap = [(0, 0, idx) for idx in range(n_drivers)] if max_minutes > 0 else []
+
+    def pick(self):
+        return heapq.heappop(self.heap)[2] if self.heap else None
+
+    def assigned(self, idx, minutes_used):
+        self.counts[idx] += 1
+        if minutes_used < self.max_minutes:
+            heapq.heappush(self.heap, (self.counts[idx], minutes_used, idx))
+
+
+SCHEDULERS = {
+    "round_robin": RoundRobinScheduler,
+    "earliest_available": EarliestAvailableScheduler,
+    "least_loaded": LeastLoadedScheduler,
+}
+DEFAULT_STRATEGY = "round_robin"
@@ -0,0 +1,344 @@
+import hashlib
+import json
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core import versioning
+from core.aggregates import materialize
+from core.cache import LRUCache
+from core.models import Driver, Order, SimulationResult, DeliveryAssignment
+from core.partitioned import (DEFAULT_PARTITION_MODE, PARTITION_MODES, PartitionedSimulator, run_partitioned,
+                              spawn_pool)
+from core.profiling import no_stage
+from core.scheduling import DEFAULT_STRATEGY, SCHEDULERS
+from core.simulation import TRAFFIC_CODES, TRAFFIC_LEVELS, Simulator
+
+# hash(inputs, data version) -> SimulationResult id
+result_cache = LRUCache(getattr(settings, "SIMULATION_CACHE_SIZE", 256))
+
+
+class SimulationInputError(ValueError):
+    """Invalid simulation inputs; `payload` is the 400 response body."""
+
+    def __init__(self, payload):
+        super().__init__(payload.get("error"))
+        self.payload = payload
+
+
+def parse_inputs(data):
+    try:
+        available_drivers = int(data.get("available_drivers"))
+        route_start_time = data.get("route_start_time", "09:00")
+        max_hours_per_driver = int(data.get("max_hours_per_driver"))
+    except (ValueError, TypeError):
+        raise SimulationInputError({"error": "Invalid parameter types."})
+
+    if available_drivers <= 0 or max_hours_per_driver <= 0:
+        raise SimulationInputError(
+            {"error": "available_drivers and max_hours_per_driver must be positive."}
+        )
+
+    total_drivers_count = Driver.objects.count()
+    if available_drivers > total_drivers_count:
+        raise SimulationInputError({
+            "error": "available_drivers exceeds total drivers in database",
+            "requested": available_drivers,
+            "available_in_db": total_drivers_count
+        })
+
+    try:
+        route_start_time = parse_hhmm(route_start_time)
+    except ValueError:
+        raise SimulationInputError({"error": "route_start_time must be HH:MM format"})
+
+    inputs = {
+        "available_drivers": available_drivers,
+        "route_start_time": route_start_time,
+        "max_hours_per_driver": max_hours_per_driver,
+        "strategy": parse_strategy(data),
+    }
+    partitions = parse_partitions(data)
+    mode = parse_partition_mode(data)
+    if partitions > 1:
+        # Only stored when used, so sequential runs keep their inputs.
+        inputs["partitions"] = partitions
+        if mode != DEFAULT_PARTITION_MODE:
+            inputs["partition_mode"] = mode
+    return inputs
+
+
+def parse_hhmm(value):
+    """Normalize a time of day to "HH:MM"; ValueError if it is not one."""
+    h, m = map(int, str(value).split(":"))
+    if not (0 <= h < 24 and 0 <= m < 60):
+        raise ValueError
+    return f"{h:02d}:{m:02d}"
+
+
+def parse_partitions(data):
+    """Worker processes to split the run across (see core.partitioned); defaults to SIMULATION_PARTITIONS."""
+    limit = getattr(settings, "SIMULATION_MAX_PARTITIONS", 16)
+    error = SimulationInputError({"error": f"partitions must be an integer between 1 and {limit}."})
+    raw = data.get("partitions")
+    if raw in (None, ""):
+        raw = getattr(settings, "SIMULATION_PARTITIONS", 1)
+    # Coerced like the other fields (forms send strings), but never from a
+    # bool or a fractional number.
+    if isinstance(raw, bool) or (isinstance(raw, float) and not raw.is_integer()):
+        raise error
+    try:
+        partitions = int(raw)
+    except (TypeError, ValueError):
+        raise error
+    if not 1 <= partitions <= limit:
+        raise error
+    return partitions
+
+
+def parse_partition_mode(data):
+    mode = data.get("partition_mode") or DEFAULT_PARTITION_MODE
+    if not isinstance(mode, str) or mode not in PARTITION_MODES:
+        raise SimulationInputError({
+            "error": "Unknown partition_mode.",
+            "choices": list(PARTITION_MODES),
+        })
+    return mode
+
+
+def parse_strategy(data):
+    strategy = data.get("strategy") or DEFAULT_STRATEGY
+    if not isinstance(strategy, str) or strategy not in SCHEDULERS:
+        raise SimulationInputError({
+            "error": "Unknown strategy.",
+            "choices": sorted(SCHEDULERS),
+        })
+    return strategy
+
+
+def start_datetime(route_start_time, day=None):
+    start_hour, start_minute = map(int, route_start_time.split(":"))
+    return (day or timezone.now()).replace(hour=start_hour, minute=start_minute, second=0, microsecond=0)
+
+
+def load_drivers(available_drivers):
+    rows = Driver.objects.order_by("id").values_list("id", "is_fatigued")[:available_drivers]
+    drivers = {"id": [], "fatigued": []}
+    for pk, fatigued in rows:
+        drivers["id"].append(pk)
+        drivers["fatigued"].append(fatigued)
+    return drivers
+
+
+def pool_hash(driver_ids):
+    return hashlib.sha256(",".join(map(str, driver_ids)).encode()).hexdigest()
+
+
+def order_columns(rows):
+    # "number" (order_id) is not used by the engine; it is stored on each
+    # assignment so the run's order sequence survives renumbering.
+    orders = {"id": [], "number": [], "value_rs": [], "distance_km": [], "base_time_min": [], "traffic": []}
+    for pk, number, value, km, base, traffic in rows:
+        orders["id"].append(pk)
+        orders["number"].append(number)
+        orders["value_rs"].append(value)
+        orders["distance_km"].append(km)
+        orders["base_time_min"].append(base)
+        orders["traffic"].append(TRAFFIC_CODES[traffic])
+    return orders
+
+
+def order_rows():
+    return Order.objects.order_by("order_id").values_list(
+        "id", "order_id", "value_rs", "route__distance_km", "route__base_time_min", "route__traffic_level"
+    )
+
+
+def load_orders():
+    return order_columns(order_rows())
+
+
+def iter_order_chunks(chunk_size):
+    chunk = []
+    for row in order_rows().iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield order_columns(chunk)
+            chunk = []
+    if chunk:
+        yield order_columns(chunk)
+
+
+def assignment_objects(sim_result, batch, start):
+    return [
+        DeliveryAssignment(
+            simulation=sim_result,
+            order_id=order,
+            driver_id=driver,
+            planned_start=start + timedelta(minutes=start_min),
+            planned_duration_min=duration,
+            on_time=on_time,
+            penalty_rs=penalty,
+            bonus_rs=bonus,
+            fuel_cost_rs=fuel,
+            profit_rs=profit,
+            traffic_level=TRAFFIC_LEVELS[traffic],
+            order_number=number,
+        )
+        for order, driver, start_min, duration, on_time, penalty, bonus, fuel, profit, traffic, number in zip(
+            batch["order"], batch["driver"], batch["start_min"], batch["duration_min"],
+            batch["on_time"], batch["penalty_rs"], batch["bonus_rs"], batch["fuel_cost_rs"],
+            batch["profit_rs"], batch["traffic"], batch["number"],
+        )
+    ]
+
+
+def feed_orders(sim, orders, stage=no_stage):
+    """Simulator.feed() plus the order numbers for assignment_objects()."""
+    batch = sim.feed(orders, stage)
+    batch["number"] = list(orders["number"][:len(batch["order"])])
+    return batch
+
+
+def _column_chunks(columns, chunk_size):
+    n = len(next(iter(columns.values())))
+    for i in range(0, n, chunk_size):
+        yield {key: values[i:i + chunk_size] for key, values in columns.items()}
+
+
+def run_simulation(inputs, stream=False, progress=None, input_hash="", profiler=None):
+    """
+    Run and persist a simulation for already-validated `inputs`.
+
+    By default the engine runs before the transaction is opened and only the
+    inserts happen inside it. With `stream`, orders are read and written in
+    SIMULATION_BULK_BATCH_SIZE chunks so memory stays bounded. Either way the
+    result and its assignments commit together.
+
+    `progress(done, total)` is called after every simulated chunk; in stream
+    mode that happens inside the open transaction.
+
+    With inputs["partitions"] > 1 the rules run in that many worker processes
+    (core.partitioned) with the same results. With partition_mode "shards"
+    drivers and orders are split into shards that are each simulated end to
+    end in a worker instead; all orders are then loaded at once and `stream`
+    does not apply.
+
+    A core.profiling.StageProfiler in `profiler` times each stage.
+    """
+    stage = profiler.stage if profiler else no_stage
+    batch_size = getattr(settings, "SIMULATION_BULK_BATCH_SIZE", 1000)
+    data_as_of = timezone.now()
+    start = start_datetime(inputs["route_start_time"])
+    with stage("load_drivers"):
+        drivers = load_drivers(inputs["available_drivers"])
+    strategy = inputs.get("strategy", DEFAULT_STRATEGY)
+    partitions = inputs.get("partitions", 1)
+    sharded = inputs.get("partition_mode") == "shards"
+    pool = spawn_pool(partitions) if partitions > 1 and not sharded else None
+    if pool is not None:
+        sim = PartitionedSimulator(drivers, inputs["max_hours_per_driver"], strategy, pool, partitions)
+    else:
+        sim = Simulator(drivers, inputs["max_hours_per_driver"], strategy)
+    total = Order.objects.count() if progress else 0
+    done = 0
+
+    def simulated(chunks):
+        nonlocal done
+        chunks = iter(chunks)
+        while True:
+            with stage("load_orders"):
+                orders = next(chunks, None)
+            if orders is None:
+                return
+            batch = feed_orders(sim, orders, stage)
+            done += len(orders["id"])
+            if progress:
+                progress(done, total)
+            yield batch
+            if sim.exhausted:
+                if progress:
+                    progress(total, total)
+                return
+
+    # In stream mode the chunks are simulated while the rows are written, so
+    # the pool stays up until the transaction is done.
+    with pool or nullcontext():
+        if sharded:
+            with stage("load_orders"):
+                orders = load_orders()
+            batch, sim = run_partitioned(orders, drivers, inputs["max_hours_per_driver"], strategy, partitions,
+                                         stage)
+            batches = list(_column_chunks(batch, batch_size))
+            if progress:
+                progress(total, total)
+        elif stream:
+            batches = simulated(iter_order_chunks(batch_size))
+        else:
+            with stage("load_orders"):
+                orders = load_orders()
+            batches = list(simulated(_column_chunks(orders, batch_size)))
+
+        with transaction.atomic():
+            sim_result = SimulationResult.objects.create(
+                ran_at=timezone.now(), inputs=inputs, kpis={}, totals={}, input_hash=input_hash,
+                data_as_of=data_as_of, driver_pool=pool_hash(drivers["id"])
+            )
+            for batch in batches:
+                with stage("insert"):
+                    DeliveryAssignment.objects.bulk_create(
+                        assignment_objects(sim_result, batch, start), batch_size=batch_size
+                    )
+
+            sim_result.kpis = sim.kpis()
+            sim_result.totals = sim.totals()
+            sim_result.save(update_fields=["kpis", "totals"])
+            with stage("aggregates"):
+                materialize(sim_result)
+    return sim_result
+
+
+def input_hash(inputs, day=None):
+    """
+    Content address of a run: its inputs, the Driver/Route/Order versions and
+    the day its planned_start values are anchored to (default today). A
+    "rules" partition count does not change the results and is left out.
+    """
+    if "partition_mode" not in inputs:
+        inputs = {name: value for name, value in inputs.items() if name != "partitions"}
+    key = {
+        "inputs": inputs,
+        "data": versioning.current(),
+        "day": (day or timezone.now()).date().isoformat(),
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def find_cached(key):
+    result_id = result_cache.get(key)
+    if result_id is not None:
+        result = SimulationResult.objects.filter(pk=result_id, input_hash=key).first()
+        if result is not None:
+            return result
+        result_cache.discard(key)
+    # Another worker process may have produced it.
+    result = SimulationResult.objects.filter(input_hash=key).order_by("-ran_at").first()
+    if result is not None:
+        result_cache.record_fallback_hit()
+        result_cache.put(key, result.pk)
+    return result
+
+
+def cached_simulation(inputs, stream=False, progress=None, refresh=False, profiler=None):
+    """Return (result, hit), reusing an identical earlier run unless `refresh`."""
+    key = input_hash(inputs)
+    if not refresh:
+        result = find_cached(key)
+        if result is not None:
+            return result, True
+    result = run_simulation(inputs, stream=stream, progress=progress, input_hash=key, profiler=profiler)
+    result_cache.put(key, result.pk)
+    return result, False
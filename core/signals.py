@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+
+from core.models import Driver, Route, Order, SimulationResult
+from core.versioning import bump
+
+VERSIONED_MODELS = {Driver: "driver", Route: "route", Order: "order", SimulationResult: "simulation"}
+
+
+def bump_data_version(sender, **kwargs):
+    bump(VERSIONED_MODELS[sender])
+
+
+def connect():
+    for model in VERSIONED_MODELS:
+        post_save.connect(bump_data_version, sender=model, dispatch_uid=f"version-{model.__name__}-save")
+        post_delete.connect(bump_data_version, sender=model, dispatch_uid=f"version-{model.__name__}-delete")
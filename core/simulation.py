@@ -0,0 +1,161 @@
+"""
+Columnar simulation engine.
+
+Works on plain parallel lists (one entry per order / per driver) so it can be
+driven from views, management commands or tests without touching the ORM.
+"""
+
+from core.profiling import no_stage
+from core.scheduling import DEFAULT_STRATEGY, SCHEDULERS
+
+TRAFFIC_LEVELS = ("Low", "Medium", "High")
+TRAFFIC_CODES = {level: code for code, level in enumerate(TRAFFIC_LEVELS)}
+HIGH = TRAFFIC_CODES["High"]
+
+FATIGUE_FACTOR = 1.3          # Company Rule 2: fatigued drivers are 30% slower
+LATE_GRACE_MIN = 10           # Company Rule 1: late if > base time + 10 min
+LATE_PENALTY_RS = 50
+FUEL_RS_PER_KM = 5            # Company Rule 4: base fuel cost
+HIGH_TRAFFIC_RS_PER_KM = 2    #                 + surcharge in High traffic
+HIGH_VALUE_THRESHOLD_RS = 1000
+HIGH_VALUE_BONUS_RATE = 0.10  # Company Rule 3
+
+ASSIGNMENT_COLUMNS = ("order", "driver", "traffic", "start_min", "duration_min", "on_time",
+                      "penalty_rs", "bonus_rs", "fuel_cost_rs", "profit_rs")
+
+
+def durations(base_time_min, fatigued):
+    return [int(round(b * FATIGUE_FACTOR)) if f else b for b, f in zip(base_time_min, fatigued)]
+
+
+def order_economics(value_rs, distance_km, base_time_min, traffic, fatigued):
+    """Apply the company rules to whole columns at once."""
+    duration = durations(base_time_min, fatigued)
+    on_time = [d <= b + LATE_GRACE_MIN for d, b in zip(duration, base_time_min)]
+    penalty = [0 if ok else LATE_PENALTY_RS for ok in on_time]
+    fuel = [
+        int(round(km * FUEL_RS_PER_KM + km * HIGH_TRAFFIC_RS_PER_KM if t == HIGH else km * FUEL_RS_PER_KM))
+        for km, t in zip(distance_km, traffic)
+    ]
+    bonus = [
+        int(round(v * HIGH_VALUE_BONUS_RATE)) if ok and v > HIGH_VALUE_THRESHOLD_RS else 0
+        for v, ok in zip(value_rs, on_time)
+    ]
+    profit = [v + b - p - f for v, b, p, f in zip(value_rs, bonus, penalty, fuel)]
+    return {
+        "duration_min": duration,
+        "on_time": on_time,
+        "penalty_rs": penalty,
+        "bonus_rs": bonus,
+        "fuel_cost_rs": fuel,
+        "profit_rs": profit,
+    }
+
+
+class Simulator:
+    """
+    Assigns orders to drivers and accumulates KPIs.
+
+    `orders` columns: id, value_rs, distance_km, base_time_min, traffic (code).
+    `drivers` columns: id, fatigued.
+    `strategy` names a scheduler from core.scheduling.
+    `feed()` may be called repeatedly with consecutive chunks of orders; driver
+    time and KPIs carry over between calls.
+    """
+
+    def __init__(self, drivers, max_hours_per_driver, strategy=DEFAULT_STRATEGY):
+        self.driver_ids = list(drivers["id"])
+        self.fatigued = list(drivers["fatigued"])
+        self.max_minutes = max_hours_per_driver * 60
+        self.minutes_used = [0] * len(self.driver_ids)
+        self.scheduler = SCHEDULERS[strategy](len(self.driver_ids), self.max_minutes)
+        self.exhausted = not self.driver_ids
+        self.total_profit = 0
+        self.on_time = 0
+        self.late = 0
+        self.fuel_by_traffic = [0] * len(TRAFFIC_LEVELS)
+
+    def schedule(self, base_time_min):
+        """Hand orders to drivers via the scheduler; returns (driver_idx, start_min) columns."""
+        rested = base_time_min
+        tired = durations(base_time_min, [True] * len(base_time_min))
+        chosen, starts = [], []
+        if self.exhausted:
+            return chosen, starts
+        pick, assigned, minutes, fatigued = (self.scheduler.pick, self.scheduler.assigned,
+                                             self.minutes_used, self.fatigued)
+        for i in range(len(base_time_min)):
+            idx = pick()
+            if idx is None:
+                self.exhausted = True
+                break
+            chosen.append(idx)
+            starts.append(minutes[idx])
+            minutes[idx] += tired[i] if fatigued[idx] else rested[i]
+            assigned(idx, minutes[idx])
+        return chosen, starts
+
+    def replay(self, driver_ids, durations_min):
+        """
+        Rebuild scheduler state from previously stored assignments without
+        re-running the rules or touching KPIs. Returns False if the scheduler
+        would not have made the same choices.
+        """
+        position = {pk: idx for idx, pk in enumerate(self.driver_ids)}
+        for pk, duration in zip(driver_ids, durations_min):
+            idx = self.scheduler.pick()
+            if idx is None or idx != position.get(pk):
+                return False
+            self.minutes_used[idx] += duration
+            self.scheduler.assigned(idx, self.minutes_used[idx])
+        return True
+
+    def feed(self, orders, stage=no_stage):
+        base_time = list(orders["base_time_min"])
+        with stage("schedule"):
+            chosen, starts = self.schedule(base_time)
+        with stage("rules"):
+            n = len(chosen)
+            traffic = list(orders["traffic"][:n])
+            econ = order_economics(
+                orders["value_rs"][:n], orders["distance_km"][:n], base_time[:n], traffic,
+                [self.fatigued[idx] for idx in chosen],
+            )
+            batch = {
+                "order": list(orders["id"][:n]),
+                "driver": [self.driver_ids[idx] for idx in chosen],
+                "traffic": traffic,
+                "start_min": starts,
+                **econ,
+            }
+            self._accumulate(batch)
+        return batch
+
+    def _accumulate(self, batch):
+        on_time = sum(batch["on_time"])
+        self.on_time += on_time
+        self.late += len(batch["on_time"]) - on_time
+        self.total_profit += sum(batch["profit_rs"])
+        for t, fuel in zip(batch["traffic"], batch["fuel_cost_rs"]):
+            self.fuel_by_traffic[t] += fuel
+
+    def kpis(self):
+        # Company Rule 6: Efficiency
+        total = self.on_time + self.late
+        efficiency = (self.on_time / total * 100) if total else 0
+        return {
+            "total_profit": self.total_profit,
+            "efficiency": round(efficiency, 2),
+            "on_time": self.on_time,
+            "late": self.late,
+        }
+
+    def totals(self):
+        return {"fuel_by_traffic": dict(zip(TRAFFIC_LEVELS, self.fuel_by_traffic))}
+
+
+def simulate(orders, drivers, max_hours_per_driver, strategy=DEFAULT_STRATEGY):
+    """One-shot run; returns (assignment columns, kpis, totals)."""
+    sim = Simulator(drivers, max_hours_per_driver, strategy)
+    batch = sim.feed(orders)
+    return batch, sim.kpis(), sim.totals()
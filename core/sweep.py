@@ -0,0 +1,135 @@
+"""
+Parameter sweeps over the simulation inputs.
+
+Each grid point is evaluated with the columnar engine, spread over a process
+pool that is created for the sweep and shut down when it finishes (its size
+is capped by SIMULATION_SWEEP_WORKERS), so web workers hold no idle pools.
+No SimulationResult or DeliveryAssignment rows are written.
+"""
+import os
+from itertools import product
+
+from django.conf import settings
+
+from core.models import Driver
+from core.procpool import executor
+from core.services import SimulationInputError, load_drivers, load_orders, parse_hhmm, parse_strategy
+from core.simulation import simulate
+
+SWEEP_COLUMNS = ["available_drivers", "max_hours_per_driver", "route_start_time",
+                 "total_profit", "efficiency", "on_time", "late"]
+
+
+def max_points():
+    return getattr(settings, "SIMULATION_SWEEP_MAX_POINTS", 1000)
+
+
+def expand(name, spec, cast=int):
+    """Accept a scalar, a list of values, or {"start", "stop", "step"} (stop inclusive)."""
+    try:
+        if isinstance(spec, dict):
+            start, stop, step = cast(spec["start"]), cast(spec["stop"]), cast(spec.get("step", 1))
+            if step <= 0:
+                raise ValueError
+            values = range(start, stop + 1, step)
+        elif isinstance(spec, (list, tuple)):
+            return [cast(v) for v in spec]
+        else:
+            return [cast(spec)]
+    except (KeyError, TypeError, ValueError):
+        raise SimulationInputError({"error": f"Invalid range for {name}."})
+    # Range values are distinct, so one axis alone can exceed the cap; check
+    # before materializing anything.
+    if len(values) > max_points():
+        raise SimulationInputError({"error": f"Sweep grid exceeds {max_points()} points."})
+    return list(values)
+
+
+def parse_grid(data):
+    drivers = expand("available_drivers", data.get("available_drivers"))
+    hours = expand("max_hours_per_driver", data.get("max_hours_per_driver"))
+    starts = data.get("route_start_time", "09:00")
+    try:
+        starts = [parse_hhmm(s) for s in (starts if isinstance(starts, (list, tuple)) else [starts])]
+    except (ValueError, TypeError):
+        raise SimulationInputError({"error": "route_start_time must be HH:MM format"})
+
+    if not drivers or not hours or min(drivers) <= 0 or min(hours) <= 0:
+        raise SimulationInputError(
+            {"error": "available_drivers and max_hours_per_driver must be positive."}
+        )
+    total_drivers_count = Driver.objects.count()
+    if max(drivers) > total_drivers_count:
+        raise SimulationInputError({
+            "error": "available_drivers exceeds total drivers in database",
+            "requested": max(drivers),
+            "available_in_db": total_drivers_count
+        })
+    drivers, hours, starts = sorted(set(drivers)), sorted(set(hours)), sorted(set(starts))
+    if len(drivers) * len(hours) * len(starts) > max_points():
+        raise SimulationInputError({"error": f"Sweep grid exceeds {max_points()} points."})
+    return drivers, hours, starts, parse_strategy(data)
+
+
+def pool_size():
+    return getattr(settings, "SIMULATION_SWEEP_WORKERS", None) or min(os.cpu_count() or 1, 4)
+
+
+def _evaluate(task):
+    """KPIs for a list of (drivers, hours) points against one set of inputs."""
+    orders, all_drivers, strategy, points = task
+    results = []
+    for n, hours in points:
+        drivers = {key: values[:n] for key, values in all_drivers.items()}
+        results.append(simulate(orders, drivers, hours, strategy)[1])
+    return results
+
+
+def pareto_front(rows, profit_idx, efficiency_idx):
+    """Indices of rows not dominated on (total_profit, efficiency)."""
+    ranked = sorted(range(len(rows)),
+                    key=lambda i: (-rows[i][profit_idx], -rows[i][efficiency_idx]))
+    front, last = [], None
+    for i in ranked:
+        point = (rows[i][profit_idx], rows[i][efficiency_idx])
+        if last is None or point[1] > last[1] or point == last:
+            front.append(i)
+            last = point
+    return sorted(front)
+
+
+def run_sweep(drivers, hours, starts, strategy):
+    """
+    Evaluate every (available_drivers, max_hours_per_driver, route_start_time).
+
+    The start time only shifts planned_start, so KPIs are computed once per
+    (drivers, hours) pair and shared across start times.
+    """
+    orders = load_orders()
+    all_drivers = load_drivers(max(drivers))
+    points = list(product(drivers, hours))
+    workers = min(pool_size(), len(points))
+
+    if workers <= 1:
+        results = _evaluate((orders, all_drivers, strategy, points))
+    else:
+        # One task per worker (interleaved so cheap and expensive points mix);
+        # the inputs are shipped once per task rather than once per point.
+        tasks = [(orders, all_drivers, strategy, points[i::workers]) for i in range(workers)]
+        results = [None] * len(points)
+        with executor(workers) as pool:
+            for i, chunk in enumerate(pool.map(_evaluate, tasks)):
+                results[i::workers] = chunk
+
+    rows = [
+        [n, h, start, k["total_profit"], k["efficiency"], k["on_time"], k["late"]]
+        for (n, h), k in zip(points, results)
+        for start in starts
+    ]
+    return {
+        "strategy": strategy,
+        "columns": SWEEP_COLUMNS,
+        "rows": rows,
+        "pareto_front": pareto_front(rows, SWEEP_COLUMNS.index("total_profit"),
+                                     SWEEP_COLUMNS.index("efficiency")),
+    }
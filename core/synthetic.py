@@ -0,0 +1,91 @@
+"""
+Reproducible synthetic datasets for load testing.
+
+Rows are produced as CSV lines in the same format as the samples in
+core/data/, so a dataset can be written to disk or fed straight through the
+chunked upsert in core.importing. Every kind has its own seeded generator:
+the same seed and sizes always give the same rows.
+"""
+import csv
+import io
+import random
+from pathlib import Path
+
+from core.importing import IMPORT_ORDER, import_csv
+from core.simulation import TRAFFIC_LEVELS
+
+DEFAULT_TRAFFIC_MIX = (0.5, 0.3, 0.2)  # Low, Medium, High
+MIN_PER_KM = {"Low": 3, "Medium": 4, "High": 5}
+HEADERS = {
+    "routes": ["route_id", "distance_km", "traffic_level", "base_time_min"],
+    "drivers": ["name", "shift_hours", "past_week_hours"],
+    "orders": ["order_id", "value_rs", "route_id", "delivery_time"],
+}
+
+
+def _rng(seed, kind):
+    return random.Random(f"{seed}:{kind}")
+
+
+def route_rows(n, seed, traffic_mix=DEFAULT_TRAFFIC_MIX):
+    rng = _rng(seed, "routes")
+    for route_id in range(1, n + 1):
+        km = round(rng.uniform(2, 40), 1)
+        traffic = rng.choices(TRAFFIC_LEVELS, weights=traffic_mix)[0]
+        yield [route_id, km, traffic, max(1, int(km * MIN_PER_KM[traffic] * rng.uniform(0.8, 1.2)))]
+
+
+def driver_rows(n, seed, fatigue_rate=0.2):
+    rng = _rng(seed, "drivers")
+    for i in range(1, n + 1):
+        week = [rng.randint(4, 9) for _ in range(7)]
+        if rng.random() < fatigue_rate:
+            week[-1] = rng.randint(9, 12)  # over FATIGUE_THRESHOLD_HOURS yesterday
+        yield [f"Driver {i:05d}", rng.randint(4, 10), "|".join(map(str, week))]
+
+
+def order_rows(n, n_routes, seed):
+    rng = _rng(seed, "orders")
+    for order_id in range(1, n + 1):
+        minutes = rng.randint(15, 240)
+        yield [order_id, int(rng.lognormvariate(6.7, 0.6)), rng.randint(1, n_routes),
+               f"{minutes // 60:02d}:{minutes % 60:02d}"]
+
+
+def csv_lines(kind, rows):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(HEADERS[kind])
+    yield out.getvalue()
+    for row in rows:
+        out.seek(0)
+        out.truncate()
+        writer.writerow(row)
+        yield out.getvalue()
+
+
+def dataset(drivers, routes, orders, seed=0, traffic_mix=DEFAULT_TRAFFIC_MIX, fatigue_rate=0.2):
+    """{kind: lazily generated CSV lines}, in the core/data/ format."""
+    if orders and not routes:
+        raise ValueError("orders need at least one route")
+    return {
+        "routes": csv_lines("routes", route_rows(routes, seed, traffic_mix)),
+        "drivers": csv_lines("drivers", driver_rows(drivers, seed, fatigue_rate)),
+        "orders": csv_lines("orders", order_rows(orders, routes, seed)),
+    }
+
+
+def write(data, out_dir):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for kind in IMPORT_ORDER:
+        paths[kind] = out_dir / f"{kind}.csv"
+        with open(paths[kind], "w", newline="", encoding="utf-8") as f:
+            f.writelines(data[kind])
+    return paths
+
+
+def load(data, chunk_size=5000):
+    """Upsert a dataset through core.importing; returns the import reports."""
+    return [import_csv(kind, data[kind], chunk_size=chunk_size) for kind in IMPORT_ORDER]
@@ -0,0 +1,65 @@
+"""
+Per-table data version stamps.
+
+Every save/delete of a Driver, Route, Order or SimulationResult bumps the
+matching DataVersion row (see core.signals). Bulk ORM operations bypass signals, so code doing
+bulk writes must call bump() itself. Inside `with deferred():` bumps are
+collected and applied once per table when the block exits, so per-row
+signals (e.g. a queryset DELETE sends post_delete for every row) cost one
+UPDATE instead of one per row.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import DataVersion
+
+# Tables a simulation reads; part of the result cache key.
+TRACKED = ("driver", "route", "order")
+
+_local = threading.local()
+
+
+@contextmanager
+def deferred():
+    if getattr(_local, "pending", None) is not None:  # nested: the outer block bumps
+        yield
+        return
+    _local.pending = set()
+    try:
+        yield
+        names = _local.pending
+    finally:
+        _local.pending = None
+    bump(*sorted(names))
+
+
+def bump(*names):
+    pending = getattr(_local, "pending", None)
+    if pending is not None:
+        pending.update(names)
+        return
+    now = timezone.now()
+    for name in names:
+        if not DataVersion.objects.filter(name=name).update(version=F("version") + 1, updated_at=now):
+            DataVersion.objects.get_or_create(name=name, defaults={"version": 1, "updated_at": now})
+
+
+def current(names=TRACKED):
+    """{name: version} for the requested tables (0 if never changed)."""
+    versions = dict.fromkeys(names, 0)
+    versions.update(DataVersion.objects.filter(name__in=names).values_list("name", "version"))
+    return versions
+
+
+def stamp(names):
+    """({name: version}, latest updated_at or None) for `names`, in one query."""
+    versions = dict.fromkeys(names, 0)
+    last_modified = None
+    for name, version, updated_at in (DataVersion.objects.filter(name__in=names)
+                                      .values_list("name", "version", "updated_at")):
+        versions[name] = version
+        last_modified = max(last_modified, updated_at) if last_modified else updated_at
+    return versions, last_modified
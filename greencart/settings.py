@@ -62,6 +62,7 @@ INSTALLED_APPS = [
 # Middleware (WhiteNoise after Security, CORS before Common)
 # ------------------------------------------------------
 MIDDLEWARE = [
+    "api.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -110,9 +111,53 @@ DATABASES = {
     )
 }
 
+# ------------------------------------------------------
+# Caches
+# "responses" holds serialized list/detail payloads (api.conditional). Keys
+# embed the DataVersion stamps, so a model save/delete makes stale entries
+# unreachable; MAX_ENTRIES bounds the entry count and payloads over
+# RESPONSE_CACHE_MAX_BYTES (pickled) are never stored, so memory stays within
+# roughly MAX_ENTRIES * MAX_BYTES. Set RESPONSE_CACHE_DIR to share entries
+# between worker processes through the file system.
+# "auth" holds the per-user stamps api.authentication checks on every cached
+# user lookup. Set AUTH_CACHE_DIR (or point it at a cache every host shares)
+# so a deactivation or password change reaches all worker processes at once.
+# ------------------------------------------------------
+AUTH_CACHE_DIR = os.getenv("AUTH_CACHE_DIR", "")
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", "")
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(256 * 1024)))
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "responses": {
+        "BACKEND": ("django.core.cache.backends.filebased.FileBasedCache" if RESPONSE_CACHE_DIR
+                    else "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": RESPONSE_CACHE_DIR or "responses",
+        "TIMEOUT": int(os.getenv("RESPONSE_CACHE_TIMEOUT", "3600")),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))},
+    },
+    "auth": {
+        "BACKEND": ("django.core.cache.backends.filebased.FileBasedCache" if AUTH_CACHE_DIR
+                    else "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": AUTH_CACHE_DIR or "auth",
+    },
+}
+
 # ------------------------------------------------------
 # Password validation
 # ------------------------------------------------------
+# bcrypt first: new and re-hashed passwords use it. The others only verify
+# existing hashes (which are upgraded on the next successful login).
+PASSWORD_HASHERS = [
+    "api.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# bcrypt work factor (cost doubles per step). Benchmark with `manage.py bench_auth`.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -145,16 +190,28 @@ STORAGES = {
 SPECTACULAR_SETTINGS = {
     "TITLE": "GreenCart Logistics API",
     "VERSION": "1.0.0",
+    # `manage.py build_schema` generates the schema; no need to repeat it in `check --deploy`.
+    "ENABLE_DJANGO_DEPLOY_CHECK": False,
 }
 
+# /api/schema/ serves files rendered once per code version (`manage.py
+# build_schema`). SCHEMA_CODE_VERSION (defaults to Render's commit sha) names
+# the version; when empty a hash of the sources is used instead.
+SCHEMA_CACHE_DIR = os.getenv("SCHEMA_CACHE_DIR", str(BASE_DIR / ".schema"))
+SCHEMA_CODE_VERSION = os.getenv("SCHEMA_CODE_VERSION", os.getenv("RENDER_GIT_COMMIT", ""))
+
 REST_FRAMEWORK = {
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Routers touch view.schema while building URLs; spectacular's AutoSchema
+    # (and its import cost) is only used by api.schema's private generator.
+    "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.inspectors.ViewInspector",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.DefaultCursorPagination",
+    "PAGE_SIZE": 100,
 }
 
 SIMPLE_JWT = {
@@ -162,6 +219,13 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
 
+# api.authentication keeps users resolved from access tokens in-process for
+# this many seconds. Saves/deletes of a User evict it immediately in every
+# process that shares the "auth" cache (see Caches); processes that do not
+# share it keep the old user for up to this long.
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+
 # ------------------------------------------------------
 # CORS / CSRF
 # Put your Vercel site URL(s) as full origins with scheme.
@@ -175,3 +239,62 @@ CORS_ALLOW_CREDENTIALS = True
 # Default PK
 # ------------------------------------------------------
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# ------------------------------------------------------
+# Simulation
+# ------------------------------------------------------
+# Rows per INSERT when persisting DeliveryAssignment, and the flush size
+# when a run is streamed ({"stream": true}) to keep memory bounded.
+SIMULATION_BULK_BATCH_SIZE = int(os.getenv("SIMULATION_BULK_BATCH_SIZE", "1000"))
+
+# Async simulation jobs ({"async": true} on /api/simulations/run/) are run by
+# `python manage.py simulation_worker`. In-process mode (a pool in every web
+# worker) is meant for local development only. Running jobs older than
+# SIMULATION_JOB_TIMEOUT seconds are assumed dead and handed out again.
+SIMULATION_JOB_WORKERS = int(os.getenv("SIMULATION_JOB_WORKERS", "2"))
+SIMULATION_JOBS_IN_PROCESS = os.getenv("SIMULATION_JOBS_IN_PROCESS", "False").lower() == "true"
+SIMULATION_JOB_TIMEOUT = int(os.getenv("SIMULATION_JOB_TIMEOUT", "1800"))
+
+# /api/simulations/sweep/: size of the pool each sweep starts (default: cores,
+# at most 4) and the cap on distinct grid points.
+SIMULATION_SWEEP_WORKERS = int(os.getenv("SIMULATION_SWEEP_WORKERS", "0")) or None
+SIMULATION_SWEEP_MAX_POINTS = int(os.getenv("SIMULATION_SWEEP_MAX_POINTS", "1000"))
+
+# Default number of worker processes a run's rules are split across when the
+# request does not say; 1 is the sequential engine. The results are the same
+# either way. Requests can opt into partition_mode "shards" (drivers and
+# orders split together), a different dispatch plan that is part of the
+# inputs and the cache key.
+SIMULATION_PARTITIONS = int(os.getenv("SIMULATION_PARTITIONS", "1"))
+SIMULATION_MAX_PARTITIONS = int(os.getenv("SIMULATION_MAX_PARTITIONS", "16"))
+
+# Identical runs (same inputs and Driver/Route/Order versions) are served from
+# an in-process LRU of this many entries; {"refresh": true} forces a re-run.
+SIMULATION_CACHE_SIZE = int(os.getenv("SIMULATION_CACHE_SIZE", "256"))
+
+# `manage.py compact_simulations` packs the assignment rows of runs older than
+# this many days into one compressed blob. Reads decode it in memory and leave
+# the run compacted; only a resimulate restores the rows.
+SIMULATION_RETENTION_DAYS = int(os.getenv("SIMULATION_RETENTION_DAYS", "30"))
+
+# Cap (and default) on points returned by /api/simulations/history/.
+SIMULATION_HISTORY_MAX_POINTS = int(os.getenv("SIMULATION_HISTORY_MAX_POINTS", "500"))
+
+# Profile every /api/simulations/run/ ("stages" or "cprofile"); staff can opt
+# in per request with ?profile=1 or ?profile=cprofile.
+SIMULATION_PROFILE = os.getenv("SIMULATION_PROFILE", "")
+
+# Upper bound on create+update+delete items in one /batch/ request.
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+
+# ------------------------------------------------------
+# Metrics (/metrics, Prometheus text format; see api.metrics)
+# Counters are per worker process: scrape each worker as its own target.
+# Access needs "Authorization: Bearer <METRICS_TOKEN>" or a client address
+# in METRICS_ALLOWED_IPS; with neither set /metrics only answers when DEBUG.
+# METRICS_SLOW_QUERY_MS > 0 logs slower queries with their SQL.
+# ------------------------------------------------------
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = env_list("METRICS_ALLOWED_IPS", "")
+METRICS_SLOW_QUERY_MS = float(os.getenv("METRICS_SLOW_QUERY_MS", "0"))
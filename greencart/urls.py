@@ -18,8 +18,10 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from api.views import DriverViewSet, RouteViewSet, OrderViewSet, SimulationViewSet
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from api.views_auth import RegisterView
+from api.views_import import BulkImportView
+from api.metrics import metrics_view
+from api.schema import docs_view, schema_view
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 router = DefaultRouter()
@@ -30,8 +32,8 @@ router.register("simulations", SimulationViewSet, basename="simulations")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema")),
+    path("api/schema/", schema_view, name="schema"),
+    path("api/docs/", docs_view),
     path("api/", include(router.urls)),
 ]
 
@@ -39,5 +41,7 @@ urlpatterns += [
     path("api/auth/register/", RegisterView.as_view(), name="auth_register"),
     path("api/auth/login/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("api/import/<str:kind>/", BulkImportView.as_view(), name="bulk_import"),
+    path("metrics", metrics_view, name="metrics"),
 ]
 